@@ -6,7 +6,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('models', 'models'), ('printing', 'printing'), ('resources', 'resources'), ('tests', 'tests'), ('utils', 'utils'), ('widgets', 'widgets'), ('.github', '.github')],
-    hiddenimports=[],
+    hiddenimports=['numpy'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
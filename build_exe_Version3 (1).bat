@@ -5,6 +5,9 @@ REM Sprzątanie poprzednich buildów
 if exist build rmdir /s /q build
 if exist dist rmdir /s /q dist
 
+REM Zależności (numpy - plan cięcia, harmonogramy, święta w formularzu)
+pip install -r requirements.txt
+
 REM Budujemy EXE, uwzględniamy katalogi z kodem i zasobami, tryb windowed (brak terminala)
 pyinstaller ^
   --noconfirm ^
@@ -19,6 +22,7 @@ pyinstaller ^
   --add-data "utils;utils" ^
   --add-data "widgets;widgets" ^
   --add-data ".github;.github" ^
+  --hidden-import numpy ^
   main.py
 
 REM Przenosimy exe do katalogu głównego (opcjonalnie)
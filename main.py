@@ -1,6 +1,7 @@
 import sys
 import os
 import json
+import multiprocessing
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QStackedWidget, QFrame, QLabel
@@ -12,9 +13,10 @@ from models.db import create_db
 from widgets.orders_db_widget import OrdersDBWidget
 from widgets.clients_db_widget import ClientsDBWidget
 from widgets.dashboard_widget import DashboardWidget
+from widgets.change_listener import ChangeListener
+from models.notifications import ENTITY_ORDER, ENTITY_CLIENT
 from widgets.production_sort_dialog import ProductionSortDialog
-
-DONE_ORDERS_FILE = "done_orders_store.json"
+from widgets.material_forecast_dialog import MaterialForecastDialog
 
 BTN_SIDEBAR = {
     "dashboard": """
@@ -178,6 +180,10 @@ class MainWindow(QMainWindow):
             }
             QPushButton:hover { background: #b3d8fd; }
         """)
+        self.btn_material_forecast = QPushButton("Prognoza\nmateriału")
+        self.btn_material_forecast.setMinimumHeight(52)
+        self.btn_material_forecast.setMaximumHeight(70)
+        self.btn_material_forecast.setStyleSheet(self.btn_production_sort.styleSheet())
 
         self.btn_dashboard.setStyleSheet(BTN_SIDEBAR["dashboard"])
         self.btn_order.setStyleSheet(BTN_SIDEBAR["order"])
@@ -200,6 +206,7 @@ class MainWindow(QMainWindow):
         sidebar_layout.addWidget(self.btn_clients)
         sidebar_layout.addWidget(self.btn_orders)
         sidebar_layout.addWidget(self.btn_production_sort)
+        sidebar_layout.addWidget(self.btn_material_forecast)
         sidebar_layout.addStretch(1)
 
         # DODAJ LEGENDĘ KOLORÓW NA DOLE, LEWA STRONA
@@ -242,9 +249,28 @@ class MainWindow(QMainWindow):
         self.btn_clients.clicked.connect(lambda: self.switch_page(2, self.btn_clients, "clients"))
         self.btn_orders.clicked.connect(lambda: self.switch_page(3, self.btn_orders, "orders"))
         self.btn_production_sort.clicked.connect(self.show_production_sort_dialog)
+        self.btn_material_forecast.clicked.connect(self.show_material_forecast_dialog)
 
         self.switch_page(0, self.btn_dashboard, "dashboard")
 
+        # Zmiany zapisane na innych stanowiskach (i w innych oknach tego programu)
+        self.change_listener = ChangeListener(parent=self)
+        self.change_listener.changed.connect(self.on_data_changed)
+        self.change_listener.start()
+
+    def on_data_changed(self, entity, ids):
+        if entity == ENTITY_ORDER:
+            self.dashboard.on_orders_changed(ids)
+            self.orders_db.on_orders_changed(ids)
+        elif entity == ENTITY_CLIENT:
+            self.dashboard.on_clients_changed(ids)
+            self.orders_db.on_clients_changed(ids)
+            self.clients_db.on_clients_changed(ids)
+
+    def closeEvent(self, event):
+        self.change_listener.stop()
+        super().closeEvent(event)
+
     def set_sidebar_active(self, active_btn, active_name):
         for btn, name in self.sidebar_buttons:
             if btn is active_btn:
@@ -301,6 +327,10 @@ class MainWindow(QMainWindow):
         dlg = ProductionSortDialog(self)
         dlg.exec()
 
+    def show_material_forecast_dialog(self):
+        dlg = MaterialForecastDialog(self)
+        dlg.exec()
+
 def main():
     create_db()
     app = QApplication(sys.argv)
@@ -315,4 +345,8 @@ def main():
     sys.exit(app.exec())
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    # W exe z PyInstallera procesy robocze (wydruk zbiorczy, plan cięcia) startują z tego
+    # samego pliku - freeze_support wykonuje w nich zadanie i kończy proces przed main().
+    # Importy powyżej nie tworzą obiektów Qt ani nie łączą się z bazą.
+    multiprocessing.freeze_support()
+    main()
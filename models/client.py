@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Text, UniqueConstraint, select
 from sqlalchemy.orm import relationship
-from .db import Base, Session
+from .db import Base
 from sqlalchemy.event import listens_for
+from utils.text import normalize_search_text
 
 CLIENT_NR_START = 567  # numeracja klientów zaczyna się od 000567
 
+# Pola, po których działa wyszukiwarka klientów (kolejność = waga przy rankingu)
+SEARCH_FIELDS = ("short_name", "name", "client_number", "nip", "city", "contact_person")
+
 class Client(Base):
     __tablename__ = "clients"
     id = Column(Integer, primary_key=True)
@@ -22,22 +26,31 @@ class Client(Base):
     delivery_street = Column(String)
     delivery_postal_code = Column(String)
     delivery_city = Column(String)
+    # Znormalizowane (bez polskich znaków, małe litery) pola SEARCH_FIELDS - utrzymywane automatycznie
+    search_text = Column(Text)
     orders = relationship("Order", back_populates="client")
 
     __table_args__ = (
         UniqueConstraint('client_number', name='uq_client_number'),
     )
 
+def build_search_text(client):
+    return " | ".join(normalize_search_text(getattr(client, field, None)) for field in SEARCH_FIELDS)
+
+@listens_for(Client, "before_update")
+def before_update_client(mapper, connection, target):
+    target.search_text = build_search_text(target)
+
 @listens_for(Client, "before_insert")
 def before_insert_client(mapper, connection, target):
     # Automatyczne nadanie numeru klienta w formacie 000567, 000568, ...
-    session = Session()
-    try:
-        last = session.query(Client).order_by(Client.client_number.desc()).first()
-        if last and last.client_number and last.client_number.isdigit():
-            next_nr = max(int(last.client_number) + 1, CLIENT_NR_START)
-        else:
-            next_nr = CLIENT_NR_START
-        target.client_number = f"{next_nr:06d}"
-    finally:
-        session.close()
\ No newline at end of file
+    # Zapytanie idzie przez połączenie bieżącego flusha - bez drugiej sesji i drugiego połączenia z puli
+    last_number = connection.execute(
+        select(Client.client_number).order_by(Client.client_number.desc()).limit(1)
+    ).scalar()
+    if last_number and last_number.isdigit():
+        next_nr = max(int(last_number) + 1, CLIENT_NR_START)
+    else:
+        next_nr = CLIENT_NR_START
+    target.client_number = f"{next_nr:06d}"
+    target.search_text = build_search_text(target)
@@ -0,0 +1,66 @@
+# models/client_queries.py
+# Zapytania listy klientów zwracające proste wiersze (słowniki) dla tabel w GUI.
+from sqlalchemy import case, or_
+from utils.text import normalize_search_text
+from .client import Client
+
+CLIENT_FIELDS = (
+    "id", "client_number", "name", "short_name", "contact_person", "phone", "email",
+    "street", "postal_code", "city", "nip",
+    "delivery_company", "delivery_street", "delivery_postal_code", "delivery_city",
+)
+
+SEARCH_LIMIT = 200
+
+def client_to_row(client):
+    return {field: getattr(client, field, None) for field in CLIENT_FIELDS}
+
+def fetch_client_rows(session, after_number=None, limit=200):
+    """
+    Strona klientów posortowana po numerze klienta (stronicowanie keyset):
+    kolejna strona zaczyna się za ostatnim wczytanym numerem, więc koszt
+    zapytania nie rośnie z numerem strony jak przy OFFSET.
+    """
+    query = session.query(Client).order_by(Client.client_number.asc())
+    if after_number is not None:
+        query = query.filter(Client.client_number > after_number)
+    if limit is not None:
+        query = query.limit(limit)
+    return [client_to_row(client) for client in query.all()]
+
+def fetch_client_rows_by_ids(session, client_ids):
+    if not client_ids:
+        return []
+    query = session.query(Client).filter(Client.id.in_(list(client_ids)))
+    return [client_to_row(client) for client in query.all()]
+
+def search_client_rows(session, text, limit=SEARCH_LIMIT):
+    """
+    Wyszukiwanie klientów po wszystkich polach naraz (Client.search_text).
+    Każde słowo frazy musi wystąpić w którymś polu, wielkość liter i polskie znaki
+    nie mają znaczenia. Kolejność wyników:
+      0 - dokładny numer klienta albo NIP,
+      1 - nazwa skrócona zaczyna się od frazy,
+      2 - któreś słowo zaczyna się od frazy,
+      3 - pozostałe trafienia.
+    Na PostgreSQL warunki LIKE '%...%' korzystają z indeksu trigramowego
+    (models/migrations.py), na SQLite to skan jednej, krótkiej kolumny.
+    """
+    phrase = normalize_search_text(text)
+    if not phrase:
+        return []
+    raw = " ".join(str(text).split())
+    query = session.query(Client)
+    for token in phrase.split():
+        query = query.filter(Client.search_text.contains(token, autoescape=True))
+    rank = case(
+        (or_(Client.client_number == raw, Client.nip == raw), 0),
+        (Client.search_text.startswith(phrase, autoescape=True), 1),
+        (or_(Client.search_text.contains(" " + phrase, autoescape=True),
+             Client.search_text.contains("-" + phrase, autoescape=True)), 2),
+        else_=3,
+    )
+    query = query.order_by(rank, Client.search_text, Client.client_number)
+    if limit is not None:
+        query = query.limit(limit)
+    return [client_to_row(client) for client in query.all()]
@@ -0,0 +1,240 @@
+# models/migrations.py
+# Dostosowanie istniejącej bazy do aktualnych modeli.
+# Base.metadata.create_all tworzy tylko brakujące tabele - nowych kolumn i indeksów
+# w istniejących tabelach nie dodaje, dlatego robimy to tutaj. Każdy krok jest
+# idempotentny i może być uruchamiany przy każdym starcie aplikacji (create_db).
+import csv
+import json
+import logging
+import os
+from datetime import datetime
+from types import SimpleNamespace
+from sqlalchemy import Integer, String, bindparam, inspect, select, text
+from utils.config import PROJECT_DIR
+
+logger = logging.getLogger(__name__)
+
+# Raport pozycji, których tekstowych wartości nie dało się w całości zamienić na liczby
+ORDER_ITEMS_REPORT_FILE = "raport_migracji_pozycji.csv"
+
+# Dawny, lokalny magazyn zrealizowanych zamówień (widgets/done_orders_store.py)
+LEGACY_DONE_ORDERS_FILE = "done_orders_store.json"
+
+def add_missing_columns(engine, table, column_names):
+    """Dodaje (ALTER TABLE ... ADD COLUMN) kolumny modelu, których brakuje w bazie."""
+    existing = {col["name"] for col in inspect(engine).get_columns(table.name)}
+    added = []
+    with engine.begin() as conn:
+        for name in column_names:
+            if name in existing:
+                continue
+            column = table.columns[name]
+            col_type = column.type.compile(dialect=engine.dialect)
+            default = ""
+            if column.server_default is not None:
+                # istniejące wiersze dostają wartość domyślną
+                default = f" DEFAULT '{column.server_default.arg}'"
+            conn.exec_driver_sql(f'ALTER TABLE {table.name} ADD COLUMN {name} {col_type}{default}')
+            added.append(name)
+    return added
+
+def create_missing_indexes(engine, table):
+    """Tworzy indeksy zadeklarowane w modelu (Index / index=True), których nie ma w bazie."""
+    existing = {idx["name"] for idx in inspect(engine).get_indexes(table.name)}
+    for index in table.indexes:
+        if index.name not in existing:
+            index.create(bind=engine)
+
+def ensure_client_search(engine):
+    """Kolumna clients.search_text, jej wypełnienie i indeks trigramowy (PostgreSQL)."""
+    from .client import Client, build_search_text
+    add_missing_columns(engine, Client.__table__, ["search_text"])
+
+    table = Client.__table__
+    with engine.begin() as conn:
+        rows = conn.execute(table.select().where(table.c.search_text.is_(None))).mappings().all()
+        if rows:
+            conn.execute(
+                table.update().where(table.c.id == bindparam("row_id")),
+                [{"row_id": row["id"], "search_text": build_search_text(SimpleNamespace(**row))}
+                 for row in rows],
+            )
+
+    if engine.dialect.name == "postgresql":
+        # pg_trgm pozwala użyć indeksu GIN przy LIKE '%fraza%'. Bez rozszerzenia
+        # wyszukiwanie dalej działa, tylko jako skan sekwencyjny po jednej kolumnie.
+        try:
+            with engine.begin() as conn:
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_clients_search_text_trgm "
+                    "ON clients USING gin (search_text gin_trgm_ops)"
+                ))
+        except Exception as exc:
+            logger.warning("Nie udało się utworzyć indeksu trigramowego klientów: %s", exc)
+
+def ensure_order_status(engine):
+    """Kolumny statusu zamówienia (status + znaczniki czasu)."""
+    from .order import Order
+    add_missing_columns(engine, Order.__table__, [
+        "status", "status_changed_at", "in_production_at", "done_at", "shipped_at",
+    ])
+
+def ensure_order_indexes(engine):
+    """Indeksy tabeli orders (delivery_date, status, częściowy indeks aktywnych)."""
+    from .order import Order
+    create_missing_indexes(engine, Order.__table__)
+
+def legacy_done_orders_paths():
+    """
+    Położenie dawnego pliku done_orders_store.json - katalog roboczy, bo tam zapisywał
+    go stary program. Katalog z kodem nie jest przeszukiwany (kopia deweloperska).
+    """
+    return [os.path.abspath(LEGACY_DONE_ORDERS_FILE)]
+
+def import_done_orders_file(engine, path):
+    """
+    Jednorazowy import zrealizowanych zamówień z pliku JSON (lista id) do orders.status.
+    Po imporcie plik dostaje rozszerzenie .imported, więc nie jest wczytywany ponownie.
+    Zwraca liczbę zamówień oznaczonych jako zrealizowane.
+    """
+    from .order import Order, ACTIVE_STATUSES, STATUS_DONE
+    from .notifications import ChangeLog, ENTITY_ORDER, encode_ids
+    if not os.path.exists(path):
+        return 0
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            ids = {int(i) for i in json.load(f)}
+    except (OSError, ValueError, TypeError) as exc:
+        logger.warning("Nie udało się odczytać %s: %s", path, exc)
+        return 0
+    now = datetime.now()
+    table = Order.__table__
+    updated = 0
+    with engine.begin() as conn:
+        if ids:
+            result = conn.execute(
+                table.update()
+                .where(table.c.id.in_(ids), table.c.status.in_(ACTIVE_STATUSES))
+                .values(status=STATUS_DONE, done_at=now, status_changed_at=now)
+            )
+            updated = result.rowcount
+            # pozostałe stanowiska odświeżą tablicę (models/notifications.py)
+            conn.execute(ChangeLog.__table__.insert().values(entity=ENTITY_ORDER, ids=encode_ids(ids)))
+    os.replace(path, path + ".imported")
+    logger.info("Zaimportowano %s zrealizowanych zamówień z %s", updated, path)
+    return updated
+
+def legacy_text_columns(engine, table, names):
+    """Kolumny z names, które w bazie są jeszcze tekstowe."""
+    columns = {col["name"]: col["type"] for col in inspect(engine).get_columns(table.name)}
+    return [name for name in names if name in columns and isinstance(columns[name], String)]
+
+def convert_order_item_numbers(engine, report_path=None):
+    """
+    Zamienia tekstowe kolumny liczbowe order_items (szerokość, wysokość, ilość, nawój,
+    cena, zam. rolki) na typy liczbowe. Wartości czytane są tolerancyjnie
+    ("10 000", "12,34", "100 m"). Pozycje, w których odrzucono dopisek (np. jednostkę)
+    albo wartości nie dało się odczytać (zapisane zostaje NULL), trafiają do raportu CSV.
+    Zwraca listę wierszy raportu: (id pozycji, nr zamówienia, kolumna, wartość, uwaga).
+    """
+    from .orderitem import OrderItem, NUMERIC_FIELDS, INTEGER_FIELDS
+    from .order import Order
+    from utils.numbers import split_number
+
+    table = OrderItem.__table__
+    fields = legacy_text_columns(engine, table, list(NUMERIC_FIELDS) + list(INTEGER_FIELDS))
+    if not fields:
+        return []
+
+    report = []
+    with engine.begin() as conn:
+        rows = conn.execute(
+            text(f"SELECT i.id, o.order_number, {', '.join('i.' + f for f in fields)} "
+                 f"FROM {table.name} i LEFT JOIN {Order.__tablename__} o ON o.id = i.order_id")
+        ).mappings().all()
+        values = []
+        for row in rows:
+            converted = {"row_id": row["id"]}
+            for field in fields:
+                raw = row[field]
+                number, rest = split_number(raw)
+                if number is not None and field in INTEGER_FIELDS and number != number.to_integral_value():
+                    rest = rest or "część ułamkowa"
+                    number = number.to_integral_value()
+                if number is None and rest:
+                    report.append((row["id"], row["order_number"], field, raw, "nieczytelna wartość - zapisano pustą"))
+                elif rest:
+                    report.append((row["id"], row["order_number"], field, raw, f"pominięto '{rest}'"))
+                if number is not None and field in INTEGER_FIELDS:
+                    number = int(number)
+                converted[field + "__num"] = number
+            values.append(converted)
+
+        # Nowa kolumna liczbowa obok starej, przepisanie wartości, zamiana nazw
+        column_types = {f: Integer() if f in INTEGER_FIELDS else NUMERIC_FIELDS[f] for f in fields}
+        for field in fields:
+            conn.exec_driver_sql(
+                f"ALTER TABLE {table.name} ADD COLUMN {field}__num "
+                f"{column_types[field].compile(dialect=engine.dialect)}"
+            )
+        if values:
+            update = text(
+                f"UPDATE {table.name} SET "
+                + ", ".join(f"{f}__num = :{f}__num" for f in fields)
+                + " WHERE id = :row_id"
+            ).bindparams(*(bindparam(f + "__num", type_=column_types[f]) for f in fields))
+            conn.execute(update, values)
+        for field in fields:
+            conn.exec_driver_sql(f"ALTER TABLE {table.name} DROP COLUMN {field}")
+            conn.exec_driver_sql(f"ALTER TABLE {table.name} RENAME COLUMN {field}__num TO {field}")
+
+    if report:
+        report_path = report_path or os.path.join(PROJECT_DIR, ORDER_ITEMS_REPORT_FILE)
+        with open(report_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f, delimiter=";")
+            writer.writerow(["id pozycji", "nr zamówienia", "kolumna", "wartość", "uwaga"])
+            writer.writerows(report)
+        logger.warning("Migracja pozycji: %s wartości wymaga sprawdzenia, raport: %s", len(report), report_path)
+    return report
+
+def index_names(engine, table_name):
+    """Nazwy indeksów tabeli - razem z indeksami na wyrażeniach, których SQLAlchemy nie odczytuje z SQLite."""
+    if engine.dialect.name == "sqlite":
+        with engine.connect() as conn:
+            return set(conn.execute(
+                text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table"),
+                {"table": table_name},
+            ).scalars())
+    return {idx["name"] for idx in inspect(engine).get_indexes(table_name)}
+
+def ensure_production_summary(engine):
+    """
+    Pierwsze wypełnienie tabeli production_summary (później utrzymywana przyrostowo).
+    Baza sprzed unikalnego klucza: dawny indeks jest usuwany, a tabela przeliczana od
+    zera (znika ewentualny zdublowany klucz) przed założeniem indeksu unikalnego.
+    """
+    from .production_summary import KEY_INDEX, OLD_KEY_INDEX_NAME, ProductionSummary, rebuild
+    existing = index_names(engine, ProductionSummary.__tablename__)
+    with engine.begin() as conn:
+        if KEY_INDEX.name not in existing:
+            if OLD_KEY_INDEX_NAME in existing:
+                conn.exec_driver_sql(f"DROP INDEX {OLD_KEY_INDEX_NAME}")
+            rebuild(conn)
+            KEY_INDEX.create(bind=conn)
+        elif conn.execute(select(ProductionSummary.id).limit(1)).first() is None:
+            rebuild(conn)
+
+def upgrade(engine, done_orders_paths=None):
+    """done_orders_paths - pliki do importu zrealizowanych zamówień (None - legacy_done_orders_paths, [] - bez importu)."""
+    ensure_client_search(engine)
+    ensure_order_status(engine)
+    ensure_order_indexes(engine)
+    convert_order_item_numbers(engine)
+    from .orderitem import OrderItem
+    create_missing_indexes(engine, OrderItem.__table__)
+    ensure_production_summary(engine)
+    if done_orders_paths is None:
+        done_orders_paths = legacy_done_orders_paths()
+    for path in done_orders_paths:
+        import_done_orders_file(engine, path)
@@ -0,0 +1,140 @@
+# models/notifications.py
+# Powiadomienia o zmianach między stanowiskami.
+#
+# Zapis: po każdym flush sesja zbiera identyfikatory zmienionych zamówień (także przez
+# pozycje) i klientów, a przy commit zapisuje je w tabeli change_log - w tej samej
+# transakcji co same zmiany. Na PostgreSQL dodatkowo wysyłany jest pg_notify, który
+# budzi nasłuchujące stanowiska od razu (NOTIFY dochodzi dopiero po COMMIT).
+#
+# Odczyt: widgets/change_listener.py - LISTEN na PostgreSQL, odpytywanie change_log
+# na SQLite albo przy PgBouncerze w trybie transakcyjnym (tam LISTEN nie działa).
+import json
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime, event, select, text
+from .db import Base
+
+CHANNEL = "zamowienia_changes"
+ENTITY_ORDER = "order"
+ENTITY_CLIENT = "client"
+
+# PostgreSQL ogranicza treść NOTIFY do 8000 bajtów - większe listy dzielimy
+IDS_PER_MESSAGE = 500
+
+PENDING_KEY = "pending_changes"
+
+class ChangeLog(Base):
+    __tablename__ = "change_log"
+    id = Column(Integer, primary_key=True)
+    entity = Column(String(20), nullable=False)
+    ids = Column(Text, nullable=False)  # identyfikatory rozdzielone przecinkami
+    created_at = Column(DateTime, default=datetime.now, index=True)
+
+def entity_key(obj):
+    """(encja, id) dla obiektu, którego zmiana powinna zostać rozgłoszona, albo None."""
+    from .client import Client
+    from .order import Order
+    from .orderitem import OrderItem
+    if isinstance(obj, Order):
+        return ENTITY_ORDER, obj.id
+    if isinstance(obj, OrderItem):
+        return ENTITY_ORDER, obj.order_id
+    if isinstance(obj, Client):
+        return ENTITY_CLIENT, obj.id
+    return None
+
+def record_change(session, entity, ids):
+    """
+    Ręczne dopisanie zmiany - potrzebne przy masowych UPDATE/DELETE
+    (session.query(...).delete()), które nie przechodzą przez flush obiektów.
+    """
+    pending = session.info.setdefault(PENDING_KEY, {})
+    pending.setdefault(entity, set()).update(i for i in ids if i is not None)
+
+def encode_ids(ids):
+    return ",".join(str(i) for i in sorted(ids))
+
+def decode_ids(value):
+    return {int(part) for part in str(value or "").split(",") if part.strip().isdigit()}
+
+def encode_payload(entity, ids, log_id):
+    return json.dumps({"entity": entity, "ids": sorted(ids), "log_id": log_id})
+
+def decode_payload(payload):
+    """(encja, zbiór id, id wpisu w change_log)"""
+    data = json.loads(payload)
+    return data["entity"], set(data.get("ids") or ()), int(data.get("log_id") or 0)
+
+def _chunks(ids, size=IDS_PER_MESSAGE):
+    ids = sorted(ids)
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+def _after_flush(session, flush_context):
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        key = entity_key(obj)
+        if key and key[1] is not None:
+            record_change(session, key[0], [key[1]])
+
+def _before_commit(session):
+    # commit() wywołuje before_commit przed ostatnim flush - wymuszamy go,
+    # żeby zebrać również zmiany, które jeszcze czekają w sesji
+    session.flush()
+    pending = session.info.pop(PENDING_KEY, None)
+    if not pending:
+        return
+    is_postgres = session.get_bind().dialect.name == "postgresql"
+    for entity, ids in pending.items():
+        for chunk in _chunks(ids):
+            result = session.execute(
+                ChangeLog.__table__.insert().values(entity=entity, ids=encode_ids(chunk))
+            )
+            if is_postgres:
+                log_id = result.inserted_primary_key[0]
+                session.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {"channel": CHANNEL, "payload": encode_payload(entity, chunk, log_id)},
+                )
+
+def _after_rollback(session):
+    session.info.pop(PENDING_KEY, None)
+
+def install_change_tracking(session_factory):
+    """Podpina zbieranie zmian pod fabrykę sesji (models.db.Session). Wielokrotne wywołanie nic nie psuje."""
+    for name, fn in (("after_flush", _after_flush),
+                     ("before_commit", _before_commit),
+                     ("after_rollback", _after_rollback)):
+        if not event.contains(session_factory, name, fn):
+            event.listen(session_factory, name, fn)
+
+def last_change_id(connection):
+    return connection.execute(select(ChangeLog.id).order_by(ChangeLog.id.desc()).limit(1)).scalar() or 0
+
+def fetch_changes(connection, after_id, seen_ids=None, overlap=0):
+    """
+    Zmiany zapisane po after_id: (ostatnie id, {encja: zbiór id}).
+
+    Na PostgreSQL id wpisu nadawane jest przy INSERT, a nie przy COMMIT - transakcja
+    z niższym id może stać się widoczna dopiero po odczycie wyższego. Dlatego przy
+    overlap > 0 czytane są też wpisy o id > after_id - overlap, a seen_ids (zbiór,
+    wspólny dla kolejnych wywołań) pomija te już odczytane i dostaje nowe - także
+    do pominięcia tych samych NOTIFY. Id spoza okna są z seen_ids usuwane.
+    """
+    rows = connection.execute(
+        select(ChangeLog.id, ChangeLog.entity, ChangeLog.ids)
+        .where(ChangeLog.id > after_id - overlap)
+        .order_by(ChangeLog.id)
+    ).all()
+    changes = {}
+    for row in rows:
+        if seen_ids is not None:
+            if row.id in seen_ids:
+                continue
+            seen_ids.add(row.id)
+        changes.setdefault(row.entity, set()).update(decode_ids(row.ids))
+        after_id = max(after_id, row.id)
+    if seen_ids is not None and overlap:
+        seen_ids.difference_update([log_id for log_id in seen_ids if log_id <= after_id - overlap])
+    return after_id, changes
+
+def prune_changes(connection, older_than):
+    connection.execute(ChangeLog.__table__.delete().where(ChangeLog.created_at < older_than))
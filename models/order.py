@@ -1,15 +1,72 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, Text
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from .db import Base
 
+# Cykl życia zamówienia
+STATUS_NEW = "new"
+STATUS_IN_PRODUCTION = "in_production"
+STATUS_DONE = "done"
+STATUS_SHIPPED = "shipped"
+ORDER_STATUSES = (STATUS_NEW, STATUS_IN_PRODUCTION, STATUS_DONE, STATUS_SHIPPED)
+ACTIVE_STATUSES = (STATUS_NEW, STATUS_IN_PRODUCTION)   # na tablicy zleceń
+DONE_STATUSES = (STATUS_DONE, STATUS_SHIPPED)          # "Pokaż zrealizowane"
+
+# Kolumna z czasem wejścia w dany status
+STATUS_TIMESTAMPS = {
+    STATUS_IN_PRODUCTION: "in_production_at",
+    STATUS_DONE: "done_at",
+    STATUS_SHIPPED: "shipped_at",
+}
+
 class Order(Base):
     __tablename__ = "orders"
     id = Column(Integer, primary_key=True)
     order_number = Column(String, unique=True, index=True)
     order_date = Column(Date)
-    delivery_date = Column(Date)
+    delivery_date = Column(Date, index=True)  # tablica zleceń filtruje po oknie dat
     client_id = Column(Integer, ForeignKey("clients.id"))
     notes = Column(Text)
     payment_term = Column(String)  # Dodane pole na termin płatności
+    status = Column(String(20), nullable=False, default=STATUS_NEW, server_default=STATUS_NEW)
+    status_changed_at = Column(DateTime)
+    in_production_at = Column(DateTime)
+    done_at = Column(DateTime)
+    shipped_at = Column(DateTime)
     client = relationship("Client", back_populates="orders")
-    items = relationship("OrderItem", back_populates="order")
\ No newline at end of file
+    items = relationship("OrderItem", back_populates="order", order_by="OrderItem.id")
+
+    __table_args__ = (
+        # Indeks częściowy: tylko aktywne zamówienia (mały, bo zrealizowanych przybywa)
+        Index(
+            "ix_orders_active_delivery_date", "delivery_date",
+            postgresql_where=status.in_(ACTIVE_STATUSES),
+            sqlite_where=status.in_(ACTIVE_STATUSES),
+        ),
+        Index("ix_orders_status_delivery_date", "status", "delivery_date"),
+    )
+
+def set_status(order, status, when=None):
+    """Zmienia status zamówienia i zapisuje czas zmiany."""
+    if status not in ORDER_STATUSES:
+        raise ValueError(f"Nieznany status zamówienia: {status}")
+    when = when or datetime.now()
+    order.status = status
+    order.status_changed_at = when
+    column = STATUS_TIMESTAMPS.get(status)
+    if column:
+        setattr(order, column, when)
+    if status in ACTIVE_STATUSES:
+        # przywrócone na tablicę - kasujemy znaczniki późniejszych etapów
+        order.done_at = None
+        order.shipped_at = None
+
+def restored_status(order):
+    """Status po przywróceniu zrealizowanego zamówienia na tablicę."""
+    return STATUS_IN_PRODUCTION if order.in_production_at else STATUS_NEW
+
+def set_order_status(session, order_id, status):
+    order = session.get(Order, order_id)
+    if order is not None:
+        set_status(order, status)
+    return order
@@ -0,0 +1,96 @@
+# models/order_queries.py
+# Zapytania listy zamówień zwracające proste wiersze (słowniki) dla tabel w GUI.
+from types import SimpleNamespace
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, selectinload
+from .order import Order, ACTIVE_STATUSES, DONE_STATUSES
+
+ITEM_FIELDS = (
+    "width", "height", "material", "ordered_quantity", "quantity_type",
+    "roll_length", "core", "price", "price_type", "zam_rolki",
+)
+
+def item_to_row(item):
+    return {field: getattr(item, field, None) for field in ITEM_FIELDS}
+
+def order_to_row(order):
+    client = order.client
+    return {
+        "id": order.id,
+        "order_number": order.order_number,
+        "order_date": order.order_date,
+        "delivery_date": order.delivery_date,
+        "client_id": order.client_id,
+        "client_name": client.name if client else "",
+        "client_phone": client.phone if client else "",
+        "client_city": client.city if client else "",
+        "payment_term": order.payment_term or "",
+        "notes": order.notes or "",
+        "items": [item_to_row(item) for item in order.items],
+    }
+
+def fetch_order_rows(session, offset=0, limit=None, order_ids=None):
+    """
+    Zamówienia razem z klientem i pozycjami w dwóch zapytaniach:
+    zamówienia + klient (JOIN) oraz pozycje (SELECT ... WHERE order_id IN (...)).
+    Sortowanie po numerze zamówienia w SQL - numer ma stałą szerokość (000567/TER),
+    więc porządek tekstowy jest porządkiem numerycznym.
+    """
+    query = (
+        session.query(Order)
+        .options(joinedload(Order.client), selectinload(Order.items))
+        .order_by(Order.order_number.asc(), Order.id.asc())
+    )
+    if order_ids is not None:
+        query = query.filter(Order.id.in_(list(order_ids)))
+    if offset:
+        query = query.offset(offset)
+    if limit is not None:
+        query = query.limit(limit)
+    return [order_to_row(order) for order in query.all()]
+
+def fetch_orders_in_window(session, date_from, date_to, show_done=False):
+    """
+    Zamówienia z datą wysyłki w przedziale [date_from, date_to] razem z klientem.
+    show_done=False - aktywne (nowe, w produkcji), True - zrealizowane i wysłane.
+    Zwraca obiekty Order, bo fiszki tablicy pracują na zamówieniach.
+    """
+    statuses = DONE_STATUSES if show_done else ACTIVE_STATUSES
+    query = (
+        session.query(Order)
+        .options(joinedload(Order.client))
+        .filter(Order.status.in_(statuses))
+        .filter(Order.delivery_date.between(date_from, date_to))
+        .order_by(Order.delivery_date.asc(), Order.id.asc())
+    )
+    return query.all()
+
+def column_snapshot(obj):
+    """Kopia kolumn obiektu ORM jako SimpleNamespace - bez sesji, do przekazania innym procesom."""
+    if obj is None:
+        return None
+    return SimpleNamespace(**{attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs})
+
+def fetch_print_snapshots(session, order_ids=None, date_from=None, date_to=None):
+    """
+    Zamówienia do wydruku zbiorczego jako trójki (zamówienie, klient, [pozycje]) kopii kolumn,
+    w dwóch zapytaniach. order_ids - wskazane zamówienia; inaczej aktywne z wysyłką
+    w [date_from, date_to]. Kolejność: data wysyłki, numer zamówienia.
+    """
+    query = (
+        session.query(Order)
+        .options(joinedload(Order.client), selectinload(Order.items))
+        .order_by(Order.delivery_date.asc(), Order.order_number.asc(), Order.id.asc())
+    )
+    if order_ids is not None:
+        query = query.filter(Order.id.in_(list(order_ids)))
+    else:
+        query = (
+            query.filter(Order.status.in_(ACTIVE_STATUSES))
+            .filter(Order.delivery_date.between(date_from, date_to))
+        )
+    return [
+        (column_snapshot(order), column_snapshot(order.client),
+         [column_snapshot(item) for item in order.items])
+        for order in query.all()
+    ]
@@ -1,20 +1,43 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Numeric, ForeignKey
+from sqlalchemy.orm import relationship, validates
+from utils.numbers import parse_quantity, parse_int
 from .db import Base
 
+# Pola liczbowe pozycji (kolumna -> typ); tekst z formularza jest zamieniany na liczbę przy przypisaniu
+NUMERIC_FIELDS = {
+    "width": Numeric(10, 2),             # [mm]
+    "height": Numeric(10, 2),            # [mm]
+    "ordered_quantity": Numeric(14, 3),  # w jednostce quantity_type (tyś. / rolek)
+    "roll_length": Numeric(12, 2),       # nawój - etykiet na rolce
+    "price": Numeric(14, 4),             # w jednostce price_type
+}
+INTEGER_FIELDS = ("zam_rolki",)
+
 class OrderItem(Base):
     __tablename__ = "order_items"
     id = Column(Integer, primary_key=True)
-    order_id = Column(Integer, ForeignKey("orders.id"))
-    width = Column(String)
-    height = Column(String)
-    material = Column(String)
-    ordered_quantity = Column(String)
-    quantity_type = Column(String)
-    roll_length = Column(String)
-    core = Column(String)
-    price = Column(String)        # NOWE POLE
-    price_type = Column(String)   # NOWE POLE
-    zam_rolki = Column(String)      # NOWE POLE
+    order_id = Column(Integer, ForeignKey("orders.id"), index=True)
+    width = Column(NUMERIC_FIELDS["width"])
+    height = Column(NUMERIC_FIELDS["height"])
+    material = Column(String)            # np. "Termotransferowy"
+    ordered_quantity = Column(NUMERIC_FIELDS["ordered_quantity"])
+    quantity_type = Column(String)       # np. "tyś." lub "rolek"
+    roll_length = Column(NUMERIC_FIELDS["roll_length"])
+    core = Column(String)                # np. "40" lub dowolny opis ("inny")
+    price = Column(NUMERIC_FIELDS["price"])
+    price_type = Column(String)          # np. "za 1 tyś" lub "za 1 rolkę"
+    zam_rolki = Column(Integer)          # wyliczona liczba rolek
+
+    order = relationship("Order", back_populates="items")
+
+    @validates(*NUMERIC_FIELDS)
+    def _validate_number(self, key, value):
+        # jednostka na końcu ("100 m") jest pomijana - jak w migracji starych danych
+        return parse_quantity(value)
+
+    @validates(*INTEGER_FIELDS)
+    def _validate_int(self, key, value):
+        return parse_int(value)
 
-    order = relationship("Order", back_populates="items")
\ No newline at end of file
+    def __repr__(self):
+        return f"<OrderItem(id={self.id}, order_id={self.order_id}, material='{self.material}')>"
@@ -0,0 +1,245 @@
+# models/production_summary.py
+# Zestawienie produkcji tygodniowej trzymane w osobnej tabeli.
+#
+# production_summary ma jeden wiersz na (rok ISO, tydzień ISO, materiał, szerokość,
+# wysokość) z sumą ilości w tysiącach. Zapis zamówienia, usunięcie i przeciągnięcie
+# na inny dzień poprawiają tylko wiersze zmienionych zamówień (różnica "przed/po"
+# liczona z pozycji tych zamówień), więc okno planowania czyta gotowy wynik.
+# Klucz jest unikalny (materiał i wysokość mogą być puste, więc indeks porównuje je przez
+# COALESCE - zwykłe UNIQUE traktuje NULL-e jako różne), a różnica dopisywana jest jednym
+# INSERT ... ON CONFLICT DO UPDATE - dwa stanowiska zapisujące nowy klucz naraz nie
+# tworzą dwóch wierszy.
+#
+# Pełne przeliczenie i kontrola zgodności: models/production_summary_cli.py
+from contextlib import contextmanager
+from decimal import Decimal
+from sqlalchemy import (
+    Column, Integer, String, Numeric, Index, case, delete, func, insert, literal_column, select
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from .db import Base
+from .order import Order
+from .orderitem import OrderItem, NUMERIC_FIELDS
+from .sql_functions import iso_year, iso_week
+
+# Dokładność sumy [tys.]; mniejsze resztki po odejmowaniu traktujemy jak zero
+QUANTITY_SCALE = Decimal("0.001")
+
+class ProductionSummary(Base):
+    __tablename__ = "production_summary"
+    id = Column(Integer, primary_key=True)
+    year = Column(Integer, nullable=False)
+    week = Column(Integer, nullable=False)
+    material = Column(String)
+    width = Column(NUMERIC_FIELDS["width"])
+    height = Column(NUMERIC_FIELDS["height"])
+    quantity = Column(Numeric(18, 3), nullable=False, default=0)  # [tys.]
+
+KEY_COLUMNS = ("year", "week", "material", "width", "height")
+
+# Wyrażenia klucza unikalnego - te same w indeksie i w ON CONFLICT (stałe wpisane
+# dosłownie, bo PostgreSQL dopasowuje ON CONFLICT do indeksu po wyrażeniach)
+KEY_INDEX_ELEMENTS = (
+    ProductionSummary.year,
+    ProductionSummary.week,
+    func.coalesce(ProductionSummary.material, literal_column("''")),
+    func.coalesce(ProductionSummary.width, literal_column("-1")),
+    func.coalesce(ProductionSummary.height, literal_column("-1")),
+)
+KEY_INDEX = Index("ux_production_summary_key", *KEY_INDEX_ELEMENTS, unique=True)
+OLD_KEY_INDEX_NAME = "ix_production_summary_key"   # dawny indeks bez unikalności
+
+def item_quantity():
+    """Ilość pozycji w tysiącach etykiet (wyrażenie SQL)."""
+    quantity_type = func.lower(func.coalesce(OrderItem.quantity_type, ""))
+    ordered = func.coalesce(OrderItem.ordered_quantity, 0)
+    return case(
+        # typ tyś – liczymy 1:1
+        (quantity_type.like("ty%"), ordered),
+        # typ rolki – przeliczamy ilość rolek * nawój / 1000
+        (quantity_type.like("rol%"), ordered * func.coalesce(OrderItem.roll_length, 0) / 1000),
+        # fallback - liczymy 1:1
+        else_=ordered,
+    )
+
+def production_query(start_date=None, end_date=None, order_ids=None):
+    """
+    Zestawienie liczone z pozycji zamówień: GROUP BY (rok ISO, tydzień ISO, materiał,
+    szerokość, wysokość), ilość w tysiącach. order_ids zawęża do wybranych zamówień.
+    """
+    quantity = item_quantity()
+    year = iso_year(Order.delivery_date)
+    week = iso_week(Order.delivery_date)
+    query = (
+        select(
+            year.label("year"), week.label("week"),
+            OrderItem.material, OrderItem.width, OrderItem.height,
+            func.sum(quantity).label("quantity"),
+        )
+        .join(OrderItem, Order.id == OrderItem.order_id)
+        .where(Order.delivery_date.isnot(None))
+        # UWAGA: Tylko pozycje z wypełnioną szerokością!
+        .where(OrderItem.width.isnot(None))
+        .group_by(year, week, OrderItem.material, OrderItem.width, OrderItem.height)
+        .order_by(year, week, OrderItem.material, OrderItem.width, OrderItem.height)
+    )
+    if start_date:
+        query = query.where(Order.delivery_date >= start_date)
+    if end_date:
+        query = query.where(Order.delivery_date <= end_date)
+    if order_ids is not None:
+        query = query.where(Order.id.in_(list(order_ids)))
+    return query
+
+def production_facts_query(start_date=None, end_date=None):
+    """
+    Dane do przekrojów (widgets/production_pivot.py): suma ilości w najdrobniejszym
+    podziale - tydzień, materiał, rdzeń, nawój, klient, wymiar. Jedno zapytanie;
+    sumy częściowe i zmiana przekroju liczone są już w pamięci.
+    """
+    from .client import Client
+    quantity = item_quantity()
+    year = iso_year(Order.delivery_date)
+    week = iso_week(Order.delivery_date)
+    client = func.coalesce(func.nullif(Client.short_name, ""), Client.name)
+    columns = (year, week, OrderItem.material, OrderItem.core, OrderItem.roll_length,
+               client, OrderItem.width, OrderItem.height)
+    query = (
+        select(
+            year.label("year"), week.label("week"), OrderItem.material, OrderItem.core,
+            OrderItem.roll_length, client.label("client"), OrderItem.width, OrderItem.height,
+            func.sum(quantity).label("quantity"),
+        )
+        .join(OrderItem, Order.id == OrderItem.order_id)
+        .outerjoin(Client, Client.id == Order.client_id)
+        .where(Order.delivery_date.isnot(None))
+        .where(OrderItem.width.isnot(None))
+        .group_by(*columns)
+    )
+    if start_date:
+        query = query.where(Order.delivery_date >= start_date)
+    if end_date:
+        query = query.where(Order.delivery_date <= end_date)
+    return query
+
+def _quantity(value):
+    return Decimal(str(value or 0)).quantize(QUANTITY_SCALE)
+
+def _key_filter(key):
+    # NULL-bezpieczne porównanie (materiał albo wysokość mogą być puste)
+    return [getattr(ProductionSummary, name).is_not_distinct_from(value)
+            for name, value in zip(KEY_COLUMNS, key)]
+
+def order_contributions(session, order_ids):
+    """{klucz: ilość} - udział wskazanych zamówień w zestawieniu."""
+    if not order_ids:
+        return {}
+    return {
+        tuple(row[:5]): _quantity(row.quantity)
+        for row in session.execute(production_query(order_ids=order_ids))
+    }
+
+def _dialect_insert(session):
+    bind = session.get_bind() if hasattr(session, "get_bind") else session
+    return postgresql.insert if bind.dialect.name == "postgresql" else sqlite.insert
+
+def apply_deltas(session, deltas):
+    """Dodaje różnice {klucz: ilość} do tabeli; wiersze, które spadły do zera, są usuwane."""
+    table = ProductionSummary.__table__
+    upsert = _dialect_insert(session)
+    for key, delta in deltas.items():
+        if not delta:
+            continue
+        statement = upsert(table).values(dict(zip(KEY_COLUMNS, key), quantity=delta))
+        session.execute(statement.on_conflict_do_update(
+            index_elements=list(KEY_INDEX_ELEMENTS),
+            set_={"quantity": table.c.quantity + statement.excluded.quantity},
+        ))
+        session.execute(
+            delete(table).where(*_key_filter(key)).where(func.abs(table.c.quantity) < QUANTITY_SCALE)
+        )
+
+class SummaryTracker:
+    """Zbiera udział obserwowanych zamówień przed zmianą, by po niej zapisać tylko różnicę."""
+
+    def __init__(self, session):
+        self.session = session
+        self.before = {}
+        self.order_ids = set()
+
+    def watch(self, *order_ids):
+        # wywołać przed zmianą zamówienia (nowe zamówienie: zaraz po flush, przed dodaniem pozycji)
+        new_ids = {i for i in order_ids if i is not None} - self.order_ids
+        if not new_ids:
+            return
+        self.session.flush()
+        for key, quantity in order_contributions(self.session, new_ids).items():
+            self.before[key] = self.before.get(key, 0) + quantity
+        self.order_ids |= new_ids
+
+    def apply(self):
+        self.session.flush()
+        deltas = {key: -quantity for key, quantity in self.before.items()}
+        for key, quantity in order_contributions(self.session, self.order_ids).items():
+            deltas[key] = deltas.get(key, 0) + quantity
+        apply_deltas(self.session, deltas)
+
+@contextmanager
+def track_summary(session, *order_ids):
+    """
+    with track_summary(session, order.id) as tracker:
+        ... zmiany pozycji / daty wysyłki ...
+        tracker.watch(nowe_zamowienie.id)   # zamówienie utworzone w trakcie
+    Różnica zapisuje się w tej samej transakcji co zmiany.
+    """
+    tracker = SummaryTracker(session)
+    tracker.watch(*order_ids)
+    yield tracker
+    tracker.apply()
+
+def summary_query(start_date=None, end_date=None):
+    """Odczyt gotowego zestawienia, posortowany jak production_query."""
+    query = select(ProductionSummary).order_by(*(getattr(ProductionSummary, n) for n in KEY_COLUMNS))
+    if start_date:
+        query = query.where(
+            (ProductionSummary.year * 100 + ProductionSummary.week)
+            >= _year_week(start_date)
+        )
+    if end_date:
+        query = query.where(
+            (ProductionSummary.year * 100 + ProductionSummary.week)
+            <= _year_week(end_date)
+        )
+    return query
+
+def _year_week(day):
+    year, week, _ = day.isocalendar()
+    return year * 100 + week
+
+def rebuild(session):
+    """Pełne przeliczenie tabeli z pozycji zamówień (sesja albo połączenie). Zwraca liczbę wierszy."""
+    table = ProductionSummary.__table__
+    session.execute(delete(table))
+    session.execute(
+        insert(table).from_select(list(KEY_COLUMNS) + ["quantity"], production_query().order_by(None))
+    )
+    return session.execute(select(func.count()).select_from(table)).scalar()
+
+def check(session):
+    """
+    Porównuje tabelę z wynikiem liczonym od zera.
+    Zwraca listę (klucz, w tabeli, powinno być) dla niezgodnych wierszy.
+    """
+    expected = {tuple(row[:5]): _quantity(row.quantity) for row in session.execute(production_query())}
+    stored = {
+        tuple(getattr(row, n) for n in KEY_COLUMNS): _quantity(row.quantity)
+        for row in session.scalars(select(ProductionSummary))
+    }
+    return [
+        (key, stored.get(key), expected.get(key))
+        for key in sorted(set(expected) | set(stored), key=_sort_key)
+        if stored.get(key) != expected.get(key)
+    ]
+
+def _sort_key(key):
+    return tuple((value is None, value if value is not None else 0) for value in key)
@@ -0,0 +1,28 @@
+# models/production_summary_cli.py
+# Obsługa tabeli production_summary z wiersza poleceń:
+#   python -m models.production_summary_cli check     - porównanie z pozycjami zamówień
+#   python -m models.production_summary_cli rebuild   - pełne przeliczenie
+import sys
+from .db import create_db, session_scope
+from .production_summary import check, rebuild
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    command = argv[0] if argv else "check"
+    if command not in ("rebuild", "check"):
+        print("Użycie: python -m models.production_summary_cli [rebuild|check]")
+        return 2
+    create_db()
+    with session_scope() as session:
+        if command == "rebuild":
+            print(f"Zestawienie przeliczone: {rebuild(session)} wierszy")
+            return 0
+        mismatches = check(session)
+    for key, stored, expected in mismatches:
+        print(f"{key}: w tabeli {stored}, powinno być {expected}")
+    print("Zestawienie zgodne z pozycjami zamówień" if not mismatches
+          else f"Niezgodnych wierszy: {len(mismatches)} (napraw: python -m models.production_summary_cli rebuild)")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
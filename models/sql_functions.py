@@ -0,0 +1,38 @@
+# models/sql_functions.py
+# Wyrażenia SQL zależne od bazy (PostgreSQL / SQLite) używane w zestawieniach.
+from sqlalchemy import Integer
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+class iso_year(FunctionElement):
+    """Rok ISO daty (tydzień 1 może zaczynać się w grudniu poprzedniego roku)."""
+    type = Integer()
+    name = "iso_year"
+    inherit_cache = True
+
+class iso_week(FunctionElement):
+    """Numer tygodnia ISO daty (1-53)."""
+    type = Integer()
+    name = "iso_week"
+    inherit_cache = True
+
+@compiles(iso_year, "postgresql")
+def _pg_iso_year(element, compiler, **kw):
+    return "CAST(EXTRACT(isoyear FROM %s) AS INTEGER)" % compiler.process(element.clauses, **kw)
+
+@compiles(iso_week, "postgresql")
+def _pg_iso_week(element, compiler, **kw):
+    return "CAST(EXTRACT(week FROM %s) AS INTEGER)" % compiler.process(element.clauses, **kw)
+
+# SQLite: tydzień ISO wyznacza czwartek tego samego tygodnia
+_SQLITE_THURSDAY = "date(%s, '-3 days', 'weekday 4')"
+
+@compiles(iso_year, "sqlite")
+def _sqlite_iso_year(element, compiler, **kw):
+    thursday = _SQLITE_THURSDAY % compiler.process(element.clauses, **kw)
+    return "CAST(strftime('%%Y', %s) AS INTEGER)" % thursday
+
+@compiles(iso_week, "sqlite")
+def _sqlite_iso_week(element, compiler, **kw):
+    thursday = _SQLITE_THURSDAY % compiler.process(element.clauses, **kw)
+    return "((CAST(strftime('%%j', %s) AS INTEGER) - 1) / 7 + 1)" % thursday
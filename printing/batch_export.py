@@ -0,0 +1,127 @@
+# printing/batch_export.py
+# Wydruk zbiorczy kart produkcyjnych albo potwierdzeń dla wielu zamówień naraz.
+#
+# Dane przychodzą jako kopie kolumn (models.order_queries.fetch_print_snapshots),
+# więc można je przekazać procesom roboczym. Osobne pliki renderowane są równolegle
+# w ProcessPoolExecutor; wspólny PDF to jeden dokument (fonty wczytane raz) składany
+# w jednym procesie. Podgląd otwierany jest najwyżej raz: wspólny plik albo katalog.
+# Postęp (progress) i przerwanie (is_cancelled) sprawdzane są po każdym zamówieniu -
+# z nich korzysta wydruk w tle z GUI (widgets.print_worker).
+# Osobne pliki najpierw szukane są w pamięci gotowych PDF-ów (printing.document_cache) -
+# niezmienione zamówienie nie jest renderowane ponownie.
+# W exe (PyInstaller) procesy robocze wymagają multiprocessing.freeze_support() w main.py,
+# a moduły importowane przez proces roboczy nie mogą tworzyć obiektów Qt ani łączyć się z bazą.
+#
+#   [batch_print]
+#   workers = 0                ; liczba procesów (0 - wg liczby rdzeni, 1 - bez procesów)
+#   parallel_min_orders = 4    ; od ilu zamówień renderować równolegle
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from utils.config import load_section
+from printing import order_confirmation, production_ticket
+from printing.document_cache import confirmation_output_dir, document_cache, document_key, production_output_dir
+from printing.order_confirmation import PDFGenerator, confirmation_data, confirmation_filename, new_confirmation_pdf
+from printing.production_ticket import ProductionTicketPDF, production_ticket_filename
+from printing.viewer import open_in_viewer
+
+KIND_PRODUCTION = "production"
+KIND_CONFIRMATION = "confirmation"
+
+BATCH_DEFAULTS = {
+    "workers": 0,
+    "parallel_min_orders": 4,
+}
+
+def load_batch_settings(path=None):
+    return load_section("batch_print", BATCH_DEFAULTS, path)
+
+def default_output_dir(kind):
+    return production_output_dir() if kind == KIND_PRODUCTION else confirmation_output_dir()
+
+def template_version(kind):
+    module = production_ticket if kind == KIND_PRODUCTION else order_confirmation
+    return module.TEMPLATE_VERSION
+
+def document_filename(kind, order, client):
+    if kind == KIND_PRODUCTION:
+        return production_ticket_filename(order, client)
+    return confirmation_filename(order, client)
+
+def new_document(kind):
+    return ProductionTicketPDF() if kind == KIND_PRODUCTION else new_confirmation_pdf()
+
+def render_order(pdf, kind, order, client, items):
+    """Dokłada do dokumentu strony jednego zamówienia."""
+    if kind == KIND_PRODUCTION:
+        pdf.ticket_page(order, client, items)
+    else:
+        PDFGenerator(confirmation_data(order, client, items)).render(pdf)
+
+def export_document(kind, job, path, use_cache=True):
+    """Plik PDF jednego zamówienia - z pamięci gotowych dokumentów albo renderowany."""
+    cache = document_cache() if use_cache else None
+    if cache is not None:
+        key = document_key(kind, template_version(kind), *job)
+        if cache.fetch(key, path):
+            return path
+    pdf = new_document(kind)
+    render_order(pdf, kind, *job)
+    pdf.output(path)
+    if cache is not None:
+        cache.store(key, path)
+    return path
+
+def export_batch(jobs, kind, merged=False, output_dir=None, merged_filename=None, settings=None, open_viewer=True,
+                 progress=None, is_cancelled=None):
+    """
+    jobs - trójki (zamówienie, klient, [pozycje]). merged=True - jeden wielostronicowy PDF,
+    inaczej plik na zamówienie (nazwy jak przy wydruku pojedynczym). Zwraca ścieżki plików.
+    progress(gotowe, wszystkie) - po każdym zamówieniu; is_cancelled() zwracające True
+    przerywa wydruk: zostają gotowe osobne pliki, wspólny plik nie powstaje.
+    """
+    if not jobs:
+        return []
+    settings = settings or load_batch_settings()
+    output_dir = output_dir or default_output_dir(kind)
+    os.makedirs(output_dir, exist_ok=True)
+    progress = progress or (lambda done, total: None)
+    is_cancelled = is_cancelled or (lambda: False)
+    total = len(jobs)
+
+    if merged:
+        path = os.path.join(output_dir, merged_filename or f"zbiorczo_{kind}.pdf")
+        pdf = new_document(kind)
+        for done, job in enumerate(jobs, 1):
+            if is_cancelled():
+                return []
+            render_order(pdf, kind, *job)
+            progress(done, total)
+        pdf.output(path)
+        paths = [path]
+    else:
+        tasks = [(kind, job, os.path.join(output_dir, document_filename(kind, job[0], job[1]))) for job in jobs]
+        workers = int(settings["workers"]) or None
+        paths = []
+        if workers != 1 and len(tasks) >= settings["parallel_min_orders"]:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(export_document, *task): i for i, task in enumerate(tasks)}
+                done_paths = {}
+                for future in as_completed(futures):
+                    done_paths[futures[future]] = future.result()
+                    progress(len(done_paths), total)
+                    if is_cancelled():
+                        pool.shutdown(cancel_futures=True)
+                        break
+                paths = [done_paths[i] for i in sorted(done_paths)]
+        else:
+            for task in tasks:
+                if is_cancelled():
+                    break
+                paths.append(export_document(*task))
+                progress(len(paths), total)
+        if is_cancelled():
+            return paths
+
+    if open_viewer:
+        open_in_viewer(paths[0] if len(paths) == 1 else output_dir)
+    return paths
@@ -0,0 +1,52 @@
+# printing/benchmark.py
+# Czas wygenerowania jednej karty produkcyjnej (w pamięci, bez zapisu na dysk):
+#   python -m printing.benchmark [liczba_dokumentów]
+# Porównuje rejestr fontów (printing.fonts) z parsowaniem TTF przy każdym dokumencie.
+import datetime
+import sys
+import time
+from types import SimpleNamespace
+from printing import fonts
+from printing.production_ticket import ProductionTicketPDF
+
+def sample_ticket():
+    order = SimpleNamespace(order_number="000567/TER", order_date=datetime.date(2025, 6, 2),
+                            delivery_date=datetime.date(2025, 6, 10), notes="Etykiety nawijane na zewnątrz")
+    client = SimpleNamespace(name="Przykładowa Firma Sp. z o.o.", short_name="Przykładowa", client_number="000123",
+                             street="ul. Przemysłowa 60", postal_code="43-110", city="Tychy")
+    items = [
+        SimpleNamespace(width=str(width), height="50", material="Termiczny", roll_length="1000", core="76",
+                        ordered_quantity="10", quantity_type="tyś.", zam_rolki="10", price="12,5", price_type="tyś.")
+        for width in (50, 100, 150)
+    ]
+    return order, client, items
+
+def render_ticket(order, client, items):
+    pdf = ProductionTicketPDF()
+    pdf.ticket_page(order, client, items)
+    return pdf.output()
+
+def per_document(count, job):
+    started = time.perf_counter()
+    for _ in range(count):
+        render_ticket(*job)
+    return (time.perf_counter() - started) / count
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    count = int(argv[0]) if argv else 20
+    job = sample_ticket()
+    fonts.CACHE_FONTS = False
+    try:
+        uncached = per_document(count, job)
+    finally:
+        fonts.CACHE_FONTS = True
+    render_ticket(*job)   # pierwsze parsowanie fontów poza pomiarem
+    cached = per_document(count, job)
+    print(f"Karta produkcyjna, {count} dokumentów:")
+    print(f"  parsowanie TTF w każdym dokumencie: {uncached * 1000:.1f} ms/dok.")
+    print(f"  rejestr fontów:                     {cached * 1000:.1f} ms/dok. ({uncached / cached:.1f}×)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
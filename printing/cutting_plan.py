@@ -0,0 +1,105 @@
+from fpdf import FPDF
+import os
+from printing.document_cache import production_output_dir
+from widgets.cutting_plan import pattern_label
+from utils.numbers import format_number
+from printing.fonts import add_fonts
+from printing.viewer import open_in_viewer
+
+PATTERN_HEADERS = ["Wzór", "Pasy [mm]", "Rolki matki", "Odpad [mm]"]
+PATTERN_COL_WIDTHS = [14, 106, 30, 40]
+BAR_HEIGHT = 5
+
+class CuttingPlanPDF(FPDF):
+    """Plan cięcia: dla każdego materiału wzory cięcia rolki matki z rysunkiem pasów."""
+
+    def __init__(self, title, master_width):
+        super().__init__(orientation='P', unit='mm', format='A4')
+        self.title_text = title
+        self.master_width = master_width
+        self.set_auto_page_break(True, margin=12)
+        self.set_margins(10, 10, 10)
+
+        add_fonts(self)
+
+    def header(self):
+        self.set_font("DejaVu", "B", 13)
+        self.cell(0, 8, self.title_text, ln=1)
+        self.set_font("DejaVu", "", 8)
+        self.cell(0, 5, f"Rolka matka: {format_number(self.master_width)} mm", ln=1)
+        self.ln(2)
+
+    def footer(self):
+        self.set_y(-10)
+        self.set_font("DejaVu", "", 7)
+        self.cell(0, 4, f"Strona {self.page_no()}", align="C")
+
+    def material(self, plan):
+        if self.get_y() + 30 > self.page_break_trigger:
+            self.add_page()
+        self.set_font("DejaVu", "B", 11)
+        self.set_fill_color(234, 255, 234)
+        self.cell(0, 7, (
+            f"{plan.material or '(brak materiału)'} - rolki matki: {plan.master_rolls} "
+            f"(min. {plan.lower_bound}), odpad: {format_number(round(plan.waste_pct, 1))}%"
+        ), border=1, fill=True, ln=1)
+        self.set_font("DejaVu", "", 8)
+        demand = ", ".join(f"{format_number(w)} mm × {n}" for w, n in plan.demand.items())
+        self.multi_cell(0, 4, f"Zapotrzebowanie (pasy): {demand}")
+        self.set_x(self.l_margin)
+        if plan.oversize:
+            self.set_text_color(200, 0, 0)
+            self.multi_cell(0, 4, "Szersze niż rolka matka: " + ", ".join(
+                f"{format_number(w)} mm × {n}" for w, n in plan.oversize.items()))
+            self.set_text_color(0, 0, 0)
+
+        self.set_x(self.l_margin)
+        self.set_font("DejaVu", "B", 8)
+        for width, text in zip(PATTERN_COL_WIDTHS, PATTERN_HEADERS):
+            self.cell(width, 6, text, border=1, align="C")
+        self.ln()
+        self.set_font("DejaVu", "", 8)
+        for number, pattern in enumerate(plan.patterns, start=1):
+            if self.get_y() + 6 + BAR_HEIGHT + 2 > self.page_break_trigger:
+                self.add_page()
+            cells = [str(number), pattern_label(pattern.lanes), str(pattern.count),
+                     format_number(round(pattern.waste_mm, 1))]
+            for col, (width, text) in enumerate(zip(PATTERN_COL_WIDTHS, cells)):
+                self.cell(width, 6, text, border=1, align="L" if col == 1 else "C")
+            self.ln()
+            self.lanes_bar(pattern.lanes)
+        self.ln(4)
+
+    def lanes_bar(self, lanes):
+        # rysunek rolki matki w skali: pasy na zielono, reszta szerokości to odpad
+        total = self.w - self.l_margin - self.r_margin
+        scale = total / self.master_width
+        y = self.get_y() + 1
+        self.set_draw_color(120, 120, 120)
+        self.set_fill_color(240, 240, 240)
+        self.rect(self.l_margin, y, total, BAR_HEIGHT, style="DF")
+        self.set_fill_color(197, 255, 215)
+        x = self.l_margin
+        for w in lanes:
+            self.rect(x, y, w * scale, BAR_HEIGHT, style="DF")
+            x += w * scale
+        self.set_draw_color(0, 0, 0)
+        self.set_y(y + BAR_HEIGHT + 1)
+
+def export_cutting_plan(plans, title, master_width, filename=None, open_viewer=True):
+    """Zapis planu cięcia do PDF (domyślnie w katalogu kart produkcyjnych) i otwarcie pliku."""
+    if not filename:
+        filename = os.path.join(production_output_dir(), "plan_ciecia.pdf")
+    output_dir = os.path.dirname(filename)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir, exist_ok=True)
+
+    pdf = CuttingPlanPDF(title, master_width)
+    pdf.add_page()
+    for plan in plans:
+        pdf.material(plan)
+    pdf.output(filename)
+
+    if open_viewer:
+        open_in_viewer(filename)
+    return filename
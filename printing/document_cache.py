@@ -0,0 +1,129 @@
+# printing/document_cache.py
+# Katalogi wydruków i pamięć gotowych PDF-ów kart produkcyjnych i potwierdzeń.
+#
+#   [pdf_output]
+#   production_dir =        ; karty produkcyjne i plany cięcia (puste - domyślny)
+#   confirmation_dir =      ; potwierdzenia dla klienta (puste - domyślny)
+#   cache_dir =             ; pamięć PDF-ów (puste - <katalog tymczasowy>/zamowienia_pdf)
+#   cache_max_mb = 200      ; po przekroczeniu usuwane są najdawniej użyte pliki
+#   cache_enabled = true
+#
+# Domyślnie na Windows zostają dotychczasowe c:\produkcja i c:\potwierdzenia dla klienta,
+# na innych systemach ~/Zamowienia/produkcja i ~/Zamowienia/potwierdzenia dla klienta.
+#
+# Klucz dokumentu to SHA-256 z rodzaju, wersji szablonu (TEMPLATE_VERSION w module
+# wydruku - podbijana przy każdej zmianie wyglądu), wersji fpdf2 oraz kolumn zamówienia,
+# klienta i pozycji. Pola statusu i indeks wyszukiwania nie trafiają na wydruk, więc
+# nie wchodzą do klucza. Ponowny wydruk niezmienionego zamówienia to kopia pliku
+# z pamięci, bez renderowania. Czas użycia to mtime pliku (odświeżany przy trafieniu).
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+from fpdf import FPDF_VERSION
+from utils.config import load_section
+
+OUTPUT_DEFAULTS = {
+    "production_dir": "",
+    "confirmation_dir": "",
+    "cache_dir": "",
+    "cache_max_mb": 200,
+    "cache_enabled": True,
+}
+
+# Kolumny, które nie wpływają na wygląd dokumentu
+UNPRINTED_FIELDS = {"status", "status_changed_at", "in_production_at", "done_at", "shipped_at", "search_text"}
+
+def load_output_settings(path=None):
+    return load_section("pdf_output", OUTPUT_DEFAULTS, path)
+
+def _configured_dir(value, windows_dir, name):
+    if value.strip():
+        return os.path.expanduser(value.strip())
+    if sys.platform.startswith("win"):
+        return windows_dir
+    return os.path.join(os.path.expanduser("~"), "Zamowienia", name)
+
+def production_output_dir(settings=None):
+    settings = settings or load_output_settings()
+    return _configured_dir(settings["production_dir"], r"c:\produkcja", "produkcja")
+
+def confirmation_output_dir(settings=None):
+    settings = settings or load_output_settings()
+    return _configured_dir(settings["confirmation_dir"], r"c:\potwierdzenia dla klienta", "potwierdzenia dla klienta")
+
+def _printed_fields(obj):
+    if obj is None:
+        return None
+    data = obj if isinstance(obj, dict) else vars(obj)
+    return {key: value for key, value in data.items() if key not in UNPRINTED_FIELDS and not key.startswith("_")}
+
+def document_key(kind, template_version, order, client, items):
+    """Skrót danych dokumentu - obiekty to kopie kolumn (models.order_queries.column_snapshot)."""
+    payload = [
+        kind, template_version, FPDF_VERSION,
+        _printed_fields(order), _printed_fields(client), [_printed_fields(item) for item in items],
+    ]
+    data = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+class PDFCache:
+    """Katalog plików <klucz>.pdf ograniczony rozmiarem (LRU)."""
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def fetch(self, key, target_path):
+        """Kopiuje zapamiętany dokument do target_path. False - brak w pamięci."""
+        source = self.path(key)
+        try:
+            shutil.copyfile(source, target_path)
+            os.utime(source)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def store(self, key, source_path):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            temp_path = f"{self.path(key)}.{os.getpid()}"
+            shutil.copyfile(source_path, temp_path)
+            os.replace(temp_path, self.path(key))
+        except OSError:
+            return   # bez zapisu - dokument i tak jest już w katalogu wydruków
+        self.evict()
+
+    def evict(self):
+        """Usuwa najdawniej użyte pliki, aż suma rozmiarów zmieści się w max_bytes."""
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(".pdf"):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except FileNotFoundError:
+            return
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass   # usunięty przez inny proces albo otwarty
+            total -= size
+
+def document_cache(settings=None):
+    """Pamięć PDF-ów wg [pdf_output]; None - wyłączona."""
+    settings = settings or load_output_settings()
+    if not settings["cache_enabled"]:
+        return None
+    directory = os.path.expanduser(settings["cache_dir"].strip()) or os.path.join(tempfile.gettempdir(), "zamowienia_pdf")
+    return PDFCache(directory, settings["cache_max_mb"] * 1024 * 1024)
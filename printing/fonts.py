@@ -0,0 +1,126 @@
+# printing/fonts.py
+# Rejestr fontów TTF wspólny dla wszystkich PDF-ów w procesie.
+#
+# FPDF.add_font parsuje cały plik TTF (glyf, post, hmtx, cmap) przy każdym dokumencie,
+# a przy zapisie przycina go do użytych znaków - przy jednostronicowej karcie to
+# większość czasu. Tu każdy plik jest raz w procesie:
+#   - przycinany do zakresów Unicode z UNICODE_COVERAGE (łacinka z polskimi znakami,
+#     greka, cyrylica, interpunkcja, symbole) - DejaVu ma ich dużo więcej, a koszt
+#     przycinania przy zapisie rośnie z wielkością fontu,
+#   - parsowany - szerokości znaków, cmap i deskryptor są współdzielone.
+# Przycięty plik trafia też do katalogu tymczasowego, żeby kolejne procesy (start
+# programu, procesy wydruku zbiorczego) nie przycinały go od nowa.
+# Dokument dostaje własną kopię obiektu fontu z pustym podzbiorem glifów i leniwie
+# otwartym TTFont z przyciętych bajtów - fpdf2 przycina go w miejscu przy zapisie,
+# więc samego TTFont nie można dzielić między dokumentami.
+# Kopia sięga do wewnętrznych pól TTFFont (sprawdzone na fpdf2 2.8.9, wersja przypięta
+# w requirements.txt). Gdy inna wersja ich nie ma, font jest dodawany zwykłym add_font.
+import copy
+import os
+import tempfile
+import threading
+import zlib
+from io import BytesIO
+from fontTools import subset as ftsubset
+from fontTools import ttLib
+from fpdf import FPDF
+from fpdf.enums import TextEmphasis
+try:
+    from fpdf.fonts import SubsetMap, TTFFont
+except ImportError:   # inna wersja fpdf2 - tylko zwykłe add_font
+    SubsetMap = TTFFont = None
+
+FONT_DIR = os.path.dirname(__file__)
+DEJAVU_FONTS = {"": "DejaVuSans.ttf", "B": "DejaVuSans-Bold.ttf"}
+CACHE_FONTS = True   # False - zwykłe add_font (porównanie w printing.benchmark)
+
+UNICODE_COVERAGE = (
+    (0x0020, 0x052F),   # łacinka z rozszerzeniami, IPA, greka, cyrylica
+    (0x1E00, 0x1EFF),   # łacinka - rozszerzenie dodatkowe
+    (0x2000, 0x23FF),   # interpunkcja, waluty, strzałki, symbole matematyczne i techniczne
+    (0x2500, 0x27BF),   # ramki, kształty, symbole różne, dingbaty (⚠, ✓)
+)
+
+_templates = {}
+_lock = threading.Lock()
+
+def trimmed_font_data(path):
+    """Bajty fontu z glifami tylko dla UNICODE_COVERAGE (nazwy glifów zachowane)."""
+    font = ttLib.TTFont(path, recalcTimestamp=False)
+    unicodes = [u for u in font.getBestCmap() if any(lo <= u <= hi for lo, hi in UNICODE_COVERAGE)]
+    options = ftsubset.Options(glyph_names=True, notdef_outline=True, recommended_glyphs=True)
+    options.drop_tables += ["GDEF", "GPOS", "GSUB", "FFTM", "hdmx", "meta", "MATH"]
+    subsetter = ftsubset.Subsetter(options)
+    subsetter.populate(unicodes=unicodes)
+    subsetter.subset(font)
+    output = BytesIO()
+    font.save(output)
+    return output.getvalue()
+
+def _trimmed_cache_path(path):
+    stat = os.stat(path)
+    key = zlib.crc32(repr((UNICODE_COVERAGE, stat.st_size, stat.st_mtime_ns)).encode())
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(tempfile.gettempdir(), "zamowienia_fonts", f"{name}-{key:08x}.ttf")
+
+def _load_trimmed(path):
+    cache_path = _trimmed_cache_path(path)
+    try:
+        with open(cache_path, "rb") as f:
+            return f.read()
+    except OSError:
+        pass
+    data = trimmed_font_data(path)
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        pass   # bez zapisu - przycięcie w następnym procesie
+    return data
+
+def _template(path):
+    """(sparsowany font, bajty przyciętego pliku) - raz na plik w procesie."""
+    with _lock:
+        entry = _templates.get(path)
+        if entry is None:
+            data = _load_trimmed(path)
+            template = TTFFont(FPDF(), BytesIO(data), "template", "")
+            template.ttfont = None
+            entry = _templates[path] = (template, data)
+        return entry
+
+def add_cached_font(pdf, family, style, filename):
+    """Jak pdf.add_font(family, style, plik z katalogu printing), ale bez ponownego parsowania pliku."""
+    path = os.path.join(FONT_DIR, filename)
+    fontkey = f"{family.lower()}{style}"
+    if fontkey in pdf.fonts:
+        return
+    if not CACHE_FONTS or TTFFont is None:
+        pdf.add_font(family, style, path)
+        return
+    try:
+        pdf.fonts[fontkey] = _document_font(path, fontkey, style, len(pdf.fonts) + 1)
+    except (AttributeError, TypeError):   # zmienione wnętrze fpdf2
+        pdf.add_font(family, style, path)
+
+def _document_font(path, fontkey, style, number):
+    template, data = _template(path)
+    font = copy.copy(template)
+    font.i = number
+    font.fontkey = fontkey
+    font.emphasis = TextEmphasis.coerce(style)
+    font.desc = copy.copy(template.desc)   # obiekt PDF - dostaje numer w dokumencie
+    font.ttfont = ttLib.TTFont(BytesIO(data), recalcTimestamp=False, lazy=True)
+    font.subset = SubsetMap(font)
+    font.missing_glyphs = []
+    font.biggest_size_pt = 0
+    font._hbfont = None
+    return font
+
+def add_fonts(pdf, fonts=DEJAVU_FONTS, family="DejaVu"):
+    """Rejestruje w dokumencie rodzinę fontów: {styl: plik TTF}."""
+    for style, filename in fonts.items():
+        add_cached_font(pdf, family, style, filename)
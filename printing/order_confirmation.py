@@ -1,14 +1,18 @@
 from fpdf import FPDF
 import os
-import sys
-import webbrowser
 import datetime
+from utils.numbers import format_number
+from printing.fonts import add_fonts
+from printing.viewer import open_in_viewer
+
+# Wersja wyglądu potwierdzenia - podbić przy zmianie szablonu (klucz printing.document_cache)
+TEMPLATE_VERSION = 1
 
 def orderitem_to_pdf_dict(orderitem):
     def format_cena(cena, cena_typ):
         if not cena:
             return ""
-        cena_str = str(cena)
+        cena_str = format_number(cena)
         typ = str(cena_typ).lower()
         typ = typ.replace(".", "").replace(" ", "")
         typ = (typ.replace("ę", "e")
@@ -29,34 +33,34 @@ def orderitem_to_pdf_dict(orderitem):
 
     if isinstance(orderitem, dict):
         cena_typ = orderitem.get("price_type") or orderitem.get("CenaTyp") or ""
-        width = str(orderitem.get("Szerokość", orderitem.get("width", "")))
-        height = str(orderitem.get("Wysokość", orderitem.get("height", "")))
+        width = format_number(orderitem.get("Szerokość", orderitem.get("width", "")))
+        height = format_number(orderitem.get("Wysokość", orderitem.get("height", "")))
         wymiar = f"{width} x {height}" if width and height else width or height
         cena = orderitem.get("Cena", orderitem.get("price", ""))
         miara = orderitem.get("quantity_type") or orderitem.get("Typ ilości") or ""
         return {
             "Wymiar": wymiar,
             "Rodzaj materiału": orderitem.get("Rodzaj materiału", orderitem.get("material", "")),
-            "Ilość na rolce": orderitem.get("nawój/długość", orderitem.get("roll_length", "")),
+            "Ilość na rolce": format_number(orderitem.get("nawój/długość", orderitem.get("roll_length", ""))),
             "Średnica rdzenia": orderitem.get("Średnica rdzenia", orderitem.get("core", "")),
-            "Ilość": orderitem.get("zam. ilość", orderitem.get("ordered_quantity", "")),
+            "Ilość": format_number(orderitem.get("zam. ilość", orderitem.get("ordered_quantity", ""))),
             "Miara": miara,
             "zam. rolki": orderitem.get("zam. rolki", orderitem.get("zam_rolki", "")),
             "Cena": format_cena(cena, cena_typ)
         }
     else:
         cena_typ = getattr(orderitem, "price_type", "") or getattr(orderitem, "CenaTyp", "")
-        width = str(getattr(orderitem, "Szerokość", getattr(orderitem, "width", "")))
-        height = str(getattr(orderitem, "Wysokość", getattr(orderitem, "height", "")))
+        width = format_number(getattr(orderitem, "Szerokość", getattr(orderitem, "width", "")))
+        height = format_number(getattr(orderitem, "Wysokość", getattr(orderitem, "height", "")))
         wymiar = f"{width} x {height}" if width and height else width or height
         cena = getattr(orderitem, "Cena", getattr(orderitem, "price", ""))
         miara = getattr(orderitem, "quantity_type", "") or getattr(orderitem, "Typ ilości", "")
         return {
             "Wymiar": wymiar,
             "Rodzaj materiału": getattr(orderitem, "Rodzaj materiału", getattr(orderitem, "material", "")),
-            "Ilość na rolce": getattr(orderitem, "nawój_długość", getattr(orderitem, "roll_length", "")),
+            "Ilość na rolce": format_number(getattr(orderitem, "nawój_długość", getattr(orderitem, "roll_length", ""))),
             "Średnica rdzenia": getattr(orderitem, "Średnica rdzenia", getattr(orderitem, "core", "")),
-            "Ilość": getattr(orderitem, "zam_ilość", getattr(orderitem, "ordered_quantity", "")),
+            "Ilość": format_number(getattr(orderitem, "zam_ilość", getattr(orderitem, "ordered_quantity", ""))),
             "Miara": miara,
             "zam. rolki": getattr(orderitem, "zam. rolki", getattr(orderitem, "zam_rolki", "")),
             "Cena": format_cena(cena, cena_typ)
@@ -86,25 +90,31 @@ def format_pdf_value(value):
         return value.strftime("%Y-%m-%d")
     return str(value) if value is not None else ""
 
+def new_confirmation_pdf():
+    """Dokument A4 z fontami potwierdzeń; PDFGenerator.render dokłada do niego strony."""
+    pdf = FPDF(orientation="P", unit="mm", format="A4")
+    pdf.set_auto_page_break(auto=True, margin=5)
+    pdf.set_margins(left=10, top=10, right=10)
+    add_fonts(pdf)
+    return pdf
+
 class PDFGenerator:
     def __init__(self, order):
         self.order = order
 
-    def generate_pdf(self, filename="output.pdf"):
-        pdf = FPDF(orientation="P", unit="mm", format="A4")
-        pdf.set_auto_page_break(auto=True, margin=5)
+    def generate_pdf(self, filename="output.pdf", open_viewer=True):
+        pdf = new_confirmation_pdf()
+        self.render(pdf)
+        pdf.output(filename)
+
+        if open_viewer:
+            open_in_viewer(filename)
+
+    def render(self, pdf):
         left_margin = 10
         right_margin = 10
-        top_margin = 10
-        pdf.set_margins(left=left_margin, top=top_margin, right=right_margin)
         pdf.add_page()
 
-        folder = os.path.dirname(__file__)
-        font_regular = os.path.join(folder, "DejaVuSans.ttf")
-        font_bold = os.path.join(folder, "DejaVuSans-Bold.ttf")
-        pdf.add_font("DejaVu", "", font_regular, uni=True)
-        pdf.add_font("DejaVu", "B", font_bold, uni=True)
-
         color_accent = (77, 144, 254)
         color_header_bg = (0, 0, 0)
         color_white = (255, 255, 255)
@@ -323,24 +333,8 @@ class PDFGenerator:
         pdf.set_x(page_center - text_width / 2)
         pdf.cell(text_width, 3, center_text, align="C")
 
-        pdf.output(filename)
-
-        abs_path = os.path.abspath(filename)
-        if sys.platform.startswith("win"):
-            os.startfile(abs_path)
-        elif sys.platform.startswith("darwin"):
-            os.system(f'open "{abs_path}"')
-        else:
-            try:
-                webbrowser.open(f'file://{abs_path}')
-            except Exception:
-                os.system(f'xdg-open "{abs_path}"')
-
-def export_order_to_pdf(order, client, order_items, filename):
-    output_dir = os.path.dirname(filename)
-    if output_dir and not os.path.exists(output_dir):
-        os.makedirs(output_dir, exist_ok=True)
-
+def confirmation_data(order, client, order_items):
+    """Słownik danych potwierdzenia (klucze jak w PDFGenerator) z zamówienia, klienta i pozycji."""
     client_dict = client_to_pdf_dict(client) if client else {}
     order_items_dicts = [orderitem_to_pdf_dict(item) for item in (order_items or [])]
     order_data = dict(order) if isinstance(order, dict) else {}
@@ -388,5 +382,17 @@ def export_order_to_pdf(order, client, order_items, filename):
         if key in order_data and isinstance(order_data[key], (datetime.date, datetime.datetime)):
             order_data[key] = order_data[key].strftime("%Y-%m-%d")
 
-    pdfgen = PDFGenerator(order_data)
-    pdfgen.generate_pdf(filename)
\ No newline at end of file
+    return order_data
+
+def confirmation_filename(order, client):
+    safe_name = "".join(c if c.isalnum() or c in "._-" else "_" for c in getattr(client, "name", "") or "klient")
+    safe_order = "".join(c for c in str(getattr(order, "order_number", "")) if c.isalnum() or c in "._-")
+    return f"{safe_order}_{safe_name}.pdf"
+
+def export_order_to_pdf(order, client, order_items, filename, open_viewer=True):
+    output_dir = os.path.dirname(filename)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir, exist_ok=True)
+
+    pdfgen = PDFGenerator(confirmation_data(order, client, order_items))
+    pdfgen.generate_pdf(filename, open_viewer)
\ No newline at end of file
@@ -1,9 +1,15 @@
 from fpdf import FPDF
 import os
-import sys
-import webbrowser
 import datetime
 import re
+from utils.numbers import format_number
+from printing.fonts import DEJAVU_FONTS, add_fonts
+from printing.text_layout import TextLayout
+from printing.document_cache import production_output_dir
+from printing.viewer import open_in_viewer
+
+# Wersja wyglądu karty - podbić przy zmianie szablonu (klucz printing.document_cache)
+TEMPLATE_VERSION = 1
 
 def format_pdf_value(value):
     if isinstance(value, (datetime.date, datetime.datetime)):
@@ -13,7 +19,7 @@ def format_pdf_value(value):
 def format_cena(cena, cena_typ):
     if not cena:
         return ""
-    cena_str = str(cena)
+    cena_str = format_number(cena)
     typ = str(cena_typ).lower().replace(".", "").replace(" ", "")
     typ = (typ.replace("ę", "e")
               .replace("ł", "l")
@@ -32,13 +38,13 @@ def format_cena(cena, cena_typ):
         return cena_str
 
 def orderitem_to_pdf_row(orderitem):
-    width = str(getattr(orderitem, "width", getattr(orderitem, "Szerokość", "")))
-    height = str(getattr(orderitem, "height", getattr(orderitem, "Wysokość", "")))
+    width = format_number(getattr(orderitem, "width", getattr(orderitem, "Szerokość", "")))
+    height = format_number(getattr(orderitem, "height", getattr(orderitem, "Wysokość", "")))
     wymiar = f"{width}x{height}" if width and height else width or height
     material = getattr(orderitem, "material", getattr(orderitem, "Rodzaj materiału", ""))
-    roll_length = getattr(orderitem, "roll_length", getattr(orderitem, "nawój/długość", ""))
+    roll_length = format_number(getattr(orderitem, "roll_length", getattr(orderitem, "nawój/długość", "")))
     core = getattr(orderitem, "core", getattr(orderitem, "Średnica rdzenia", ""))
-    ordered_quantity = getattr(orderitem, "ordered_quantity", getattr(orderitem, "zam. ilość", ""))
+    ordered_quantity = format_number(getattr(orderitem, "ordered_quantity", getattr(orderitem, "zam. ilość", "")))
     miara = getattr(orderitem, "quantity_type", getattr(orderitem, "Typ ilości", ""))
     zam_rolki = getattr(orderitem, "zam. rolki", getattr(orderitem, "zam_rolki", ""))
     cena = getattr(orderitem, "Cena", getattr(orderitem, "price", ""))
@@ -59,12 +65,9 @@ class ProductionTicketPDF(FPDF):
         self.ticket_height = 90
         self.ticket_spacing = 6
 
-        folder = os.path.dirname(__file__)
-        font_regular = os.path.join(folder, "DejaVuSans.ttf")
-        font_bold = os.path.join(folder, "DejaVuSans-Bold.ttf")
-        self.add_font("DejaVu", "", font_regular, uni=True)
-        self.add_font("DejaVu", "B", font_bold, uni=True)
-        self.add_font("DejaVu", "I", font_regular, uni=True)  # fallback for italic if needed
+        # "I" - zwykły krój jako zastępstwo kursywy
+        add_fonts(self, dict(DEJAVU_FONTS, I=DEJAVU_FONTS[""]))
+        self.layout = TextLayout(self)
 
     def draw_cut_mark(self):
         y_cut = self.page_height / 2
@@ -80,14 +83,8 @@ class ProductionTicketPDF(FPDF):
         self.set_text_color(0, 0, 0)
 
     def fit_font_size(self, text, width, max_fontsize=7, min_fontsize=5):
-        """Dopasuj wielkość fontu do pojedynczej linii żeby tekst się zmieścił."""
-        font_size = max_fontsize
-        while font_size >= min_fontsize:
-            self.set_font("DejaVu", "", font_size)
-            if self.get_string_width(text) <= width:
-                return font_size
-            font_size -= 0.2
-        return min_fontsize
+        """Dopasuj wielkość fontu (co 0.2 pt) do pojedynczej linii żeby tekst się zmieścił."""
+        return self.layout.fit_size(text, width, "DejaVu", "", max_fontsize, min_fontsize)
 
     def multi_cell_row(self, col_widths, row, align='C', max_font=7, min_font=5):
         """Rysuje wiersz tabeli z automatycznym zawijaniem i dopasowaniem fontu."""
@@ -98,9 +95,8 @@ class ProductionTicketPDF(FPDF):
         for i in range(n):
             cell_val = str(row[i])
             font_size = self.fit_font_size(cell_val, col_widths[i], max_font, min_font)
-            self.set_font("DejaVu", "", font_size)
             # policz ile linii zajmuje tekst przy tej szerokości
-            line_count = len(self.multi_cell_preview(col_widths[i], 5, cell_val))
+            line_count = len(self.layout.wrap(cell_val, col_widths[i], "DejaVu", "", font_size))
             lines.append(line_count)
             font_sizes.append(font_size)
         max_lines = max(lines)
@@ -116,20 +112,15 @@ class ProductionTicketPDF(FPDF):
 
     def multi_cell_preview(self, w, h, txt):
         # Helper: podziel tekst na linie jak zrobiłoby to MultiCell (do ustalenia wysokości)
-        # FPDF nie udostępnia takiej funkcji, więc używamy prostego podziału.
-        result = []
-        words = txt.split()
-        line = ""
-        for word in words:
-            test_line = (line + " " + word).strip()
-            if self.get_string_width(test_line) <= w:
-                line = test_line
-            else:
-                result.append(line)
-                line = word
-        if line:
-            result.append(line)
-        return result
+        # FPDF nie udostępnia takiej funkcji, więc używamy prostego podziału (bieżący font).
+        return self.layout.wrap(txt, w, self.font_family, self.font_style, self.font_size_pt)
+
+    def ticket_page(self, order, client, order_items):
+        """Strona A5 z dwiema kartami zamówienia rozdzielonymi linią cięcia."""
+        self.add_page()
+        self.ticket(order, client, order_items, y_offset=0)
+        self.draw_cut_mark()
+        self.ticket(order, client, order_items, y_offset=self.ticket_height + self.ticket_spacing, table_full_width=True)
 
     def ticket(self, order, client, order_items, y_offset, table_full_width=False):
         x = self.margin_left
@@ -315,11 +306,11 @@ class ProductionTicketPDF(FPDF):
         n = len(headers)
         col_widths = [min_width] * n
         for i, header in enumerate(headers):
-            w = self.get_string_width(str(header)) + 2 * padding
+            w = self.layout.current_width(str(header)) + 2 * padding
             col_widths[i] = max(col_widths[i], min(w, max_width))
         for row in rows:
             for i, val in enumerate(row):
-                w = self.get_string_width(str(val)) + 2 * padding
+                w = self.layout.current_width(str(val)) + 2 * padding
                 col_widths[i] = max(col_widths[i], min(w, max_width))
         sum_width = sum(col_widths)
         if sum_width != total_width:
@@ -334,31 +325,22 @@ def clean_filename(name):
     import re
     return re.sub(r'[^a-zA-Z0-9._-]', '_', name)
 
-def export_production_ticket(order, client, order_items, filename=None):
-    output_dir = r"c:\\produkcja"
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir, exist_ok=True)
+def production_ticket_filename(order, client):
     safe_order = clean_filename(str(getattr(order, "order_number", getattr(order, "Nr zamówienia", "zamowienie"))))
     safe_name = clean_filename(str(getattr(client, "name", getattr(client, "Firma", "klient"))))
+    return f"{safe_order}_{safe_name}_PRODUKCJA.pdf"
+
+def export_production_ticket(order, client, order_items, filename=None, open_viewer=True):
+    output_dir = production_output_dir()
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir, exist_ok=True)
     if not filename:
-        filename = f"{safe_order}_{safe_name}_PRODUKCJA.pdf"
+        filename = production_ticket_filename(order, client)
     output_path = os.path.join(output_dir, filename)
 
     pdf = ProductionTicketPDF()
-    pdf.add_page()
-    pdf.ticket(order, client, order_items, y_offset=0)
-    pdf.draw_cut_mark()
-    pdf.ticket(order, client, order_items, y_offset=pdf.ticket_height + pdf.ticket_spacing, table_full_width=True)
-
+    pdf.ticket_page(order, client, order_items)
     pdf.output(output_path)
 
-    abs_path = os.path.abspath(output_path)
-    if sys.platform.startswith("win"):
-        os.startfile(abs_path)
-    elif sys.platform.startswith("darwin"):
-        os.system(f'open "{abs_path}"')
-    else:
-        try:
-            webbrowser.open(f'file://{abs_path}')
-        except Exception:
-            os.system(f'xdg-open "{abs_path}"')
\ No newline at end of file
+    if open_viewer:
+        open_in_viewer(output_path)
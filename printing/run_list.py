@@ -0,0 +1,82 @@
+from fpdf import FPDF
+import os
+from widgets.production_sequencer import RUN_LIST_HEADERS, item_cells, run_step_cells
+from utils.numbers import format_number
+from printing.fonts import add_fonts
+from printing.viewer import open_in_viewer
+
+# Szerokości kolumn [mm] dla A4 poziomo (suma 277)
+STEP_COL_WIDTHS = [12, 55, 25, 22, 20, 113, 30]
+ITEM_COL_WIDTHS = [45, 90, 50, 60]
+ITEM_INDENT = 32
+
+class RunListPDF(FPDF):
+    """Lista kolejności produkcji: wiersz ustawienia maszyny, pod nim pozycje do zrobienia."""
+
+    def __init__(self, title):
+        super().__init__(orientation='L', unit='mm', format='A4')
+        self.title_text = title
+        self.set_auto_page_break(True, margin=12)
+        self.set_margins(10, 10, 10)
+
+        add_fonts(self)
+
+    def header(self):
+        self.set_font("DejaVu", "B", 13)
+        self.cell(0, 8, self.title_text, ln=1)
+        self.set_font("DejaVu", "B", 9)
+        self.set_fill_color(197, 255, 215)
+        for width, text in zip(STEP_COL_WIDTHS, RUN_LIST_HEADERS):
+            self.cell(width, 7, text, border=1, align="C", fill=True)
+        self.ln()
+
+    def footer(self):
+        self.set_y(-10)
+        self.set_font("DejaVu", "", 7)
+        self.cell(0, 4, f"Strona {self.page_no()}", align="C")
+
+    def step(self, number, step):
+        # krok razem z pozycjami na jednej stronie, jeśli się mieści
+        needed = 7 + 5 * len(step.items)
+        if needed < self.h - 30 and self.get_y() + needed > self.page_break_trigger:
+            self.add_page()
+        self.set_font("DejaVu", "B", 9)
+        self.set_fill_color(234, 255, 234)
+        for width, text in zip(STEP_COL_WIDTHS, run_step_cells(number, step)):
+            self.cell(width, 7, self.fit(text, width), border=1, fill=True)
+        self.ln()
+        self.set_font("DejaVu", "", 8)
+        for item in step.items:
+            self.set_x(self.l_margin + ITEM_INDENT)
+            for width, text in zip(ITEM_COL_WIDTHS, item_cells(item)):
+                self.cell(width, 5, self.fit(text, width), border="B")
+            self.ln()
+
+    def fit(self, text, width):
+        """Skraca tekst, który nie mieści się w kolumnie."""
+        if self.get_string_width(text) <= width - 2:
+            return text
+        while text and self.get_string_width(text + "…") > width - 2:
+            text = text[:-1]
+        return text + "…"
+
+def export_run_list(run_list, title, filename, open_viewer=True):
+    """Zapis listy kolejności do PDF i otwarcie pliku."""
+    output_dir = os.path.dirname(filename)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir, exist_ok=True)
+
+    pdf = RunListPDF(title)
+    pdf.add_page()
+    for number, step in enumerate(run_list.steps, start=1):
+        pdf.step(number, step)
+    pdf.ln(3)
+    pdf.set_font("DejaVu", "B", 10)
+    pdf.cell(0, 6, (
+        f"Przezbrojenia: {format_number(round(run_list.total_cost, 1))} "
+        f"(kolejność wg zamówień: {format_number(round(run_list.baseline_cost, 1))})"
+    ), ln=1)
+    pdf.output(filename)
+
+    if open_viewer:
+        open_in_viewer(filename)
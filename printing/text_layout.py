@@ -0,0 +1,75 @@
+# printing/text_layout.py
+# Pomiar tekstu dla tabel w PDF bez przestawiania fontu dokumentu.
+#
+# Szerokość napisu w foncie TTF jest liniowa względem rozmiaru, więc każdy
+# (napis, font) mierzony jest raz - dla rozmiaru 1 pt - a potem tylko skalowany.
+# Pamięć podręczna jest wspólna dla procesu (metryki fontów też, printing.fonts),
+# klucz to nazwa fontu z pliku TTF, a nie rodzina z add_font: "I" na karcie
+# produkcyjnej to zwykły DejaVu i dzieli z nim pomiary.
+import math
+
+MAX_CACHED_WIDTHS = 20000   # po przekroczeniu pamięć jest czyszczona
+
+_unit_widths = {}
+
+class TextLayout:
+    """Pomiar, dopasowanie rozmiaru i podział na linie dla jednego dokumentu FPDF."""
+
+    def __init__(self, pdf):
+        self.pdf = pdf
+
+    def unit_width(self, text, family, style=""):
+        """Szerokość napisu (w jednostkach dokumentu) dla fontu 1 pt."""
+        pdf = self.pdf
+        font = pdf.fonts[f"{family.lower()}{style}"]
+        key = (font.name, text)
+        width = _unit_widths.get(key)
+        if width is None:
+            if len(_unit_widths) >= MAX_CACHED_WIDTHS:
+                _unit_widths.clear()
+            _, width = font.get_text_width(pdf.normalize_text(text), 1, None)
+            _unit_widths[key] = width
+        return width / pdf.k
+
+    def width(self, text, family, style, size):
+        return self.unit_width(text, family, style) * size
+
+    def current_width(self, text):
+        """Jak pdf.get_string_width - dla bieżącego fontu dokumentu."""
+        pdf = self.pdf
+        return self.width(text, pdf.font_family, pdf.font_style, pdf.font_size_pt)
+
+    def fit_size(self, text, width, family, style="", max_size=7, min_size=5, step=0.2):
+        """
+        Największy rozmiar z szeregu max_size, max_size - step, ... (nie mniejszy niż
+        min_size), przy którym napis mieści się w jednej linii o szerokości width.
+        """
+        unit = self.unit_width(text, family, style)
+        if unit * max_size <= width:
+            return max_size
+        steps = math.ceil((max_size - width / unit) / step - 1e-9)
+        return max(round(max_size - steps * step, 6), min_size)
+
+    def wrap(self, text, width, family, style, size):
+        """
+        Podział na linie po słowach (bez dzielenia wyrazów) - szerokość linii to suma
+        zapamiętanych szerokości słów i spacji. Słowo szersze od kolumny zaczyna nową
+        linię, przed nim zostaje linia pusta - tak liczył wcześniej podgląd karty.
+        """
+        space = self.width(" ", family, style, size)
+        result = []
+        line = ""
+        line_width = 0
+        for word in text.split():
+            word_width = self.width(word, family, style, size)
+            test_width = line_width + space + word_width if line else word_width
+            if test_width <= width:
+                line = f"{line} {word}" if line else word
+                line_width = test_width
+            else:
+                result.append(line)
+                line = word
+                line_width = word_width
+        if line:
+            result.append(line)
+        return result
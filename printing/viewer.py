@@ -0,0 +1,16 @@
+import os
+import sys
+import webbrowser
+
+def open_in_viewer(path):
+    """Otwarcie pliku (albo katalogu) w domyślnym programie systemu."""
+    abs_path = os.path.abspath(path)
+    if sys.platform.startswith("win"):
+        os.startfile(abs_path)
+    elif sys.platform.startswith("darwin"):
+        os.system(f'open "{abs_path}"')
+    else:
+        try:
+            webbrowser.open(f'file://{abs_path}')
+        except Exception:
+            os.system(f'xdg-open "{abs_path}"')
@@ -0,0 +1,19 @@
+import pytest
+from sqlalchemy.orm import sessionmaker
+from models.db import Base, create_app_engine
+
+@pytest.fixture
+def memory_session():
+    """Sesja na świeżej bazie SQLite w pamięci - niezależna od skonfigurowanej bazy."""
+    from models.client import Client  # noqa: F401 - rejestracja modeli w Base.metadata
+    from models.order import Order  # noqa: F401
+    from models.orderitem import OrderItem  # noqa: F401
+    from models.order_sequence import OrderSequence  # noqa: F401
+    from models.notifications import ChangeLog  # noqa: F401
+    from models.production_summary import ProductionSummary  # noqa: F401
+    engine = create_app_engine({"url": "sqlite://"})
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    yield session
+    session.close()
+    engine.dispose()
@@ -0,0 +1,49 @@
+import datetime
+import re
+from types import SimpleNamespace
+import pytest
+from printing.batch_export import KIND_CONFIRMATION, KIND_PRODUCTION, export_batch
+
+SETTINGS = {"workers": 1, "parallel_min_orders": 4}
+
+@pytest.fixture(autouse=True)
+def pdf_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("ZAMOWIENIA_PDF_OUTPUT_CACHE_DIR", str(tmp_path / "cache"))
+
+def make_job(number):
+    order = SimpleNamespace(order_number=f"00056{number}/TER", order_date=datetime.date(2025, 6, 2),
+                            delivery_date=datetime.date(2025, 6, 10), notes="")
+    client = SimpleNamespace(name="Firma A", short_name="FA", client_number="000001", city="Tychy")
+    items = [SimpleNamespace(width="100", height="50", material="Termiczny", roll_length="1000", core="76",
+                             ordered_quantity="10", quantity_type="tyś.", zam_rolki="10", price="", price_type="")]
+    return order, client, items
+
+def page_count(path):
+    with open(path, "rb") as f:
+        return len(re.findall(rb"/Type /Page\b", f.read()))
+
+def test_merged_and_individual_files(tmp_path):
+    jobs = [make_job(i) for i in range(3)]
+    merged = export_batch(jobs, KIND_PRODUCTION, merged=True, output_dir=str(tmp_path / "a"),
+                          merged_filename="PRODUKCJA.pdf", settings=SETTINGS, open_viewer=False)
+    assert len(merged) == 1 and page_count(merged[0]) == 3
+
+    files = export_batch(jobs, KIND_CONFIRMATION, output_dir=str(tmp_path / "b"), settings=SETTINGS, open_viewer=False)
+    assert [p.rsplit("/", 1)[-1].split("\\")[-1] for p in files] == [f"00056{i}TER_Firma_A.pdf" for i in range(3)]
+    assert all(page_count(p) == 1 for p in files)
+    assert export_batch([], KIND_PRODUCTION, open_viewer=False) == []
+
+def test_progress_and_cancel(tmp_path):
+    jobs = [make_job(i) for i in range(4)]
+    reported = []
+    files = export_batch(jobs, KIND_PRODUCTION, output_dir=str(tmp_path), settings=SETTINGS, open_viewer=False,
+                         progress=lambda done, total: reported.append((done, total)),
+                         is_cancelled=lambda: len(reported) >= 2)
+    assert reported == [(1, 4), (2, 4)]
+    assert len(files) == 2
+
+    reported.clear()
+    merged = export_batch(jobs, KIND_PRODUCTION, merged=True, output_dir=str(tmp_path / "m"), settings=SETTINGS,
+                          open_viewer=False, progress=lambda done, total: reported.append((done, total)),
+                          is_cancelled=lambda: len(reported) >= 3)
+    assert merged == [] and not list((tmp_path / "m").iterdir())
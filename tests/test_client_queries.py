@@ -0,0 +1,34 @@
+from models.client import Client
+from models.client_queries import fetch_client_rows, search_client_rows
+
+def test_fetch_client_rows_keyset_pages(memory_session):
+    for i in range(5):
+        memory_session.add(Client(name=f"Firma {i}"))
+        memory_session.commit()  # numer klienta nadawany jest przy INSERT na podstawie ostatniego w bazie
+    first = fetch_client_rows(memory_session, limit=2)
+    second = fetch_client_rows(memory_session, after_number=first[-1]["client_number"], limit=2)
+    rest = fetch_client_rows(memory_session, after_number=second[-1]["client_number"], limit=2)
+    numbers = [r["client_number"] for r in first + second + rest]
+    assert numbers == ["000567", "000568", "000569", "000570", "000571"]
+
+def test_search_client_rows_ignores_diacritics_and_ranks(memory_session):
+    for name, short, city in [
+        ("Zakład Poligraficzny Łódź", "Poligraf", "Łódź"),
+        ("Drukarnia Północ", "Druk-Pol", "Gdańsk"),
+        ("Polska Etykieta", "PolEt", "Kraków"),
+    ]:
+        memory_session.add(Client(name=name, short_name=short, city=city, nip="1234567890" if short == "PolEt" else None))
+        memory_session.commit()
+    rows = search_client_rows(memory_session, "POL")
+    assert [r["short_name"] for r in rows] == ["PolEt", "Poligraf", "Druk-Pol"]
+    assert [r["short_name"] for r in search_client_rows(memory_session, "lodz zaklad")] == ["Poligraf"]
+    assert [r["short_name"] for r in search_client_rows(memory_session, "1234567890")] == ["PolEt"]
+    assert search_client_rows(memory_session, "   ") == []
+
+def test_search_text_updated_on_edit(memory_session):
+    client = Client(name="Stara nazwa")
+    memory_session.add(client)
+    memory_session.commit()
+    client.city = "Wrocław"
+    memory_session.commit()
+    assert "wroclaw" in client.search_text
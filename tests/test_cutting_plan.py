@@ -0,0 +1,63 @@
+import datetime
+import random
+import pytest
+from models.order import Order
+from models.orderitem import OrderItem
+from widgets.material_forecast import forecast_items_query, items_to_arrays
+from widgets.cutting_plan import cutting_demand, ffd_patterns, pattern_label, plan_cutting, plan_material
+
+SETTINGS = {"master_width_mm": 1000.0, "master_length_m": 1000.0, "trim_mm": 10.0,
+            "knife_gap_mm": 0.0, "lane_margin_mm": 2.0, "workers": 1}
+
+def lanes_cut(patterns):
+    cut = {}
+    for pattern in patterns:
+        for w in pattern.lanes:
+            cut[w] = cut.get(w, 0) + pattern.count
+    return cut
+
+def test_ffd_repeats_identical_rolls():
+    patterns = ffd_patterns({300: 7, 100: 4}, 990)
+    assert patterns[0].lanes == (300, 300, 300) and patterns[0].count == 2
+    assert lanes_cut(patterns) == {300: 7, 100: 4}
+    assert all(sum(p.lanes) <= 990 for p in patterns)
+
+def test_knife_gap_between_lanes():
+    assert ffd_patterns({100: 10}, 300, knife_gap=0.0)[0].lanes == (100,) * 3
+    assert ffd_patterns({100: 10}, 300, knife_gap=5.0)[0].lanes == (100,) * 2
+
+def test_plan_material_waste_and_oversize():
+    plan = plan_material("Termiczny", {495.0: 4, 2000.0: 1}, SETTINGS)
+    assert plan.oversize == {2000.0: 1}
+    assert plan.master_rolls == plan.lower_bound == 2
+    assert plan.patterns[0].waste_mm == 10
+    assert plan.waste_pct == pytest.approx(1.0)
+    assert pattern_label((495.0, 495.0, 58.0)) == "2 × 495 + 58"
+
+def test_random_demand_is_fully_covered_and_parallel_matches_serial():
+    rng = random.Random(3)
+    demand = {
+        material: {float(rng.randrange(20, 400)): rng.randrange(1, 50) for _ in range(60)}
+        for material in ("A", "B", "C")
+    }
+    serial = plan_cutting(demand, SETTINGS)
+    for plan in serial:
+        assert lanes_cut(plan.patterns) == plan.demand
+        assert plan.master_rolls >= plan.lower_bound
+    parallel = plan_cutting(demand, dict(SETTINGS, workers=2, parallel_min_widths=1))
+    assert parallel == serial
+
+def test_demand_from_open_items(memory_session):
+    order = Order(order_number="A", delivery_date=datetime.date(2025, 6, 2))
+    order.items.extend([
+        # 10 tys. etykiet po 50 + 3 mm = 530 m; dwie pozycje 100 mm -> 1060 m -> 2 pasy po 1000 m
+        OrderItem(material="Termiczny", width="100", height="50", ordered_quantity="10", quantity_type="tyś."),
+        OrderItem(material="Termiczny", width="100", height="50", ordered_quantity="10", quantity_type="tyś."),
+        OrderItem(material="Folia PP", width="58", height="40", ordered_quantity="1", quantity_type="tyś."),
+    ])
+    memory_session.add(order)
+    memory_session.commit()
+    items = items_to_arrays(memory_session.execute(forecast_items_query()).all())
+    assert cutting_demand(items, SETTINGS, {"label_gap_mm": 3.0}) == {
+        "Folia PP": {62.0: 1}, "Termiczny": {104.0: 2},
+    }
@@ -0,0 +1,52 @@
+import os
+import sys
+import pytest
+from sqlalchemy import text
+from sqlalchemy.pool import NullPool
+from models.db import load_db_settings, create_app_engine, DB_SETTINGS_DEFAULTS
+from utils import config
+
+def test_db_settings_file_and_env(tmp_path, monkeypatch):
+    cfg = tmp_path / "zamowienia.ini"
+    cfg.write_text(
+        "[database]\n"
+        "url = sqlite:///plik.db\n"
+        "pool_size = 12\n"
+        "pgbouncer = tak\n",
+        encoding="utf-8"
+    )
+    monkeypatch.delenv("ZAMOWIENIA_DATABASE_URL", raising=False)
+    monkeypatch.setenv("ZAMOWIENIA_DATABASE_POOL_SIZE", "3")
+    settings = load_db_settings(str(cfg))
+    assert settings["url"] == "sqlite:///plik.db"
+    assert settings["pool_size"] == 3          # zmienna środowiskowa wygrywa z plikiem
+    assert settings["pgbouncer"] is True
+    assert settings["pool_recycle"] == DB_SETTINGS_DEFAULTS["pool_recycle"]
+
+def test_config_next_to_exe_when_frozen(tmp_path, monkeypatch):
+    monkeypatch.setattr(sys, "frozen", True, raising=False)
+    monkeypatch.setattr(sys, "executable", str(tmp_path / "Zamowienia.exe"))
+    assert config._project_dir() == str(tmp_path)
+    monkeypatch.delattr(sys, "frozen")
+    assert config._project_dir() == os.path.dirname(os.path.dirname(os.path.abspath(config.__file__)))
+
+def test_pgbouncer_mode_uses_null_pool():
+    engine = create_app_engine({
+        "url": "postgresql+psycopg2://u:p@localhost/db",
+        "pgbouncer": True,
+    }) if _has_psycopg2() else None
+    if engine is None:
+        pytest.skip("brak psycopg2")
+    assert isinstance(engine.pool, NullPool)
+
+def test_sqlite_engine_executes():
+    engine = create_app_engine({"url": "sqlite://"})
+    with engine.connect() as conn:
+        assert conn.execute(text("select 1")).scalar() == 1
+
+def _has_psycopg2():
+    try:
+        import psycopg2  # noqa: F401
+    except ImportError:
+        return False
+    return True
@@ -0,0 +1,68 @@
+import contextlib
+import datetime
+import pytest
+from models.order import Order, set_status, STATUS_DONE
+from models.orderitem import OrderItem
+from widgets import delivery_planner
+from widgets.delivery_planner import DeliveryPlanner, add_workdays
+from utils.rolls import running_meters
+
+SETTINGS = {"daily_capacity_m": 1000.0, "lead_days": 1, "horizon_days": 30, "refresh_seconds": 60}
+
+def test_add_workdays_skips_weekends_and_holidays():
+    assert add_workdays(datetime.date(2025, 6, 6), 1) == datetime.date(2025, 6, 9)      # piątek -> poniedziałek
+    assert add_workdays(datetime.date(2025, 4, 18), 1) == datetime.date(2025, 4, 22)    # Poniedziałek Wielkanocny
+    assert add_workdays(datetime.date(2025, 6, 7), 0) == datetime.date(2025, 6, 9)
+
+def test_running_meters_rule():
+    assert running_meters(10, "tyś.", 1000, 50, {"label_gap_mm": 3.0}) == pytest.approx(530.0)
+    assert running_meters(2, "rolek", 500, 47, {"label_gap_mm": 3.0}) == pytest.approx(50.0)
+
+@pytest.fixture
+def planner_session(memory_session, monkeypatch):
+    monkeypatch.setattr(delivery_planner, "session_scope", lambda: contextlib.nullcontext(memory_session))
+    return memory_session
+
+def make_order(number, day, thousands):
+    order = Order(order_number=number, delivery_date=day)
+    order.items.append(OrderItem(material="Termiczny", width="100", height="47",
+                                 ordered_quantity=str(thousands), quantity_type="tyś."))
+    return order
+
+def test_suggestion_uses_daily_load_index(planner_session):
+    monday = datetime.date(2025, 6, 2)
+    tuesday, wednesday = monday + datetime.timedelta(days=1), monday + datetime.timedelta(days=2)
+    edited = make_order("A", tuesday, 16)          # 800 m
+    done = make_order("B", wednesday, 20)
+    set_status(done, STATUS_DONE)
+    planner_session.add_all([edited, make_order("C", wednesday, 10), done])
+    planner_session.commit()
+
+    planner = DeliveryPlanner(SETTINGS, forecast_settings={"label_gap_mm": 3.0})
+    planner.refresh(today=monday)
+    assert planner.load == {tuesday: pytest.approx(800.0), wednesday: pytest.approx(500.0)}
+    assert planner.suggest(100) == tuesday
+    assert planner.suggest(300) == wednesday
+    assert planner.suggest(600) == datetime.date(2025, 6, 5)
+    assert planner.suggest(5000) == datetime.date(2025, 6, 5)   # ponad wydajność - pierwszy wolny dzień
+    assert planner.utilization(tuesday, 400) == pytest.approx(1.2)
+
+    # edycja zamówienia A: jego dotychczasowe pozycje nie blokują wtorku
+    planner = DeliveryPlanner(SETTINGS, exclude_order_id=edited.id, forecast_settings={"label_gap_mm": 3.0})
+    planner.refresh(today=monday)
+    assert planner.suggest(900) == tuesday
+
+def test_day_loads_in_one_query(planner_session):
+    monday, tuesday = datetime.date(2025, 6, 2), datetime.date(2025, 6, 3)
+    order = make_order("A", monday, 10)
+    order.items[0].zam_rolki = 4
+    order.items.append(OrderItem(material="Folia PP", width="50", height="20",
+                                 ordered_quantity="3", quantity_type="rolek", roll_length="1000"))
+    planner_session.add(order)
+    planner_session.commit()
+    loads = delivery_planner.fetch_day_loads([monday, tuesday], {"label_gap_mm": 3.0})
+    assert loads[tuesday] == (0, 0, 0, 0)
+    assert loads[monday].labels == pytest.approx(13000)
+    assert loads[monday].rolls == pytest.approx(7)
+    assert loads[monday].label_m2 == pytest.approx(10000 * 0.1 * 0.047 + 3000 * 0.05 * 0.02)
+    assert loads[monday].running_m == pytest.approx(500 + 69)
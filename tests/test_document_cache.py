@@ -0,0 +1,60 @@
+import datetime
+import os
+from types import SimpleNamespace
+from printing import batch_export
+from printing.batch_export import KIND_CONFIRMATION, KIND_PRODUCTION, export_document
+from printing.document_cache import PDFCache, document_key, load_output_settings, production_output_dir
+
+def make_job(number):
+    order = SimpleNamespace(id=number, order_number=f"00056{number}/TER", order_date=datetime.date(2025, 6, 2),
+                            delivery_date=datetime.date(2025, 6, 10), notes="", status="Przyjęte")
+    client = SimpleNamespace(id=1, name="Firma A", short_name="FA", client_number="000001", city="Tychy")
+    items = [SimpleNamespace(id=number, width="100", height="50", material="Termiczny", roll_length="1000", core="76",
+                             ordered_quantity="10", quantity_type="tyś.", zam_rolki="10", price="", price_type="")]
+    return order, client, items
+
+def test_key_follows_printed_data():
+    order, client, items = make_job(1)
+    key = document_key(KIND_PRODUCTION, 1, order, client, items)
+    assert key == document_key(KIND_PRODUCTION, 1, *make_job(1))
+    order.status = "W produkcji"                                     # nie trafia na wydruk
+    assert document_key(KIND_PRODUCTION, 1, order, client, items) == key
+    assert document_key(KIND_CONFIRMATION, 1, order, client, items) != key
+    assert document_key(KIND_PRODUCTION, 2, order, client, items) != key
+    items[0].material = "Folia PP"
+    assert document_key(KIND_PRODUCTION, 1, order, client, items) != key
+
+def test_reprint_comes_from_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("ZAMOWIENIA_PDF_OUTPUT_CACHE_DIR", str(tmp_path / "cache"))
+    rendered = []
+    render = batch_export.render_order
+    monkeypatch.setattr(batch_export, "render_order", lambda *args: rendered.append(1) or render(*args))
+    job = make_job(1)
+    first = export_document(KIND_PRODUCTION, job, str(tmp_path / "a.pdf"))
+    second = export_document(KIND_PRODUCTION, job, str(tmp_path / "b.pdf"))
+    with open(first, "rb") as a, open(second, "rb") as b:
+        assert a.read() == b.read()
+    assert len(rendered) == 1
+    job[2][0].width = "120"
+    export_document(KIND_PRODUCTION, job, str(tmp_path / "c.pdf"))
+    assert len(rendered) == 2
+
+def test_lru_eviction(tmp_path):
+    source = tmp_path / "doc.pdf"
+    source.write_bytes(b"x" * 100)
+    cache = PDFCache(str(tmp_path / "cache"), max_bytes=250)
+    for i, key in enumerate("abc"):
+        cache.store(key, str(source))
+        os.utime(cache.path(key), (1000 + i, 1000 + i))
+    cache.evict()
+    assert not os.path.exists(cache.path("a"))
+    assert cache.fetch("b", str(tmp_path / "out.pdf"))                # odświeża czas użycia "b"
+    cache.store("d", str(source))
+    assert [os.path.exists(cache.path(key)) for key in "bcd"] == [True, False, True]
+    assert not cache.fetch("a", str(tmp_path / "out.pdf"))
+
+def test_output_dir_from_config(tmp_path):
+    ini = tmp_path / "zamowienia.ini"
+    ini.write_text(f"[pdf_output]\nproduction_dir = {tmp_path / 'prod'}\n", encoding="utf-8")
+    assert production_output_dir(load_output_settings(str(ini))) == str(tmp_path / "prod")
+    assert production_output_dir(load_output_settings(str(tmp_path / "brak.ini")))
@@ -0,0 +1,47 @@
+import re
+from fpdf import FPDF
+from printing import fonts
+
+TEXT = "Zażółć gęślą jaźń – 100 × 50 mm ⚠"
+
+def render(cached):
+    fonts.CACHE_FONTS = cached
+    try:
+        pdf = FPDF()
+        fonts.add_fonts(pdf)
+        pdf.add_page()
+        pdf.set_font("DejaVu", "B", 10)
+        width = pdf.get_string_width(TEXT)
+        pdf.cell(0, 10, TEXT)
+        return width, pdf, bytes(pdf.output())
+    finally:
+        fonts.CACHE_FONTS = True
+
+def test_cached_fonts_match_add_font(monkeypatch, tmp_path):
+    calls = []
+    trim = fonts.trimmed_font_data
+    monkeypatch.setattr(fonts, "_templates", {})
+    monkeypatch.setattr(fonts.tempfile, "gettempdir", lambda: str(tmp_path))
+    monkeypatch.setattr(fonts, "trimmed_font_data", lambda path: calls.append(path) or trim(path))
+
+    width, pdf, data = render(cached=True)
+    second_width, second, _ = render(cached=True)
+    plain_width, _, _ = render(cached=False)
+    assert width == second_width == plain_width
+    assert len(calls) == 2                                     # zwykły i pogrubiony - po jednym parsowaniu
+    assert pdf.fonts["dejavuB"].subset is not second.fonts["dejavuB"].subset
+    assert not pdf.fonts["dejavuB"].missing_glyphs
+    assert len(re.findall(rb"/FontFile2", data)) == 2
+
+    monkeypatch.setattr(fonts, "_templates", {})   # nowy proces - przycięte fonty z dysku
+    assert render(cached=True)[0] == width
+    assert len(calls) == 2
+
+def test_falls_back_to_add_font_when_internals_differ(monkeypatch):
+    def changed_internals(path):
+        raise TypeError("TTFFont.__init__() got an unexpected keyword argument")
+    monkeypatch.setattr(fonts, "_template", changed_internals)
+    width, pdf, data = render(cached=True)
+    assert width == render(cached=False)[0]
+    assert set(pdf.fonts) >= {"dejavu", "dejavuB"}
+    assert len(re.findall(rb"/FontFile2", data)) == 2
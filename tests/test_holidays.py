@@ -0,0 +1,41 @@
+import datetime
+import numpy as np
+from utils.holidays import (
+    add_workdays, easter_sunday, is_polish_holiday, is_workday, polish_holidays, workdays_between
+)
+
+def d(year, month, day):
+    return datetime.date(year, month, day)
+
+def test_easter_dates():
+    assert easter_sunday(2024) == d(2024, 3, 31)
+    assert easter_sunday(2025) == d(2025, 4, 20)
+    assert easter_sunday(2026) == d(2026, 4, 5)
+    assert easter_sunday(2038) == d(2038, 4, 25)
+
+def test_holidays_beyond_2025():
+    holidays = polish_holidays(2026)
+    assert len(holidays) == 14
+    assert {d(2026, 4, 6), d(2026, 5, 24), d(2026, 6, 4), d(2026, 12, 24)} <= set(holidays)
+    assert d(2010, 1, 6) not in polish_holidays(2010)
+    assert d(2024, 12, 24) not in polish_holidays(2024)
+    assert is_polish_holiday(datetime.datetime(2027, 3, 29, 12, 0))     # Poniedziałek Wielkanocny
+    assert not is_polish_holiday(d(2026, 6, 6))                          # sobota - nie święto
+    assert not is_workday(d(2026, 6, 6)) and not is_workday(d(2026, 6, 4)) and is_workday(d(2026, 6, 5))
+
+def test_workdays_between_matches_card_rules():
+    friday = d(2026, 4, 3)
+    assert workdays_between(friday, friday) == 0
+    assert workdays_between(friday, d(2026, 4, 7)) == 1      # weekend + Poniedziałek Wielkanocny
+    assert workdays_between(d(2026, 4, 7), friday) == -1
+    assert workdays_between(d(2025, 12, 23), d(2026, 1, 2)) == 4
+    assert workdays_between(d(2027, 8, 27), d(2027, 8, 15)) == -9
+
+def test_vectorized_batches():
+    start = d(2026, 4, 3)
+    ends = [d(2026, 4, 2), d(2026, 4, 3), d(2026, 4, 8), d(2027, 1, 4)]
+    counts = workdays_between(start, ends)
+    assert counts.tolist() == [workdays_between(start, end) for end in ends] == [-1, 0, 2, 189]
+    shifted = add_workdays(np.array([start, start], dtype="datetime64[D]"), [0, 1])
+    assert shifted.tolist() == [start, d(2026, 4, 7)]
+    assert add_workdays(d(2026, 4, 4), 0) == d(2026, 4, 7)
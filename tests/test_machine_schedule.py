@@ -0,0 +1,66 @@
+import contextlib
+import datetime
+import pytest
+from models.order import Order
+from models.orderitem import OrderItem
+from widgets import machine_schedule
+from widgets.machine_schedule import (
+    Job, MachineSchedule, jobs_by_day, load_machines, make_machine, schedule_day, schedule_items_query,
+    MACHINE_DEFAULTS
+)
+
+def machine(name, **settings):
+    return make_machine(name, dict(MACHINE_DEFAULTS, setup_minutes=0.0, **settings))
+
+def test_machines_from_config(tmp_path):
+    cfg = tmp_path / "zamowienia.ini"
+    cfg.write_text(
+        "[machine.Mark Andy]\n"
+        "meters_per_hour = 3000\n"
+        "materials = Termiczny, Folia PP\n"
+        "[machine.Nilpeter]\n"
+        "max_width_mm = 250\n",
+        encoding="utf-8"
+    )
+    machines = load_machines(str(cfg))
+    assert [m.name for m in machines] == ["Mark Andy", "Nilpeter"]
+    assert machines[0].meters_per_hour == 3000 and machines[0].materials == {"termiczny", "folia pp"}
+    assert machines[1].max_width_mm == 250 and not machines[1].materials
+    assert [m.name for m in load_machines(str(tmp_path / "brak.ini"))] == ["Maszyna"]
+
+def test_lpt_balances_load_and_respects_capabilities():
+    machines = [machine("A", meters_per_hour=1000.0), machine("B", meters_per_hour=1000.0, max_width_mm=100.0)]
+    jobs = [Job("Termiczny", 50.0, meters, ((i, str(i)),)) for i, meters in enumerate((3000, 3000, 2000, 2000, 2000))]
+    jobs.append(Job("Termiczny", 200.0, 1000.0, ((9, "9"),)))
+    plan = schedule_day(datetime.date(2025, 6, 2), jobs, machines)
+    assert plan.hours == {"A": pytest.approx(6.0), "B": pytest.approx(7.0)}
+    assert any(job.width == 200.0 for job in plan.queues["A"])
+    assert not plan.unassigned
+
+    only_pp = [machine("PP", materials="Folia PP")]
+    plan = schedule_day(None, [Job("Termiczny", 50.0, 100.0, ())], only_pp)
+    assert len(plan.unassigned) == 1 and plan.hours == {"PP": 0.0}
+
+def test_replan_orders_touches_only_source_and_target_day(memory_session, monkeypatch):
+    monday, tuesday, wednesday = (datetime.date(2025, 6, d) for d in (2, 3, 4))
+    orders = []
+    for number, day in (("A", monday), ("B", tuesday), ("C", wednesday)):
+        order = Order(order_number=number, delivery_date=day)
+        order.items.append(OrderItem(material="Termiczny", width="100", height="50",
+                                     ordered_quantity="10", quantity_type="tyś."))
+        orders.append(order)
+    memory_session.add_all(orders)
+    memory_session.commit()
+    jobs = jobs_by_day(memory_session.execute(schedule_items_query([monday])).all(), {"label_gap_mm": 3.0})
+    assert [(j.width, j.running_m, j.orders) for j in jobs[monday]] == [(100.0, pytest.approx(530.0), ((orders[0].id, "A"),))]
+
+    monkeypatch.setattr(machine_schedule, "session_scope", lambda: contextlib.nullcontext(memory_session))
+    schedule = MachineSchedule([machine("A")])
+    schedule.replan([monday, tuesday, wednesday])
+    orders[0].delivery_date = tuesday
+    memory_session.commit()
+    changed = schedule.replan_orders([orders[0].id])
+    assert set(changed) == {monday, tuesday}
+    assert schedule.plans[monday].hours["A"] == 0
+    assert len(schedule.plans[tuesday].queues["A"]) == 1   # ten sam materiał i szerokość - jeden blok
+    assert len(schedule.plans[tuesday].queues["A"][0].orders) == 2
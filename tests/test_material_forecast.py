@@ -0,0 +1,45 @@
+import datetime
+import pytest
+from models.order import Order, set_status, STATUS_DONE
+from models.orderitem import OrderItem
+from utils.rolls import roll_count
+from widgets.material_forecast import (
+    forecast_items_query, items_to_arrays, compute_forecast, material_totals, export_forecast_csv
+)
+
+def test_roll_count_matches_order_form_rule():
+    assert roll_count(10, "tyś.", 3000) == 4
+    assert roll_count(10, "tyś.", 0) == 0
+    assert roll_count(6, "rolek", 500) == 6
+
+def test_forecast_per_material_and_week(memory_session, tmp_path):
+    day = datetime.date(2025, 6, 2)
+    order = Order(order_number="A", delivery_date=day)
+    order.items.extend([
+        OrderItem(material="Termiczny", width="100", height="50", ordered_quantity="10", quantity_type="tyś.", roll_length="1000"),
+        OrderItem(material="Termiczny", width="100", height="50", ordered_quantity="2", quantity_type="rolek", roll_length="500"),
+    ])
+    done = Order(order_number="B", delivery_date=day)
+    done.items.append(OrderItem(material="Termiczny", width="100", height="50", ordered_quantity="99", quantity_type="tyś."))
+    set_status(done, STATUS_DONE)
+    memory_session.add_all([order, done])
+    memory_session.commit()
+
+    items = items_to_arrays(memory_session.execute(forecast_items_query()).all())
+    rows = compute_forecast(items, {"label_gap_mm": 3.0, "edge_margin_mm": 2.0})
+    assert len(rows) == 1
+    row = rows[0]
+    assert (row.year, row.week, row.material) == (2025, 23, "Termiczny")
+    assert row.labels == 11000 and row.rolls == 12
+    assert row.running_m == pytest.approx(11000 * 0.053)
+    assert row.label_m2 == pytest.approx(11000 * 0.1 * 0.05)
+    assert row.material_m2 == pytest.approx(11000 * 0.053 * 0.104)
+    assert list(material_totals(rows)) == ["Termiczny"]
+
+    path = tmp_path / "prognoza.csv"
+    export_forecast_csv(rows, str(path))
+    lines = path.read_text(encoding="utf-8-sig").splitlines()
+    assert lines[1].startswith("2025 / 23;Termiczny;11;12;583") and lines[2].startswith("Razem;")
+
+def test_empty_forecast():
+    assert compute_forecast(items_to_arrays([])) == []
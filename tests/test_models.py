@@ -9,7 +9,7 @@ from models.order_sequence import get_next_order_number, set_last_order_number
 @pytest.fixture(scope="module")
 def db_session():
     # Uwaga: To tworzy tabele, nie czyści istniejących danych!
-    create_db()
+    create_db(import_done_orders=False)
     session = Session()
     yield session
     session.close()
@@ -62,7 +62,6 @@ def test_create_order_and_item(db_session):
         quantity_type="sztuk",
         roll_length="100 m",
         core="76 mm",
-        packaging="karton"
     )
     db_session.add(item)
     db_session.commit()
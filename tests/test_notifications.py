@@ -0,0 +1,61 @@
+from models.client import Client
+from models.order import Order
+from models.orderitem import OrderItem
+from models.notifications import (
+    install_change_tracking, fetch_changes, record_change, last_change_id, ChangeLog,
+    encode_payload, decode_payload, ENTITY_ORDER, ENTITY_CLIENT
+)
+
+def _changes(session, after_id=0):
+    return fetch_changes(session.connection(), after_id)
+
+def test_commit_logs_changed_orders_and_clients(memory_session):
+    install_change_tracking(memory_session)
+    client = Client(name="Zmiana")
+    order = Order(order_number="000001/TER", client=client)
+    order.items.append(OrderItem(width="50"))
+    memory_session.add(order)
+    memory_session.commit()
+    last_id, changes = _changes(memory_session)
+    assert changes == {ENTITY_ORDER: {order.id}, ENTITY_CLIENT: {client.id}}
+
+    order.items[0].width = "100"    # zmiana pozycji = zmiana zamówienia
+    memory_session.commit()
+    last_id, changes = _changes(memory_session, last_id)
+    assert changes == {ENTITY_ORDER: {order.id}}
+
+    memory_session.query(Order).filter_by(id=order.id).delete()
+    record_change(memory_session, ENTITY_ORDER, [order.id])
+    memory_session.commit()
+    seen = set()   # odczytane wpisy - ich NOTIFY nasłuch pomija
+    new_id, changes = fetch_changes(memory_session.connection(), last_id, seen)
+    assert changes == {ENTITY_ORDER: {order.id}} and seen == {new_id}
+
+def test_overlap_reads_late_commit_with_lower_id(memory_session):
+    connection = memory_session.connection()
+    memory_session.add(ChangeLog(id=5, entity=ENTITY_ORDER, ids="5"))
+    memory_session.flush()
+    seen = set()
+    last_id, changes = fetch_changes(connection, 0, seen, overlap=10)
+    assert (last_id, changes) == (5, {ENTITY_ORDER: {5}})
+    # id 3 nadane wcześniej, ale zatwierdzone po odczycie id 5
+    memory_session.add(ChangeLog(id=3, entity=ENTITY_ORDER, ids="3"))
+    memory_session.flush()
+    assert fetch_changes(connection, last_id) == (5, {})
+    assert fetch_changes(connection, last_id, seen, overlap=10) == (5, {ENTITY_ORDER: {3}})
+    assert fetch_changes(connection, last_id, seen, overlap=10) == (5, {})
+    memory_session.add(ChangeLog(id=20, entity=ENTITY_CLIENT, ids="1"))
+    memory_session.flush()
+    assert fetch_changes(connection, last_id, seen, overlap=10) == (20, {ENTITY_CLIENT: {1}})
+    assert seen == {20}   # id spoza okna usunięte
+
+def test_rollback_discards_pending_changes(memory_session):
+    install_change_tracking(memory_session)
+    memory_session.add(Client(name="Wycofany"))
+    memory_session.flush()
+    memory_session.rollback()
+    memory_session.commit()
+    assert last_change_id(memory_session.connection()) == 0
+
+def test_payload_roundtrip():
+    assert decode_payload(encode_payload(ENTITY_CLIENT, {3, 1}, 7)) == (ENTITY_CLIENT, {1, 3}, 7)
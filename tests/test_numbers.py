@@ -0,0 +1,59 @@
+from decimal import Decimal
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from utils.numbers import split_number, parse_number, parse_quantity, parse_int, format_number
+from models.migrations import convert_order_item_numbers
+
+def test_parse_number():
+    assert parse_number("10 000") == Decimal("10000")
+    assert parse_number("12,34") == Decimal("12.34")
+    assert parse_number("1.234,5") == Decimal("1234.5")
+    assert parse_number("  ") is None
+    assert parse_int("3") == 3
+    with pytest.raises(ValueError):
+        parse_number("100 m")
+    with pytest.raises(ValueError):
+        parse_int("2,5")
+    assert split_number("100 m") == (Decimal("100"), "m")
+    assert parse_quantity("100 m") == Decimal("100")
+    assert parse_quantity("10 000 tyś.") == Decimal("10000")
+    with pytest.raises(ValueError):
+        parse_quantity("12 do ustalenia")
+    assert split_number("brak") == (None, "brak")
+
+def test_format_number():
+    assert format_number(Decimal("12.3400")) == "12,34"
+    assert format_number(Decimal("50.00")) == "50"
+    assert format_number(10000, grouping=True) == "10 000"
+    assert format_number(None) == ""
+
+def test_convert_legacy_text_columns(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE orders (id INTEGER PRIMARY KEY, order_number VARCHAR)")
+        conn.exec_driver_sql(
+            "CREATE TABLE order_items (id INTEGER PRIMARY KEY, order_id INTEGER, width VARCHAR, "
+            "height VARCHAR, material VARCHAR, ordered_quantity VARCHAR, quantity_type VARCHAR, "
+            "roll_length VARCHAR, core VARCHAR, price VARCHAR, price_type VARCHAR, zam_rolki VARCHAR)"
+        )
+        conn.exec_driver_sql("INSERT INTO orders VALUES (1, '000001/TER')")
+        conn.exec_driver_sql(
+            "INSERT INTO order_items (id, order_id, width, height, ordered_quantity, roll_length, price, zam_rolki) "
+            "VALUES (1, 1, '50', '30,5', '10 000', '100 m', 'do ustalenia', '4'), "
+            "(2, 1, '', NULL, '2,5', '1000', '12,34', '')"
+        )
+    report_path = tmp_path / "raport.csv"
+    report = convert_order_item_numbers(engine, str(report_path))
+    assert [(row[0], row[2]) for row in report] == [(1, "roll_length"), (1, "price")]
+    assert report_path.exists()
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT width, height, ordered_quantity, roll_length, price, zam_rolki "
+                                 "FROM order_items ORDER BY id")).all()
+    assert [tuple(float(v) if v is not None else None for v in row) for row in rows] == [
+        (50.0, 30.5, 10000.0, 100.0, None, 4.0),
+        (None, None, 2.5, 1000.0, 12.34, None),
+    ]
+    types = {col["name"]: col["type"] for col in inspect(engine).get_columns("order_items")}
+    assert "NUMERIC" in str(types["width"]) and "INTEGER" in str(types["zam_rolki"])
+    # drugie uruchomienie niczego nie zmienia
+    assert convert_order_item_numbers(engine, str(report_path)) == []
@@ -0,0 +1,70 @@
+import datetime
+from decimal import Decimal
+from sqlalchemy import event
+from models.client import Client
+from models.order import Order, set_status, STATUS_DONE
+from models.orderitem import OrderItem
+import pickle
+from models.order_queries import fetch_order_rows, fetch_orders_in_window, fetch_print_snapshots
+
+def _seed(session):
+    client = Client(name="Firma A", phone="111", city="Tychy")
+    session.add(client)
+    session.flush()
+    for nr in ("000569/TER", "000567/TER", "000568/TER"):
+        order = Order(order_number=nr, delivery_date=datetime.date(2025, 6, 10), client_id=client.id)
+        session.add(order)
+        session.flush()
+        for width in ("50", "100"):
+            session.add(OrderItem(order_id=order.id, width=width, height="30", material="Termiczny"))
+    session.commit()
+
+def test_fetch_order_rows_sorted_with_items_in_few_queries(memory_session):
+    _seed(memory_session)
+    memory_session.expunge_all()
+    statements = []
+    engine = memory_session.get_bind()
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        rows = fetch_order_rows(memory_session)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert [r["order_number"] for r in rows] == ["000567/TER", "000568/TER", "000569/TER"]
+    assert all(r["client_name"] == "Firma A" for r in rows)
+    assert [i["width"] for i in rows[0]["items"]] == [Decimal("50"), Decimal("100")]
+    assert len(statements) <= 3
+
+def test_fetch_order_rows_page(memory_session):
+    _seed(memory_session)
+    rows = fetch_order_rows(memory_session, offset=1, limit=1)
+    assert [r["order_number"] for r in rows] == ["000568/TER"]
+
+def test_fetch_orders_in_window_filters_dates_and_status(memory_session):
+    client = Client(name="Okno")
+    memory_session.add(client)
+    days = [datetime.date(2025, 1, 31), datetime.date(2025, 2, 3), datetime.date(2025, 2, 14), datetime.date(2025, 3, 1)]
+    for i, day in enumerate(days):
+        memory_session.add(Order(order_number=f"W{i}", delivery_date=day, client=client))
+    memory_session.commit()
+    set_status(memory_session.query(Order).filter_by(order_number="W2").one(), STATUS_DONE)
+    memory_session.commit()
+    start, end = datetime.date(2025, 2, 1), datetime.date(2025, 2, 28)
+    assert [o.order_number for o in fetch_orders_in_window(memory_session, start, end)] == ["W1"]
+    done = fetch_orders_in_window(memory_session, start, end, show_done=True)
+    assert [o.order_number for o in done] == ["W2"]
+
+def test_print_snapshots_are_detached_and_picklable(memory_session):
+    _seed(memory_session)
+    done = memory_session.query(Order).filter_by(order_number="000569/TER").one()
+    set_status(done, STATUS_DONE)
+    memory_session.commit()
+    memory_session.expunge_all()
+
+    jobs = fetch_print_snapshots(memory_session, date_from=datetime.date(2025, 6, 1), date_to=datetime.date(2025, 6, 30))
+    assert [order.order_number for order, _, _ in jobs] == ["000567/TER", "000568/TER"]
+    order, client, items = pickle.loads(pickle.dumps(jobs))[0]
+    assert client.name == "Firma A" and [item.width for item in items] == [Decimal("50"), Decimal("100")]
+
+    selected = fetch_print_snapshots(memory_session, order_ids=[done.id])
+    assert [order.order_number for order, _, _ in selected] == ["000569/TER"]
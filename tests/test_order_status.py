@@ -0,0 +1,35 @@
+import json
+import pytest
+from models.order import (
+    Order, set_status, restored_status,
+    STATUS_NEW, STATUS_IN_PRODUCTION, STATUS_DONE, STATUS_SHIPPED
+)
+from models.migrations import import_done_orders_file
+
+def test_status_lifecycle_timestamps(memory_session):
+    order = Order(order_number="000001/TER")
+    memory_session.add(order)
+    memory_session.commit()
+    assert order.status == STATUS_NEW
+    set_status(order, STATUS_IN_PRODUCTION)
+    set_status(order, STATUS_DONE)
+    set_status(order, STATUS_SHIPPED)
+    assert order.in_production_at and order.done_at and order.shipped_at
+    set_status(order, restored_status(order))
+    assert order.status == STATUS_IN_PRODUCTION
+    assert order.done_at is None and order.shipped_at is None
+    with pytest.raises(ValueError):
+        set_status(order, "archiwum")
+
+def test_import_done_orders_file(memory_session, tmp_path):
+    orders = [Order(order_number=f"00000{i}/TER") for i in range(3)]
+    memory_session.add_all(orders)
+    memory_session.commit()
+    path = tmp_path / "done_orders_store.json"
+    path.write_text(json.dumps([orders[0].id, orders[2].id, 999]), encoding="utf-8")
+    engine = memory_session.get_bind()
+    assert import_done_orders_file(engine, str(path)) == 2
+    assert not path.exists() and (tmp_path / "done_orders_store.json.imported").exists()
+    memory_session.expire_all()
+    assert [o.status for o in orders] == [STATUS_DONE, STATUS_NEW, STATUS_DONE]
+    assert import_done_orders_file(engine, str(path)) == 0
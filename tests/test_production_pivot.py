@@ -0,0 +1,49 @@
+import datetime
+from models.client import Client
+from models.order import Order
+from models.orderitem import OrderItem
+from models.production_summary import production_facts_query
+from widgets.production_pivot import ProductionFacts, PivotRow, drill_dimensions
+
+def _seed(session):
+    client_a, client_b = Client(name="Alfa"), Client(name="Beta", short_name="B")
+    for client in (client_a, client_b):
+        session.add(client)
+        session.flush()
+    for number, day, client, items in (
+        ("A", datetime.date(2025, 6, 2), client_a, [("Termiczny", "40", "10"), ("Folia PP", "76", "4")]),
+        ("B", datetime.date(2025, 6, 3), client_b, [("Termiczny", "40", "5")]),
+        ("C", datetime.date(2025, 6, 10), client_b, [("Termiczny", "76", "1")]),
+    ):
+        order = Order(order_number=number, delivery_date=day, client_id=client.id)
+        order.items.extend(
+            OrderItem(material=material, core=core, width="50", height="30",
+                      ordered_quantity=quantity, quantity_type="tyś.")
+            for material, core, quantity in items
+        )
+        session.add(order)
+    session.commit()
+    return ProductionFacts.from_rows(session.execute(production_facts_query()).all())
+
+def test_rollup_with_subtotals(memory_session):
+    facts = _seed(memory_session)
+    assert facts.rollup(("week", "material")) == [
+        PivotRow(2, ((2025, 23), "Folia PP"), 4.0),
+        PivotRow(2, ((2025, 23), "Termiczny"), 15.0),
+        PivotRow(1, ((2025, 23),), 19.0),
+        PivotRow(2, ((2025, 24), "Termiczny"), 1.0),
+        PivotRow(1, ((2025, 24),), 1.0),
+        PivotRow(0, (), 20.0),
+    ]
+    assert [r for r in facts.rollup(("client", "week")) if r.level == 1] == [
+        PivotRow(1, ("Alfa",), 14.0), PivotRow(1, ("B",), 6.0),
+    ]
+
+def test_drill_down_filters_in_memory(memory_session):
+    facts = _seed(memory_session)
+    termiczny = facts.filtered(material="Termiczny")
+    assert drill_dimensions({"material": "Termiczny"}) == ("week", "client")
+    assert [(r.key, r.quantity) for r in termiczny.rollup(("core",))] == [
+        (("40",), 15.0), (("76",), 1.0), ((), 16.0),
+    ]
+    assert facts.filtered(material="Papier").rollup(("week",)) == [PivotRow(0, (), 0.0)]
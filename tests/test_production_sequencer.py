@@ -0,0 +1,70 @@
+import datetime
+import random
+from decimal import Decimal
+import pytest
+from models.client import Client
+from models.order import Order
+from models.orderitem import OrderItem
+from widgets.production_sequencer import (
+    SequenceItem, build_run_list, changeover_matrix, parse_material_pairs, path_cost,
+    sequence_items_query, two_opt, week_range
+)
+
+SETTINGS = {"material_change": 30.0, "width_change": 10.0, "width_per_mm": 0.0, "core_change": 5.0}
+
+def item(number, material, width, core="76", height=50):
+    return SequenceItem(None, number, "Klient", None, material, width, height, core, 10, "tyś.")
+
+def test_changeover_matrix_costs_and_material_pairs():
+    setups = [("Termiczny", 100, "76"), ("Termiczny TOP", 100, "76"), ("Folia PP", 60, "40")]
+    cost = changeover_matrix(setups, dict(SETTINGS, material_pairs="Termiczny|Termiczny TOP=8; zły wpis"))
+    assert cost[0, 0] == 0
+    assert cost[0, 1] == cost[1, 0] == 8
+    assert cost[0, 2] == 30 + 10 + 5
+    assert parse_material_pairs("A|B=1,5") == {("A", "B"): 1.5}
+
+def test_identical_setups_run_together_and_beat_order_sequence():
+    items = [
+        item("1", "Termiczny", 100), item("2", "Folia PP", 100), item("3", "Termiczny", 100),
+        item("4", "Folia PP", 100), item("5", "Termiczny", 58),
+    ]
+    run_list = build_run_list(items, SETTINGS)
+    assert sum(len(step.items) for step in run_list.steps) == len(items)
+    assert len(run_list.steps) == 3
+    assert [i.order_number for s in run_list.steps if s.setup == ("Termiczny", 100, "76") for i in s.items] == ["1", "3"]
+    # Termiczny 58 -> Termiczny 100 -> Folia PP 100 (albo odwrotnie): 10 + 30
+    assert run_list.total_cost == 40
+    assert run_list.baseline_cost == 4 * 30 + 10
+    assert run_list.steps[0].changeover == 0
+
+def test_two_opt_never_worsens_and_fixes_crossing():
+    cost = changeover_matrix([("M", w, "76") for w in (10, 20, 30, 40)], dict(SETTINGS, width_per_mm=1.0))
+    assert two_opt(cost, [0, 2, 1, 3]) in ([0, 1, 2, 3], [3, 2, 1, 0])
+    rng = random.Random(7)
+    setups = [(rng.choice("ABCD"), rng.choice((50, 60, 80, 100)), rng.choice(("40", "76"))) for _ in range(200)]
+    cost = changeover_matrix(list(dict.fromkeys(setups)), SETTINGS)
+    start = list(range(len(cost)))
+    assert path_cost(cost, two_opt(cost, start)) <= path_cost(cost, start)
+    assert sorted(two_opt(cost, start)) == start
+
+def test_sequence_items_query_for_week(memory_session):
+    monday, sunday = week_range(datetime.date(2025, 6, 4))
+    assert (monday, sunday) == (datetime.date(2025, 6, 2), datetime.date(2025, 6, 8))
+    client = Client(name="Firma", short_name="FIR")
+    memory_session.add(client)
+    memory_session.flush()
+    inside = Order(order_number="A", delivery_date=datetime.date(2025, 6, 6), client_id=client.id)
+    inside.items.append(OrderItem(material="Termiczny", width="100", height="50", ordered_quantity="10"))
+    outside = Order(order_number="B", delivery_date=datetime.date(2025, 6, 9))
+    outside.items.append(OrderItem(material="Termiczny", width="100", height="50", ordered_quantity="10"))
+    memory_session.add_all([inside, outside])
+    memory_session.commit()
+
+    rows = [SequenceItem(*row) for row in memory_session.execute(sequence_items_query(monday, sunday))]
+    assert [(r.order_number, r.client, r.width) for r in rows] == [("A", "FIR", Decimal("100.00"))]
+    assert build_run_list(rows, SETTINGS).steps[0].setup == ("Termiczny", Decimal("100.00"), "")
+
+@pytest.mark.parametrize("count", [0, 1])
+def test_small_inputs(count):
+    run_list = build_run_list([item("1", "Termiczny", 100)][:count], SETTINGS)
+    assert len(run_list.steps) == count and run_list.total_cost == 0
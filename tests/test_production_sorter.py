@@ -0,0 +1,36 @@
+import datetime
+from decimal import Decimal
+from models.order import Order
+from models.orderitem import OrderItem
+from models.production_summary import rebuild
+from widgets.production_sorter import weekly_production_rows
+
+def _order(session, number, day, *items):
+    order = Order(order_number=number, delivery_date=day)
+    order.items.extend(OrderItem(**item) for item in items)
+    session.add(order)
+
+def test_weekly_summary_groups_by_iso_year_and_week(memory_session):
+    label = dict(material="Termiczny", width="50", height="30")
+    # 2024-12-30 to tydzień 1 roku ISO 2025, 2025-06-02 i 2026-06-01 to oba tydzień 23
+    _order(memory_session, "A", datetime.date(2024, 12, 30),
+           dict(label, ordered_quantity="10", quantity_type="tyś."))
+    _order(memory_session, "B", datetime.date(2025, 6, 2),
+           dict(label, ordered_quantity="2,5", quantity_type="tyś."),
+           dict(label, ordered_quantity="4", quantity_type="rolek", roll_length="500"),
+           dict(label, width="", ordered_quantity="99", quantity_type="tyś."))
+    _order(memory_session, "C", datetime.date(2026, 6, 1),
+           dict(label, ordered_quantity="1 000", quantity_type="tyś."),
+           dict(label, material="Folia PP", width="100", ordered_quantity="0,5", quantity_type="tyś."))
+    rebuild(memory_session)
+    memory_session.commit()
+    rows = list(weekly_production_rows(memory_session, batch_size=2))
+    assert rows == [
+        ((2025, 1, "Termiczny", Decimal("50"), Decimal("30")), 10.0),
+        ((2025, 23, "Termiczny", Decimal("50"), Decimal("30")), 4.5),
+        ((2026, 23, "Folia PP", Decimal("100"), Decimal("30")), 0.5),
+        ((2026, 23, "Termiczny", Decimal("50"), Decimal("30")), 1000.0),
+    ]
+    # zakres dat obejmuje pełne tygodnie ISO (2025-01-01 należy do tygodnia 1)
+    ranged = list(weekly_production_rows(memory_session, datetime.date(2025, 1, 6), datetime.date(2025, 12, 31)))
+    assert [key[:2] for key, _ in ranged] == [(2025, 23)]
@@ -0,0 +1,83 @@
+import datetime
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.exc import IntegrityError
+from models.db import Base
+from models.migrations import ensure_production_summary
+from models.order import Order
+from models.orderitem import OrderItem
+from models.production_summary import (
+    KEY_INDEX, OLD_KEY_INDEX_NAME, ProductionSummary, apply_deltas, check, rebuild, track_summary
+)
+
+LABEL = dict(material="Termiczny", width="50", height="30", quantity_type="tyś.")
+
+def _summary(session):
+    return {(r.year, r.week, r.material, float(r.width), float(r.quantity))
+            for r in session.query(ProductionSummary)}
+
+def test_deltas_match_full_rebuild(memory_session):
+    session = memory_session
+    with track_summary(session) as summary:
+        order = Order(order_number="000001/TER", delivery_date=datetime.date(2025, 6, 2))
+        session.add(order)
+        session.flush()
+        summary.watch(order.id)
+        session.add_all([OrderItem(order_id=order.id, ordered_quantity="10", **LABEL),
+                         OrderItem(order_id=order.id, ordered_quantity="4", **dict(LABEL, width="100"))])
+    other = Order(order_number="000002/TER", delivery_date=datetime.date(2025, 6, 3))
+    with track_summary(session) as summary:
+        session.add(other)
+        session.flush()
+        summary.watch(other.id)
+        other.items.append(OrderItem(ordered_quantity="5", **LABEL))
+    assert _summary(session) == {(2025, 23, "Termiczny", 50.0, 15.0), (2025, 23, "Termiczny", 100.0, 4.0)}
+
+    # przeniesienie na inny tydzień
+    with track_summary(session, order.id):
+        order.delivery_date = datetime.date(2025, 6, 10)
+    assert _summary(session) == {(2025, 23, "Termiczny", 50.0, 5.0),
+                                 (2025, 24, "Termiczny", 50.0, 10.0), (2025, 24, "Termiczny", 100.0, 4.0)}
+    assert check(session) == []
+
+    # usunięcie zamówienia - puste wiersze znikają
+    with track_summary(session, order.id):
+        session.query(OrderItem).filter_by(order_id=order.id).delete()
+        session.query(Order).filter_by(id=order.id).delete()
+    assert _summary(session) == {(2025, 23, "Termiczny", 50.0, 5.0)}
+    assert check(session) == []
+
+def test_check_reports_drift_and_rebuild_fixes_it(memory_session):
+    order = Order(order_number="000001/TER", delivery_date=datetime.date(2025, 6, 2))
+    order.items.append(OrderItem(ordered_quantity="2", **LABEL))
+    memory_session.add(order)
+    memory_session.flush()
+    mismatches = check(memory_session)
+    assert len(mismatches) == 1 and mismatches[0][1] is None
+    assert rebuild(memory_session) == 1
+    assert check(memory_session) == []
+
+def test_key_is_unique_also_for_empty_material(memory_session):
+    key = (2025, 23, None, 50, None)
+    apply_deltas(memory_session, {key: 2})
+    apply_deltas(memory_session, {key: 3})
+    rows = memory_session.query(ProductionSummary).all()
+    assert [(r.material, float(r.quantity)) for r in rows] == [(None, 5.0)]
+    with pytest.raises(IntegrityError):   # drugie stanowisko wstawiające ten sam klucz
+        memory_session.execute(insert(ProductionSummary.__table__).values(
+            year=2025, week=23, material=None, width=50, height=None, quantity=1))
+    memory_session.rollback()
+
+def test_upgrade_removes_duplicated_keys():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    table = ProductionSummary.__table__
+    with engine.begin() as conn:   # baza sprzed unikalnego klucza, z podwójnym wierszem
+        KEY_INDEX.drop(bind=conn)
+        conn.exec_driver_sql(f"CREATE INDEX {OLD_KEY_INDEX_NAME} ON production_summary (year, week)")
+        conn.execute(insert(table), [dict(year=2025, week=23, material="Termiczny", width=50, height=30, quantity=2)] * 2)
+    ensure_production_summary(engine)
+    with engine.connect() as conn:
+        assert conn.execute(table.select()).all() == []   # przeliczone od zera (brak zamówień)
+    ensure_production_summary(engine)   # drugi start - bez zmian
+    engine.dispose()
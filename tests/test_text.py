@@ -0,0 +1,6 @@
+from utils.text import normalize_search_text
+
+def test_normalize_search_text():
+    assert normalize_search_text("  Zakład  ŁÓDŹ ") == "zaklad lodz"
+    assert normalize_search_text("Źdźbło, Gęś") == "zdzblo, ges"
+    assert normalize_search_text(None) == ""
@@ -0,0 +1,49 @@
+import pytest
+from fpdf import FPDF
+from printing.fonts import add_fonts
+from printing.text_layout import TextLayout
+
+TEXTS = ["", "50", "Termiczny", "Folia PP biała matowa", "Zażółć gęślą jaźń – 100 × 50 mm"]
+
+def new_layout():
+    pdf = FPDF()
+    add_fonts(pdf)
+    pdf.add_page()
+    return pdf, TextLayout(pdf)
+
+def stepped_size(pdf, text, width, max_size=7, min_size=5):
+    """Dawne fit_font_size - schodzenie co 0.2 pt z set_font i get_string_width."""
+    size = max_size
+    while size >= min_size:
+        pdf.set_font("DejaVu", "", size)
+        if pdf.get_string_width(text) <= width:
+            return size
+        size -= 0.2
+    return min_size
+
+@pytest.mark.parametrize("style", ["", "B"])
+def test_width_matches_get_string_width(style):
+    pdf, layout = new_layout()
+    for size in (5, 6.4, 7, 12):
+        pdf.set_font("DejaVu", style, size)
+        for text in TEXTS:
+            assert layout.width(text, "DejaVu", style, size) == pytest.approx(pdf.get_string_width(text))
+            assert layout.current_width(text) == pytest.approx(pdf.get_string_width(text))
+
+def test_fit_size_matches_stepping():
+    pdf, layout = new_layout()
+    for text in TEXTS[1:]:
+        for width in range(2, 60):
+            expected = stepped_size(pdf, text, width)
+            assert layout.fit_size(text, width, "DejaVu") == pytest.approx(expected)
+
+def test_wrap_breaks_on_words():
+    pdf, layout = new_layout()
+    pdf.set_font("DejaVu", "", 7)
+    text = "Folia polipropylenowa biała matowa z klejem permanentnym"
+    lines = layout.wrap(text, 30, "DejaVu", "", 7)
+    assert " ".join(lines) == text
+    assert len(lines) > 1
+    assert all(pdf.get_string_width(line) <= 30 for line in lines)
+    assert layout.wrap("Superdługiesłowo", 5, "DejaVu", "", 7) == ["", "Superdługiesłowo"]
+    assert layout.wrap("", 30, "DejaVu", "", 7) == []
@@ -1,39 +1,141 @@
 # utils/holidays.py
-# Lista dni ustawowo wolnych od pracy w Polsce na 2025 + funkcja sprawdzająca
+# Kalendarz dni roboczych: polskie dni ustawowo wolne od pracy dla dowolnego roku
+# (święta stałe + ruchome liczone od Wielkanocy) i arytmetyka dni roboczych.
+#
+# Święta roku liczone są raz i trzymane w pamięci podręcznej. Dla pojedynczych dat
+# dni robocze liczone są wprost (pełne tygodnie + reszta - święta), dla tablic dat
+# przez numpy.busday_count / busday_offset (kolorowanie fiszek, raporty czasu realizacji).
 
 import datetime
+from functools import lru_cache
+import numpy as np
 
-HOLIDAYS_2025 = [
-    # Nowy Rok
-    datetime.date(2025, 1, 1),
-    # Trzech Króli
-    datetime.date(2025, 1, 6),
-    # Wielkanoc
-    datetime.date(2025, 4, 20),
-    # Poniedziałek Wielkanocny
-    datetime.date(2025, 4, 21),
-    # Święto Pracy
-    datetime.date(2025, 5, 1),
-    # Święto Konstytucji 3 Maja
-    datetime.date(2025, 5, 3),
-    # Zesłanie Ducha Świętego (Zielone Świątki)
-    datetime.date(2025, 6, 8),
-    # Boże Ciało
-    datetime.date(2025, 6, 19),
-    # Wniebowzięcie NMP
-    datetime.date(2025, 8, 15),
-    # Wszystkich Świętych
-    datetime.date(2025, 11, 1),
-    # Narodowe Święto Niepodległości
-    datetime.date(2025, 11, 11),
-    # Boże Narodzenie
-    datetime.date(2025, 12, 25),
-    # Drugi dzień Świąt Bożego Narodzenia
-    datetime.date(2025, 12, 26),
-    # Wigilia (od 2025 r. ustawowo wolna)
-    datetime.date(2025, 12, 24),
+# (miesiąc, dzień, nazwa, od którego roku obowiązuje)
+FIXED_HOLIDAYS = [
+    (1, 1, "Nowy Rok", None),
+    (1, 6, "Trzech Króli", 2011),
+    (5, 1, "Święto Pracy", None),
+    (5, 3, "Święto Konstytucji 3 Maja", None),
+    (8, 15, "Wniebowzięcie NMP", None),
+    (11, 1, "Wszystkich Świętych", None),
+    (11, 11, "Narodowe Święto Niepodległości", None),
+    (12, 24, "Wigilia", 2025),
+    (12, 25, "Boże Narodzenie", None),
+    (12, 26, "Drugi dzień Świąt Bożego Narodzenia", None),
 ]
 
+# (dni od Niedzieli Wielkanocnej, nazwa)
+EASTER_HOLIDAYS = [
+    (0, "Wielkanoc"),
+    (1, "Poniedziałek Wielkanocny"),
+    (49, "Zesłanie Ducha Świętego (Zielone Świątki)"),
+    (60, "Boże Ciało"),
+]
+
+WEEKMASK = "1111100"   # pon.-pt.
+
+def easter_sunday(year):
+    """Niedziela Wielkanocna (kalendarz gregoriański, algorytm Meeusa/Jonesa/Butchera)."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return datetime.date(year, month, day + 1)
+
+@lru_cache(maxsize=None)
+def polish_holidays(year):
+    """{data: nazwa} dni ustawowo wolnych w danym roku."""
+    holidays = {
+        datetime.date(year, month, day): name
+        for month, day, name, since in FIXED_HOLIDAYS
+        if since is None or year >= since
+    }
+    easter = easter_sunday(year)
+    for offset, name in EASTER_HOLIDAYS:
+        holidays[easter + datetime.timedelta(days=offset)] = name
+    return holidays
+
+def _as_date(value):
+    return value.date() if isinstance(value, datetime.datetime) else value
+
 def is_polish_holiday(date_obj):
-    """Sprawdza, czy data to dzień wolny od pracy w Polsce w 2025."""
-    return date_obj in HOLIDAYS_2025
\ No newline at end of file
+    """Czy data to dzień ustawowo wolny od pracy w Polsce (święto, bez sobót i niedziel)."""
+    date_obj = _as_date(date_obj)
+    return date_obj in polish_holidays(date_obj.year)
+
+def is_workday(date_obj):
+    """Dzień roboczy: poniedziałek-piątek i nie święto."""
+    date_obj = _as_date(date_obj)
+    return date_obj.weekday() < 5 and date_obj not in polish_holidays(date_obj.year)
+
+@lru_cache(maxsize=32)
+def _business_calendar(first_year, last_year):
+    days = sorted(day for year in range(first_year, last_year + 1) for day in polish_holidays(year))
+    return np.busdaycalendar(weekmask=WEEKMASK, holidays=np.array(days, dtype="datetime64[D]"))
+
+def _to_days(values):
+    if isinstance(values, (datetime.date, datetime.datetime)):
+        values = _as_date(values)
+    elif not isinstance(values, (np.ndarray, np.datetime64)):
+        values = [_as_date(v) for v in values]
+    return np.asarray(values, dtype="datetime64[D]")
+
+def _calendar_for(*arrays, margin_days=0):
+    years = np.concatenate([a.reshape(-1).astype("datetime64[Y]").astype(np.int64) + 1970 for a in arrays])
+    spare = int(margin_days) // 250 + 1
+    return _business_calendar(int(years.min()) - spare, int(years.max()) + spare)
+
+def _workdays_after(start, end):
+    """Dni robocze w przedziale (start, end] dla pojedynczych dat: pełne tygodnie + reszta - święta."""
+    weeks, rest = divmod((end - start).days, 7)
+    weekday = start.weekday()
+    count = weeks * 5 + sum(1 for i in range(1, rest + 1) if (weekday + i) % 7 < 5)
+    return count - sum(
+        1 for year in range(start.year, end.year + 1) for day in polish_holidays(year)
+        if start < day <= end and day.weekday() < 5
+    )
+
+def workdays_between(start, end):
+    """
+    Dni robocze od start do end: dodatnie, gdy end jest później (liczone dni z przedziału
+    (start, end]), ujemne, gdy wcześniej. Przyjmuje daty albo tablice dat (wynik - tablica).
+    """
+    if isinstance(start, datetime.date) and isinstance(end, datetime.date):
+        start, end = _as_date(start), _as_date(end)
+        if end >= start:
+            return _workdays_after(start, end)
+        # [end, start) = (end - 1, start - 1]
+        one = datetime.timedelta(days=1)
+        return -_workdays_after(end - one, start - one)
+    scalar = isinstance(start, np.datetime64) and isinstance(end, np.datetime64)
+    start, end = np.broadcast_arrays(_to_days(start), _to_days(end))
+    calendar = _calendar_for(start, end)
+    one = np.timedelta64(1, "D")
+    # busday_count liczy [start, end) w przód i (end, start] wstecz - przesunięcie o dzień
+    # daje (start, end] i [end, start), tak jak przy pojedynczych datach
+    forward = np.busday_count(start + one, end + one, busdaycal=calendar)
+    backward = np.busday_count(start - one, end - one, busdaycal=calendar)
+    counts = np.where(end > start, forward, backward)
+    return int(counts) if scalar else counts
+
+def add_workdays(day, count):
+    """
+    Dzień po upływie count dni roboczych od day; przy count = 0 - day albo najbliższy
+    następny dzień roboczy. Przyjmuje daty albo tablice dat/liczb.
+    """
+    scalar = isinstance(day, (datetime.date, np.datetime64)) and np.ndim(count) == 0
+    days = _to_days(day)
+    counts = np.asarray(count, dtype=np.int64)
+    calendar = _calendar_for(days, margin_days=np.abs(counts).max(initial=0))
+    shifted = np.where(
+        counts == 0,
+        np.busday_offset(days, 0, roll="forward", busdaycal=calendar),
+        np.busday_offset(days, counts, roll="backward", busdaycal=calendar),
+    )
+    return shifted.item() if scalar else shifted
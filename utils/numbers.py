@@ -0,0 +1,88 @@
+# utils/numbers.py
+# Liczby w polach zamówienia: tolerancyjne czytanie tekstu ("10 000", "12,34", "100 m")
+# i zapis w polskim formacie (przecinek dziesiętny, bez zbędnych zer).
+
+import re
+from decimal import Decimal, InvalidOperation
+
+_LEADING_NUMBER = re.compile(r"^[-+]?\d+(?:\.\d+)?")
+
+# Jednostki dopisywane w starych danych i formularzach ("100 m", "76 mm", "10 tyś.")
+UNIT_SUFFIXES = ("m", "mb", "mm", "cm", "szt", "tys", "tyś", "rol", "rolek", "zł", "pln")
+
+def _normalize(text):
+    # spacje (także niełamiące) jako separator tysięcy, przecinek jako separator dziesiętny
+    text = re.sub(r"\s", "", str(text))
+    if "," in text and "." in text:
+        # "1.234,56" albo "1,234.56" - separatorem dziesiętnym jest ostatni znak
+        if text.rfind(",") > text.rfind("."):
+            text = text.replace(".", "").replace(",", ".")
+        else:
+            text = text.replace(",", "")
+    return text.replace(",", ".")
+
+def split_number(value):
+    """
+    Rozbija tekst na liczbę i resztę: "100 m" -> (Decimal("100"), "m").
+    Pusty tekst -> (None, ""), tekst bez liczby na początku -> (None, tekst).
+    """
+    if value is None:
+        return None, ""
+    if isinstance(value, (int, Decimal)) and not isinstance(value, bool):
+        return Decimal(value), ""
+    if isinstance(value, float):
+        return Decimal(str(value)), ""
+    text = str(value).strip()
+    if not text:
+        return None, ""
+    normalized = _normalize(text)
+    match = _LEADING_NUMBER.match(normalized)
+    if not match:
+        return None, text
+    try:
+        number = Decimal(match.group(0))
+    except InvalidOperation:
+        return None, text
+    return number, normalized[match.end():]
+
+def parse_number(value):
+    """
+    Liczba z pola formularza. Pusty tekst -> None, "10 000" -> 10000, "12,34" -> 12.34.
+    Tekst, który nie jest w całości liczbą, zgłasza ValueError.
+    """
+    number, rest = split_number(value)
+    if rest:
+        raise ValueError(f"To nie jest liczba: {value!r}")
+    return number
+
+def parse_quantity(value):
+    """
+    Jak parse_number, ale dopuszcza jednostkę z UNIT_SUFFIXES na końcu: "100 m" -> 100.
+    Inna reszta po liczbie zgłasza ValueError.
+    """
+    number, rest = split_number(value)
+    if rest and rest.lower().rstrip(".") not in UNIT_SUFFIXES:
+        raise ValueError(f"To nie jest liczba: {value!r}")
+    return number
+
+def parse_int(value):
+    number = parse_number(value)
+    if number is None:
+        return None
+    if number != number.to_integral_value():
+        raise ValueError(f"To nie jest liczba całkowita: {value!r}")
+    return int(number)
+
+def format_number(value, grouping=False):
+    """Decimal("12.3400") -> "12,34", 10000 -> "10000" (albo "10 000" przy grouping=True)."""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value.strip()
+    number = Decimal(str(value)) if isinstance(value, float) else Decimal(value)
+    if number == number.to_integral_value():
+        number = number.quantize(Decimal(1))
+    else:
+        number = number.normalize()
+    text = f"{number:,f}" if grouping else f"{number:f}"
+    return text.replace(",", " ").replace(".", ",")
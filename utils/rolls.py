@@ -0,0 +1,42 @@
+# utils/rolls.py
+# Rolki i metry bieżące jednej pozycji - reguły wspólne dla formularza zamówienia
+# (pole "zam. rolki", obciążenie dnia wysyłki) i prognozy materiału, która liczy to
+# samo wektorowo (widgets/material_forecast.py).
+# Geometrię wstęgi opisuje sekcja [forecast]:
+#
+#   [forecast]
+#   label_gap_mm = 3      ; odstęp między etykietami wzdłuż wstęgi
+#   edge_margin_mm = 2    ; naddatek materiału z każdej strony etykiety
+import math
+from utils.config import load_section
+
+FORECAST_DEFAULTS = {
+    "label_gap_mm": 3.0,
+    "edge_margin_mm": 2.0,
+}
+
+def load_forecast_settings(path=None):
+    return load_section("forecast", FORECAST_DEFAULTS, path)
+
+def roll_count(quantity, quantity_type, roll_length):
+    """
+    Liczba rolek pozycji (ta sama reguła co pole "zam. rolki" w formularzu):
+    dla ilości w tysiącach - w górę z ilość * 1000 / nawój, dla ilości w rolkach - ilość.
+    """
+    quantity = float(quantity or 0)
+    roll_length = float(roll_length or 0)
+    if (quantity_type or "").strip().lower().startswith("rol"):
+        return quantity
+    if quantity > 0 and roll_length > 0:
+        return math.ceil(quantity * 1000 / roll_length)
+    return 0
+
+def running_meters(quantity, quantity_type, roll_length, height, settings=None):
+    """Metry bieżące wstęgi dla jednej pozycji (ta sama reguła co labels_and_running_meters)."""
+    settings = dict(FORECAST_DEFAULTS, **(settings or {}))
+    quantity = float(quantity or 0)
+    if (quantity_type or "").strip().lower().startswith("rol"):
+        labels = quantity * float(roll_length or 0)
+    else:
+        labels = quantity * 1000.0
+    return labels * (float(height or 0) + settings["label_gap_mm"]) / 1000.0
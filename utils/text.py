@@ -0,0 +1,17 @@
+# utils/text.py
+# Normalizacja tekstu do wyszukiwania: małe litery, bez polskich znaków, pojedyncze spacje.
+
+import unicodedata
+
+# Litery, których NFKD nie rozkłada na literę bazową + znak diakrytyczny
+SPECIAL_LETTERS = str.maketrans({"ł": "l", "Ł": "l", "ø": "o", "Ø": "o", "ß": "ss"})
+
+def strip_diacritics(text):
+    decomposed = unicodedata.normalize("NFKD", str(text).translate(SPECIAL_LETTERS))
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+def normalize_search_text(text):
+    """'  Zakład  Łódź ' -> 'zaklad lodz'"""
+    if text is None:
+        return ""
+    return " ".join(strip_diacritics(text).lower().split())
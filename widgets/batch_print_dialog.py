@@ -0,0 +1,162 @@
+import datetime
+import os
+import time
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QPushButton, QRadioButton, QComboBox,
+    QDateEdit, QCheckBox, QMessageBox, QProgressBar
+)
+from PySide6.QtGui import QFont
+from PySide6.QtCore import Qt, QDate, QThreadPool
+from printing.batch_export import KIND_CONFIRMATION, KIND_PRODUCTION
+from printing.viewer import open_in_viewer
+from utils.holidays import add_workdays
+from widgets.print_worker import PrintTask
+from widgets.production_sort_dialog import BTN_STYLE
+
+KINDS = (("Karty produkcyjne", KIND_PRODUCTION), ("Potwierdzenia dla klienta", KIND_CONFIRMATION))
+MERGED_PREFIX = {KIND_PRODUCTION: "PRODUKCJA", KIND_CONFIRMATION: "POTWIERDZENIA"}
+
+class BatchPrintDialog(QDialog):
+    """
+    Wydruk zbiorczy: zaznaczone zamówienia albo wszystkie otwarte z wysyłką w podanych dniach.
+    Generowanie idzie w tle (PrintTask) z paskiem postępu, "Anuluj" przerywa po bieżącym zamówieniu.
+    """
+
+    def __init__(self, selected_order_ids=(), parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Wydruk zbiorczy")
+        self.selected_order_ids = list(selected_order_ids)
+        self.task = None
+        self.started = None
+        layout = QVBoxLayout(self)
+        font = QFont("Segoe UI", 11)
+
+        title = QLabel("Wydruk zbiorczy zamówień")
+        title.setFont(QFont("Segoe UI", 15, QFont.Bold))
+        title.setStyleSheet("color: #197a3d; margin-bottom: 12px;")
+        title.setAlignment(Qt.AlignCenter)
+        layout.addWidget(title)
+
+        grid = QGridLayout()
+        self.radio_selected = QRadioButton(f"Zaznaczone zamówienia ({len(self.selected_order_ids)})")
+        self.radio_range = QRadioButton("Wysyłka w dniach:")
+        today = datetime.date.today()
+        self.date_from = QDateEdit(QDate(today))
+        self.date_to = QDateEdit(QDate(add_workdays(today, 2)))
+        for edit in (self.date_from, self.date_to):
+            edit.setCalendarPopup(True)
+            edit.setDisplayFormat("yyyy-MM-dd")
+            edit.setFont(font)
+        self.kind_combo = QComboBox()
+        for label, kind in KINDS:
+            self.kind_combo.addItem(label, kind)
+        self.merged_check = QCheckBox("Jeden wspólny plik PDF")
+        self.merged_check.setChecked(True)
+        for widget in (self.radio_selected, self.radio_range, self.kind_combo, self.merged_check):
+            widget.setFont(font)
+
+        grid.addWidget(self.radio_selected, 0, 0, 1, 4)
+        grid.addWidget(self.radio_range, 1, 0)
+        grid.addWidget(self.date_from, 1, 1)
+        grid.addWidget(QLabel("–"), 1, 2)
+        grid.addWidget(self.date_to, 1, 3)
+        grid.addWidget(QLabel("Rodzaj:"), 2, 0)
+        grid.addWidget(self.kind_combo, 2, 1, 1, 3)
+        grid.addWidget(self.merged_check, 3, 0, 1, 4)
+        layout.addLayout(grid)
+
+        if self.selected_order_ids:
+            self.radio_selected.setChecked(True)
+        else:
+            self.radio_selected.setEnabled(False)
+            self.radio_range.setChecked(True)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+        self.status_label = QLabel("")
+        self.status_label.setFont(font)
+        layout.addWidget(self.status_label)
+
+        btn_layout = QHBoxLayout()
+        btn_layout.addStretch()
+        self.btn_print = QPushButton("Drukuj")
+        self.btn_close = QPushButton("Zamknij")
+        for btn in (self.btn_print, self.btn_close):
+            btn.setStyleSheet(BTN_STYLE)
+            btn_layout.addWidget(btn)
+        self.btn_print.clicked.connect(self.print_batch)
+        self.btn_close.clicked.connect(self.reject)
+        layout.addLayout(btn_layout)
+        self.settings_widgets = (
+            self.radio_selected, self.radio_range, self.date_from, self.date_to, self.kind_combo, self.merged_check
+        )
+
+    def merged_filename(self, kind):
+        if self.radio_selected.isChecked():
+            return f"{MERGED_PREFIX[kind]}_zaznaczone.pdf"
+        return f"{MERGED_PREFIX[kind]}_{self.date_from.date().toString('yyyy-MM-dd')}_{self.date_to.date().toString('yyyy-MM-dd')}.pdf"
+
+    def new_task(self, kind):
+        merged = self.merged_check.isChecked()
+        if self.radio_selected.isChecked():
+            return PrintTask(kind, order_ids=self.selected_order_ids, merged=merged,
+                             merged_filename=self.merged_filename(kind))
+        return PrintTask(kind, date_from=self.date_from.date().toPython(), date_to=self.date_to.date().toPython(),
+                         merged=merged, merged_filename=self.merged_filename(kind))
+
+    def print_batch(self):
+        self.task = self.new_task(self.kind_combo.currentData())
+        self.task.signals.progress.connect(self.on_progress)
+        self.task.signals.finished.connect(self.on_finished)
+        self.task.signals.cancelled.connect(self.on_cancelled)
+        self.task.signals.failed.connect(self.on_failed)
+        self.set_running(True)
+        self.status_label.setText("Odczyt zamówień…")
+        self.started = time.perf_counter()
+        QThreadPool.globalInstance().start(self.task)
+
+    def set_running(self, running):
+        for widget in self.settings_widgets:
+            widget.setEnabled(not running)
+        if not running and not self.selected_order_ids:
+            self.radio_selected.setEnabled(False)
+        self.btn_print.setEnabled(not running)
+        self.btn_close.setText("Anuluj" if running else "Zamknij")
+        self.progress_bar.setVisible(running)
+        self.progress_bar.setRange(0, 0)   # do pierwszego postępu - bez liczby zamówień
+        if not running:
+            self.task = None
+
+    def on_progress(self, done, total):
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(done)
+        self.status_label.setText(f"Zamówienie {done} z {total}")
+
+    def on_finished(self, paths):
+        self.set_running(False)
+        if not paths:
+            self.status_label.setText("")
+            QMessageBox.information(self, "Wydruk zbiorczy", "Brak zamówień do wydruku.")
+            return
+        self.status_label.setText(
+            f"Plików: {len(paths)}, wygenerowano w {time.perf_counter() - self.started:.1f} s"
+        )
+        open_in_viewer(paths[0] if len(paths) == 1 else os.path.dirname(paths[0]))
+
+    def on_cancelled(self, paths):
+        self.set_running(False)
+        self.status_label.setText(f"Przerwano - zapisane pliki: {len(paths)}")
+
+    def on_failed(self, message):
+        self.set_running(False)
+        self.status_label.setText("")
+        QMessageBox.critical(self, "Błąd PDF", f"Wystąpił błąd podczas generowania PDF:\n{message}")
+
+    def reject(self):
+        """Zamknij albo - w trakcie wydruku - Anuluj."""
+        if self.task is not None:
+            self.task.cancel()
+            self.status_label.setText("Przerywanie…")
+            return
+        super().reject()
@@ -0,0 +1,160 @@
+# widgets/change_listener.py
+# Odbiór zmian zapisanych przez inne stanowiska (models/notifications.py).
+# Wątek w tle czeka na NOTIFY (PostgreSQL) albo co poll_interval sekund odpytuje
+# tabelę change_log (SQLite, PgBouncer w trybie transakcyjnym). Zmiany z krótkiego
+# okna są łączone i wysyłane do GUI jednym sygnałem changed(encja, zbiór id).
+import logging
+import select
+import threading
+import time
+from datetime import datetime, timedelta
+from PySide6.QtCore import QObject, QTimer, Signal
+from models.db import engine as default_engine, load_db_settings
+from models.notifications import (
+    CHANNEL, decode_payload, fetch_changes, last_change_id, prune_changes
+)
+from utils.config import load_section
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_DEFAULTS = {
+    "enabled": True,
+    "poll_interval": 2.0,   # [s] odpytywanie change_log, gdy LISTEN nie jest dostępny
+    "debounce_ms": 300,     # zmiany z tego okna idą do widoków jednym sygnałem
+    "keep_hours": 24,       # po jakim czasie wpisy change_log są usuwane
+    "prune_interval": 3600, # [s] co ile usuwane są stare wpisy change_log
+    "overlap_ids": 500,     # ile ostatnich wpisów czytać ponownie (późny COMMIT z niższym id)
+    "retry_delay": 5.0,     # [s] ponowna próba po utracie połączenia
+}
+
+def load_notification_settings(path=None):
+    return load_section("notifications", NOTIFICATION_DEFAULTS, path)
+
+class ChangeListener(QObject):
+    changed = Signal(str, object)      # (encja, zbiór id) - w wątku GUI
+    _received = Signal(str, object)    # z wątku nasłuchu do wątku GUI
+
+    def __init__(self, engine=None, settings=None, parent=None):
+        super().__init__(parent)
+        self._engine = engine or default_engine
+        self._settings = dict(NOTIFICATION_DEFAULTS, **(settings or load_notification_settings()))
+        self._stop = threading.Event()
+        self._thread = None
+        self._next_prune = 0
+        self._pending = {}
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(int(self._settings["debounce_ms"]))
+        self._flush_timer.timeout.connect(self._flush)
+        self._received.connect(self._collect)
+
+    def uses_listen(self):
+        return self._engine.dialect.name == "postgresql" and not load_db_settings()["pgbouncer"]
+
+    def start(self):
+        if not self._settings["enabled"] or self._thread is not None:
+            return
+        target = self._listen_loop if self.uses_listen() else self._poll_loop
+        self._thread = threading.Thread(target=target, name="change-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _collect(self, entity, ids):
+        self._pending.setdefault(entity, set()).update(ids)
+        self._flush_timer.start()
+
+    def _flush(self):
+        pending, self._pending = self._pending, {}
+        for entity, ids in pending.items():
+            self.changed.emit(entity, ids)
+
+    def _prune(self, conn):
+        """Usuwa stare wpisy change_log - po (ponownym) połączeniu i potem co prune_interval."""
+        keep = timedelta(hours=self._settings["keep_hours"])
+        prune_changes(conn, datetime.now() - keep)
+        self._next_prune = time.monotonic() + self._settings["prune_interval"]
+
+    def _prune_due(self):
+        return time.monotonic() >= self._next_prune
+
+    def _poll_loop(self):
+        last_id = None
+        seen = set()
+        self._next_prune = 0
+        while not self._stop.is_set():
+            try:
+                with self._engine.begin() as conn:
+                    if self._prune_due():
+                        self._prune(conn)
+                    if last_id is None:
+                        # Start od bieżącego stanu - wpisy z okna trafiają do seen bez wysyłania
+                        last_id = last_change_id(conn)
+                        fetch_changes(conn, last_id, seen, self._settings["overlap_ids"])
+                    else:
+                        last_id, changes = fetch_changes(conn, last_id, seen, self._settings["overlap_ids"])
+                        for entity, ids in changes.items():
+                            self._received.emit(entity, ids)
+                wait = self._settings["poll_interval"]
+            except Exception as exc:
+                logger.warning("Odczyt zmian z bazy nie powiódł się: %s", exc)
+                self._next_prune = 0   # po ponownym połączeniu
+                wait = self._settings["retry_delay"]
+            self._stop.wait(wait)
+
+    def _listen_loop(self):
+        last_id = None
+        seen = set()   # id wpisów już wysłanych do GUI - z odczytu change_log albo z NOTIFY
+        while not self._stop.is_set():
+            raw = None
+            try:
+                # Osobne połączenie odpięte od puli - LISTEN trwa przez cały czas pracy programu
+                raw = self._engine.raw_connection()
+                raw.detach()
+                dbapi_conn = raw.driver_connection
+                dbapi_conn.autocommit = True
+                with dbapi_conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {CHANNEL}")
+                # Dopiero po LISTEN doczytujemy z change_log to, co przyszło w przerwie - zmiana
+                # zatwierdzona w międzyczasie jest w odczycie albo przyjdzie jako NOTIFY
+                # (albo jedno i drugie - wtedy drugi raz pomijamy ją po id wpisu).
+                with self._engine.begin() as conn:
+                    self._prune(conn)
+                    if last_id is None:
+                        last_id = last_change_id(conn)
+                        fetch_changes(conn, last_id, seen, self._settings["overlap_ids"])
+                    else:
+                        last_id, changes = fetch_changes(conn, last_id, seen, self._settings["overlap_ids"])
+                        for entity, ids in changes.items():
+                            self._received.emit(entity, ids)
+                while not self._stop.is_set():
+                    if self._prune_due():
+                        with self._engine.begin() as conn:
+                            self._prune(conn)
+                    if select.select([dbapi_conn], [], [], 1.0) == ([], [], []):
+                        continue
+                    dbapi_conn.poll()
+                    while dbapi_conn.notifies:
+                        note = dbapi_conn.notifies.pop(0)
+                        try:
+                            entity, ids, log_id = decode_payload(note.payload)
+                        except (ValueError, KeyError):
+                            continue
+                        if log_id in seen:
+                            continue
+                        seen.add(log_id)
+                        last_id = max(last_id, log_id)
+                        self._received.emit(entity, ids)
+            except Exception as exc:
+                logger.warning("Nasłuch zmian (LISTEN) przerwany: %s", exc)
+                self._stop.wait(self._settings["retry_delay"])
+            finally:
+                if raw is not None:
+                    try:
+                        raw.close()
+                    except Exception:
+                        pass
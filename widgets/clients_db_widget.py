@@ -1,11 +1,15 @@
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QPushButton,
-    QHeaderView, QLineEdit, QDialog, QFormLayout, QMessageBox, QScrollArea, QSizePolicy, QComboBox
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTableView, QAbstractItemView, QPushButton,
+    QHeaderView, QLineEdit, QDialog, QFormLayout, QMessageBox, QScrollArea, QSizePolicy
 )
-from PySide6.QtGui import QFont, QColor, QBrush
-from PySide6.QtCore import Qt, QSettings
-from models.db import Session
+from PySide6.QtGui import QFont
+from PySide6.QtCore import Qt, QSettings, QObject, QRunnable, QThreadPool, QTimer, Signal
+from models.db import session_scope
 from models.client import Client, CLIENT_NR_START
+from models.order import Order
+from models.client_queries import fetch_client_rows, search_client_rows, fetch_client_rows_by_ids
+from models.notifications import record_change, ENTITY_CLIENT
+from widgets.clients_table_model import ClientsTableModel
 
 class ClientEditDialog(QDialog):
     def __init__(self, client=None, parent=None):
@@ -21,17 +25,16 @@ class ClientEditDialog(QDialog):
         bigger_font.setPointSizeF(base_point_size * 1.2)
         self.setFont(bigger_font)
 
-        session = Session()
         if client:
             nr = client.client_number
         else:
-            last = session.query(Client).order_by(Client.client_number.desc()).first()
+            with session_scope() as session:
+                last = session.query(Client).order_by(Client.client_number.desc()).first()
             if last and last.client_number and last.client_number.isdigit():
                 next_nr = max(int(last.client_number) + 1, CLIENT_NR_START)
             else:
                 next_nr = CLIENT_NR_START
             nr = f"{next_nr:06d}"
-        session.close()
 
         nr_font = QFont(bigger_font)
         nr_font.setPointSizeF(bigger_font.pointSizeF() * 1.3)
@@ -137,17 +140,32 @@ class ClientEditDialog(QDialog):
             "delivery_city": self.delivery_city_edit.text().strip(),
         }
 
+class _SearchSignals(QObject):
+    finished = Signal(int, object)   # (numer wyszukiwania, lista wierszy albo wyjątek)
+
+class ClientSearchTask(QRunnable):
+    """Wyszukiwanie klientów w wątku z puli - GUI nie czeka na bazę."""
+
+    def __init__(self, generation, text):
+        super().__init__()
+        self.generation = generation
+        self.text = text
+        self.signals = _SearchSignals()
+
+    def run(self):
+        try:
+            with session_scope() as session:
+                result = search_client_rows(session, self.text)
+        except Exception as exc:
+            result = exc
+        self.signals.finished.emit(self.generation, result)
+
 class ClientsDBWidget(QWidget):
     SETTINGS_ORG = "twoja_aplikacja"
     SETTINGS_APP = "clients_db_widget"
     SETTINGS_COLUMNS = "column_widths"
 
-    SEARCH_FIELDS = [
-        ("Nazwa skróc.", "short_name"),
-        ("Numer klienta", "client_number"),
-        ("Nazwa", "name"),
-        ("NIP", "nip"),
-    ]
+    SEARCH_DELAY_MS = 250   # wyszukiwanie startuje po tej przerwie w pisaniu
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -158,19 +176,12 @@ class ClientsDBWidget(QWidget):
 
         btns_row = QHBoxLayout()
 
-        # --- KOMÓRKA ROZWIJANA + POLE WYSZUKIWANIA + PRZYCISK ---
-        self.search_combo = QComboBox()
-        for label, _ in self.SEARCH_FIELDS:
-            self.search_combo.addItem(label)
-        self.search_combo.setMinimumWidth(140)
-        self.search_combo.setMaximumWidth(180)
-        self.search_combo.setFont(QFont("Segoe UI", 12))
-        btns_row.addWidget(self.search_combo)
-
+        # --- POLE WYSZUKIWANIA (wszystkie pola naraz) + PRZYCISK ---
         self.search_edit = QLineEdit()
-        self.search_edit.setPlaceholderText("Wpisz szukaną frazę...")
-        self.search_edit.setMinimumWidth(180)
-        self.search_edit.setMaximumWidth(320)
+        self.search_edit.setPlaceholderText("Szukaj: nazwa, numer, NIP, miasto, osoba...")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.setMinimumWidth(260)
+        self.search_edit.setMaximumWidth(420)
         self.search_edit.setFont(QFont("Segoe UI", 12))
         btns_row.addWidget(self.search_edit)
 
@@ -233,9 +244,10 @@ class ClientsDBWidget(QWidget):
 
         table_container = QScrollArea()
         table_container.setWidgetResizable(True)
-        self.table = QTableWidget(0, 11)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setSelectionMode(QTableWidget.SingleSelection)
+        self.table = QTableView()
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.table.verticalHeader().setVisible(False)
 
         font = QFont()
@@ -246,11 +258,11 @@ class ClientsDBWidget(QWidget):
         bigger_font.setPointSizeF(base_size * 1.2)
         self.table.setFont(bigger_font)
         self.table.setStyleSheet(f"""
-            QTableWidget::item:selected {{
+            QTableView::item:selected {{
                 background: #409cff;
                 color: white;
             }}
-            QTableWidget::item {{
+            QTableView::item {{
                 padding: 2px;
                 margin: 0px;
                 font-size: {bigger_font.pointSizeF()}pt;
@@ -258,10 +270,11 @@ class ClientsDBWidget(QWidget):
             }}
         """)
         self.table.setWordWrap(False)
-        self.table.setHorizontalHeaderLabels([
-            "Nr klienta", "Nazwa firmy", "Nazwa skróc.", "Osoba kontaktowa", "Telefon", "E-mail",
-            "Ulica i nr", "Kod pocztowy", "Miasto", "NIP", "Adres dostawy"
-        ])
+        self.model = ClientsTableModel(self._fetch_clients_page, font=bigger_font, parent=self)
+        self.table.setModel(self.model)
+        # Jedna stała wysokość wierszy zamiast resizeRowsToContents + pętli setRowHeight
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(22)
         header_font = QFont(bigger_font)
         header_font.setBold(True)
         self.table.horizontalHeader().setFont(header_font)
@@ -270,122 +283,97 @@ class ClientsDBWidget(QWidget):
         table_container.setWidget(self.table)
         layout.addWidget(table_container)
 
-        self.table.itemSelectionChanged.connect(self.handle_selection)
+        self.table.selectionModel().selectionChanged.connect(self.handle_selection)
         self.btn_add.clicked.connect(self.add_client)
         self.btn_edit.clicked.connect(self.edit_client)
         self.btn_delete.clicked.connect(self.delete_client)
+
+        # Wyszukiwanie w trakcie pisania: odczekanie SEARCH_DELAY_MS, zapytanie w tle,
+        # wyniki starszych wyszukiwań (numer < _search_generation) są pomijane
+        self._search_generation = 0
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(self.search_clients)
+        self.search_edit.textChanged.connect(self._search_timer.start)
         self.btn_search.clicked.connect(self.search_clients)
         self.search_edit.returnPressed.connect(self.search_clients)
 
         self.restore_column_widths()
         self.table.horizontalHeader().sectionResized.connect(self.save_column_widths)
 
-        self._last_search_field = self.SEARCH_FIELDS[0][1]
         self._last_search_text = ""
-        self.search_combo.currentIndexChanged.connect(self._on_search_combo_changed)
         self.refresh_clients()
 
-    def _on_search_combo_changed(self, idx):
-        self._last_search_field = self.SEARCH_FIELDS[idx][1]
-        # Możesz wyczyścić pole wyszukiwania jeśli chcesz:
-        # self.search_edit.clear()
-
     def save_column_widths(self):
         settings = QSettings(self.SETTINGS_ORG, self.SETTINGS_APP)
-        widths = [self.table.columnWidth(i) for i in range(self.table.columnCount())]
+        widths = [self.table.columnWidth(i) for i in range(self.model.columnCount())]
         settings.setValue(self.SETTINGS_COLUMNS, widths)
 
     def restore_column_widths(self):
         settings = QSettings(self.SETTINGS_ORG, self.SETTINGS_APP)
         widths = settings.value(self.SETTINGS_COLUMNS)
-        if widths and len(widths) == self.table.columnCount():
+        if widths and len(widths) == self.model.columnCount():
             for i, w in enumerate(widths):
                 try:
                     self.table.setColumnWidth(i, int(w))
                 except Exception:
                     pass
 
-    def refresh_clients(self, search_field=None, search_text=""):
-        self.table.setRowCount(0)
-        session = Session()
-        query = session.query(Client).order_by(Client.client_number.asc())
-        if search_field and search_text:
-            search = f"%{search_text.lower()}%"
-            col = getattr(Client, search_field)
-            query = query.filter(col.ilike(search))
-        clients = query.all()
-        for row, client in enumerate(clients):
-            self.table.insertRow(row)
-            delivery_address = " ".join(filter(None, [
-                client.delivery_company,
-                client.delivery_street,
-                client.delivery_postal_code,
-                client.delivery_city
-            ]))
-            for col, val in enumerate([
-                client.client_number or "",
-                client.name or "",
-                getattr(client, "short_name", "") or "",
-                client.contact_person or "",
-                client.phone or "",
-                client.email or "",
-                client.street or "",
-                client.postal_code or "",
-                client.city or "",
-                client.nip or "",
-                delivery_address
-            ]):
-                item = QTableWidgetItem(val)
-                font = self.table.font()
-                if col == 0:
-                    font_bold = QFont(font)
-                    font_bold.setBold(True)
-                    item.setFont(font_bold)
-                else:
-                    item.setFont(font)
-                item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-                item.setFlags(item.flags() | Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-                item.setToolTip(val)
-                item.setData(Qt.TextWrapAnywhere, False)
-                if row % 2 == 0:
-                    bg = QColor("#f2f2f2")
-                else:
-                    bg = QColor("#ffffff")
-                item.setBackground(QBrush(bg))
-                if col == 10:
-                    item.setBackground(QBrush(QColor("#fffbc7")))
-                self.table.setItem(row, col, item)
-        session.close()
+    def refresh_clients(self, search_text=""):
+        """Pusta fraza - pełna lista stronicowana, w przeciwnym razie wyszukiwanie w tle."""
+        self._last_search_text = search_text
+        self._search_generation += 1
         self.btn_edit.setEnabled(False)
         self.btn_delete.setEnabled(False)
         self.table.clearSelection()
-        self.table.resizeRowsToContents()
-        min_row_height = 22
-        for row in range(self.table.rowCount()):
-            self.table.setRowHeight(row, min_row_height)
+        if not search_text:
+            self.model.reload()
+            return
+        task = ClientSearchTask(self._search_generation, search_text)
+        task.signals.finished.connect(self._on_search_finished)
+        QThreadPool.globalInstance().start(task)
+
+    def _on_search_finished(self, generation, result):
+        if generation != self._search_generation:
+            return  # w międzyczasie wpisano coś nowego
+        if isinstance(result, Exception):
+            QMessageBox.warning(self, "Błąd", f"Nie udało się wyszukać klientów:\n{result}")
+            return
+        self.model.set_rows(result)
+
+    def on_clients_changed(self, client_ids):
+        """Zmiana klientów (także z innego stanowiska) - odświeżenie tylko tych wierszy."""
+        client_ids = set(client_ids)
+        if self._last_search_text:
+            # wynik wyszukiwania ma własny ranking - liczymy go od nowa, w tle
+            self.refresh_clients(self._last_search_text)
+            return
+        with session_scope() as session:
+            rows = fetch_client_rows_by_ids(session, client_ids)
+        removed = client_ids - {row["id"] for row in rows}
+        self.model.apply_changes(rows, removed)
+
+    def _fetch_clients_page(self, after_number, limit):
+        with session_scope() as session:
+            return fetch_client_rows(session, after_number=after_number, limit=limit)
 
     def search_clients(self):
-        search_text = self.search_edit.text().strip()
-        idx = self.search_combo.currentIndex()
-        search_field = self.SEARCH_FIELDS[idx][1]
-        self._last_search_field = search_field
-        self._last_search_text = search_text
-        self.refresh_clients(search_field, search_text)
+        self._search_timer.stop()
+        self.refresh_clients(self.search_edit.text().strip())
 
-    def handle_selection(self):
-        selected = self.table.selectedItems()
+    def handle_selection(self, *args):
+        selected = self.table.selectionModel().selectedRows()
         self.btn_edit.setEnabled(bool(selected))
         self.btn_delete.setEnabled(bool(selected))
 
     def get_selected_client(self):
-        row = self.table.currentRow()
-        if row < 0:
+        selected = self.table.selectionModel().selectedRows()
+        if not selected:
             return None
-        client_number = self.table.item(row, 0).text()
-        session = Session()
-        client = session.query(Client).filter_by(client_number=client_number).first()
-        session.close()
-        return client
+        client_id = self.model.client_id(selected[0].row())
+        with session_scope() as session:
+            return session.query(Client).filter_by(id=client_id).first()
 
     def add_client(self):
         dlg = ClientEditDialog(parent=self)
@@ -394,17 +382,14 @@ class ClientsDBWidget(QWidget):
             if not data["name"]:
                 QMessageBox.warning(self, "Błąd", "Nazwa firmy jest wymagana.")
                 return
-            session = Session()
-            exists = session.query(Client).filter_by(client_number=data["client_number"]).first()
+            with session_scope() as session:
+                exists = session.query(Client).filter_by(client_number=data["client_number"]).first()
+                if not exists:
+                    session.add(Client(**data))
             if exists:
                 QMessageBox.warning(self, "Błąd", f"Numer klienta {data['client_number']} już istnieje.")
-                session.close()
                 return
-            client = Client(**data)
-            session.add(client)
-            session.commit()
-            session.close()
-            self.refresh_clients(self._last_search_field, self._last_search_text)
+            self.refresh_clients(self._last_search_text)
 
     def edit_client(self):
         client = self.get_selected_client()
@@ -414,19 +399,18 @@ class ClientsDBWidget(QWidget):
         dlg = ClientEditDialog(client, parent=self)
         if dlg.exec() == QDialog.Accepted:
             data = dlg.get_data()
-            session = Session()
-            dbclient = session.query(Client).filter_by(id=client.id).first()
-            if dbclient.client_number != data["client_number"]:
-                exists = session.query(Client).filter_by(client_number=data["client_number"]).first()
-                if exists:
-                    QMessageBox.warning(self, "Błąd", f"Numer klienta {data['client_number']} już istnieje.")
-                    session.close()
-                    return
-            for k, v in data.items():
-                setattr(dbclient, k, v)
-            session.commit()
-            session.close()
-            self.refresh_clients(self._last_search_field, self._last_search_text)
+            with session_scope() as session:
+                dbclient = session.query(Client).filter_by(id=client.id).first()
+                exists = None
+                if dbclient.client_number != data["client_number"]:
+                    exists = session.query(Client).filter_by(client_number=data["client_number"]).first()
+                if not exists:
+                    for k, v in data.items():
+                        setattr(dbclient, k, v)
+            if exists:
+                QMessageBox.warning(self, "Błąd", f"Numer klienta {data['client_number']} już istnieje.")
+                return
+            self.refresh_clients(self._last_search_text)
 
     def delete_client(self):
         client = self.get_selected_client()
@@ -440,8 +424,17 @@ class ClientsDBWidget(QWidget):
         )
         if ret != QMessageBox.Yes:
             return
-        session = Session()
-        session.delete(client)
-        session.commit()
-        session.close()
-        self.refresh_clients(self._last_search_field, self._last_search_text)
\ No newline at end of file
+        with session_scope() as session:
+            order_count = session.query(Order).filter_by(client_id=client.id).count()
+            if not order_count:
+                dbclient = session.get(Client, client.id)
+                if dbclient is not None:
+                    session.delete(dbclient)
+                record_change(session, ENTITY_CLIENT, [client.id])
+        if order_count:
+            QMessageBox.warning(
+                self, "Nie można usunąć",
+                f"Klient '{client.client_number} - {client.name}' ma zamówienia ({order_count}) i nie może zostać usunięty."
+            )
+            return
+        self.refresh_clients(self._last_search_text)
\ No newline at end of file
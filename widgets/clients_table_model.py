@@ -0,0 +1,135 @@
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PySide6.QtGui import QFont, QColor, QBrush
+from widgets.incremental_rows import IncrementalRowsMixin
+
+CLIENT_HEADERS = [
+    "Nr klienta", "Nazwa firmy", "Nazwa skróc.", "Osoba kontaktowa", "Telefon", "E-mail",
+    "Ulica i nr", "Kod pocztowy", "Miasto", "NIP", "Adres dostawy"
+]
+DELIVERY_COLUMN = 10
+
+ClientIdRole = Qt.UserRole + 1
+
+# Role jako stałe modułu - odwołanie do Qt.* w data() jest kosztowne przy tysiącach wywołań
+DISPLAY_ROLE = Qt.DisplayRole
+TOOLTIP_ROLE = Qt.ToolTipRole
+FONT_ROLE = Qt.FontRole
+BACKGROUND_ROLE = Qt.BackgroundRole
+ALIGNMENT_ROLE = Qt.TextAlignmentRole
+ALIGN_LEFT_VCENTER = int(Qt.AlignLeft | Qt.AlignVCenter)
+
+def client_cells(row):
+    delivery_address = " ".join(filter(None, [
+        row.get("delivery_company"),
+        row.get("delivery_street"),
+        row.get("delivery_postal_code"),
+        row.get("delivery_city"),
+    ]))
+    return [
+        row.get("client_number") or "",
+        row.get("name") or "",
+        row.get("short_name") or "",
+        row.get("contact_person") or "",
+        row.get("phone") or "",
+        row.get("email") or "",
+        row.get("street") or "",
+        row.get("postal_code") or "",
+        row.get("city") or "",
+        row.get("nip") or "",
+        delivery_address,
+    ]
+
+class ClientsTableModel(IncrementalRowsMixin, QAbstractTableModel):
+    """
+    Model listy klientów z leniwym dociąganiem stron.
+    fetch_page(after_number, limit) zwraca kolejne wiersze za podanym numerem klienta.
+    """
+    BATCH_SIZE = 200
+
+    def __init__(self, fetch_page, font=None, parent=None):
+        super().__init__(parent)
+        self._fetch_page = fetch_page
+        self._rows = []
+        self._exhausted = False
+        self._last_number = None
+        self._font = QFont(font) if font is not None else QFont()
+        self._font_bold = QFont(self._font)
+        self._font_bold.setBold(True)
+        self._row_brushes = (QBrush(QColor("#f2f2f2")), QBrush(QColor("#ffffff")))
+        self._delivery_brush = QBrush(QColor("#fffbc7"))
+
+    def reload(self):
+        self.beginResetModel()
+        self._rows = []
+        self._exhausted = False
+        self._last_number = None
+        self.endResetModel()
+        if self.canFetchMore(QModelIndex()):
+            self.fetchMore(QModelIndex())
+
+    def set_rows(self, rows):
+        """Podmienia całą zawartość (np. wynik wyszukiwania) bez dalszego dociągania."""
+        self.beginResetModel()
+        self._rows = [self._make_row(row) for row in rows]
+        self._exhausted = True
+        self._last_number = None
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(CLIENT_HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return CLIENT_HEADERS[section]
+        return None
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent):
+        if parent.isValid() or self._exhausted:
+            return
+        page = self._fetch_page(self._last_number, self.BATCH_SIZE)
+        if len(page) < self.BATCH_SIZE:
+            self._exhausted = True
+        if not page:
+            return
+        self._last_number = page[-1].get("client_number")
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(page) - 1)
+        self._rows.extend(self._make_row(row) for row in page)
+        self.endInsertRows()
+
+    def _make_row(self, raw):
+        return {
+            "id": raw.get("id"),
+            "key": (raw.get("client_number") or "", raw.get("id")),
+            "cells": client_cells(raw),
+        }
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        col = index.column()
+        if role == DISPLAY_ROLE or role == TOOLTIP_ROLE:
+            return row["cells"][col]
+        if role == FONT_ROLE:
+            return self._font_bold if col == 0 else self._font
+        if role == BACKGROUND_ROLE:
+            if col == DELIVERY_COLUMN:
+                return self._delivery_brush
+            return self._row_brushes[index.row() % 2]
+        if role == ALIGNMENT_ROLE:
+            return ALIGN_LEFT_VCENTER
+        if role == ClientIdRole:
+            return row["id"]
+        return None
+
+    def client_id(self, row):
+        if 0 <= row < len(self._rows):
+            return self._rows[row]["id"]
+        return None
@@ -0,0 +1,146 @@
+# widgets/cutting_plan.py
+# Plan cięcia rolek matek na pasy (1-D cutting stock) dla otwartych pozycji z zakresu dat.
+#
+# Zapotrzebowanie: dla każdego materiału i szerokości pasa (szerokość etykiety + naddatek
+# z obu stron) liczba pasów = metry bieżące pozycji / długość rolki matki, w górę.
+# Wzory cięcia układa heurystyka first-fit-decreasing: kolejna rolka matka dostaje
+# najszersze pasy, które się mieszczą. Identyczne kolejne rolki są liczone hurtem
+# (wzór × liczba powtórzeń), więc czas zależy od liczby różnych wzorów, a nie pasów.
+# Materiały są niezależne - przy dużym planie liczone są równolegle w osobnych procesach
+# (w exe wymaga to multiprocessing.freeze_support() w main.py - inaczej każdy proces
+# roboczy uruchamia kopię programu).
+#
+#   [cutting]
+#   master_width_mm = 1000    ; szerokość rolki matki
+#   master_length_m = 2000    ; długość rolki matki
+#   trim_mm = 10              ; obcięcie brzegów (razem z obu stron)
+#   knife_gap_mm = 0          ; odstęp między pasami
+#   lane_margin_mm = 2        ; naddatek pasa z każdej strony etykiety
+#   workers = 0               ; liczba procesów (0 - wg liczby rdzeni, 1 - bez procesów)
+#   parallel_min_widths = 200 ; od ilu różnych (materiał, szerokość) liczyć równolegle
+import math
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from models.db import session_scope
+from utils.config import load_section
+from utils.numbers import format_number
+from utils.rolls import load_forecast_settings
+from widgets.material_forecast import forecast_items_query, items_to_arrays, labels_and_running_meters
+
+CUTTING_DEFAULTS = {
+    "master_width_mm": 1000.0,
+    "master_length_m": 2000.0,
+    "trim_mm": 10.0,
+    "knife_gap_mm": 0.0,
+    "lane_margin_mm": 2.0,
+    "workers": 0,
+    "parallel_min_widths": 200,
+}
+
+# lanes: szerokości pasów od najszerszego; count: ile rolek matek ciąć tym wzorem
+Pattern = namedtuple("Pattern", "lanes count waste_mm")
+# demand: {szerokość pasa: liczba pasów}; oversize: pasy szersze niż użyteczna szerokość rolki
+MaterialPlan = namedtuple("MaterialPlan", "material demand patterns master_rolls lower_bound waste_pct oversize")
+
+def load_cutting_settings(path=None):
+    return load_section("cutting", CUTTING_DEFAULTS, path)
+
+def usable_width(settings):
+    return settings["master_width_mm"] - settings["trim_mm"]
+
+def cutting_demand(items, settings=None, forecast_settings=None):
+    """
+    Zapotrzebowanie na pasy z tablic items_to_arrays: {materiał: {szerokość pasa: pasy}}.
+    Metry bieżące pozycji o tej samej szerokości są sumowane przed zaokrągleniem w górę.
+    """
+    settings = dict(CUTTING_DEFAULTS, **(settings or {}))
+    if not len(items["quantity"]):
+        return {}
+    _, running_m = labels_and_running_meters(items, forecast_settings)
+    lane = np.round(items["width"] + 2 * settings["lane_margin_mm"], 2)
+    keep = (running_m > 0) & (lane > 0)
+    lane_widths, lane_codes = np.unique(lane[keep], return_inverse=True)
+    group = items["material"][keep] * len(lane_widths) + lane_codes
+    groups, inverse = np.unique(group, return_inverse=True)
+    meters = np.bincount(inverse, weights=running_m[keep])
+    lanes = np.ceil(meters / settings["master_length_m"] - 1e-9).astype(np.int64)
+    demand = {}
+    for g, count in zip(groups.tolist(), lanes.tolist()):
+        material = items["materials"][g // len(lane_widths)]
+        demand.setdefault(material, {})[float(lane_widths[g % len(lane_widths)])] = count
+    return dict(sorted(demand.items()))
+
+def ffd_patterns(demand, width, knife_gap=0.0):
+    """
+    First-fit-decreasing na rolki matki o użytecznej szerokości width.
+    Zwraca listę Pattern; pasy szersze niż width trzeba odfiltrować wcześniej.
+    """
+    widths = sorted((w for w, n in demand.items() if n > 0), reverse=True)
+    remaining = {w: demand[w] for w in widths}
+    patterns = []
+    while widths:
+        # n pasów zajmuje n * w + (n - 1) * odstęp, stąd "+ knife_gap" po obu stronach
+        free = width + knife_gap
+        used = {}
+        for w in widths:
+            take = min(remaining[w], int((free + 1e-9) // (w + knife_gap)))
+            if take:
+                used[w] = take
+                free -= take * (w + knife_gap)
+        if not used:
+            break
+        # kolejne rolki dostałyby ten sam wzór, dopóki starcza każdej z jego szerokości
+        repeat = min(remaining[w] // n for w, n in used.items())
+        for w, n in used.items():
+            remaining[w] -= n * repeat
+        lanes = tuple(w for w, n in used.items() for _ in range(n))
+        patterns.append(Pattern(lanes, repeat, 0.0))
+        widths = [w for w in widths if remaining[w]]
+    return patterns
+
+def plan_material(material, demand, settings=None):
+    settings = dict(CUTTING_DEFAULTS, **(settings or {}))
+    width = usable_width(settings)
+    fitting = {w: n for w, n in demand.items() if w <= width}
+    oversize = {w: n for w, n in demand.items() if w > width}
+    patterns = [
+        p._replace(waste_mm=settings["master_width_mm"] - sum(p.lanes))
+        for p in ffd_patterns(fitting, width, settings["knife_gap_mm"])
+    ]
+    master_rolls = sum(p.count for p in patterns)
+    lower_bound = math.ceil(sum(w * n for w, n in fitting.items()) / width - 1e-9) if fitting else 0
+    waste = sum(p.waste_mm * p.count for p in patterns)
+    waste_pct = 100.0 * waste / (master_rolls * settings["master_width_mm"]) if master_rolls else 0.0
+    return MaterialPlan(material, dict(sorted(demand.items(), reverse=True)), patterns,
+                        master_rolls, lower_bound, waste_pct, oversize)
+
+def _plan_material_args(args):
+    return plan_material(*args)
+
+def plan_cutting(demand_by_material, settings=None):
+    """Plany dla wszystkich materiałów; duże plany liczone na puli procesów."""
+    settings = dict(CUTTING_DEFAULTS, **(settings or {}))
+    jobs = [(material, demand, settings) for material, demand in demand_by_material.items()]
+    widths = sum(len(demand) for demand in demand_by_material.values())
+    workers = int(settings["workers"]) or None
+    if len(jobs) > 1 and workers != 1 and widths >= settings["parallel_min_widths"]:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_plan_material_args, jobs))
+    return [plan_material(*job) for job in jobs]
+
+def get_cutting_plan(date_from, date_to, settings=None):
+    settings = settings or load_cutting_settings()
+    with session_scope() as session:
+        rows = session.connection().execute(forecast_items_query(date_from, date_to)).cursor.fetchall()
+    demand = cutting_demand(items_to_arrays(rows), settings, load_forecast_settings())
+    return plan_cutting(demand, settings)
+
+def pattern_label(lanes):
+    """(100, 100, 58) -> "2 × 100 + 58"."""
+    counts = {}
+    for w in lanes:
+        counts[w] = counts.get(w, 0) + 1
+    return " + ".join(
+        f"{n} × {format_number(w)}" if n > 1 else format_number(w) for w, n in counts.items()
+    )
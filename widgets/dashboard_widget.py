@@ -4,6 +4,8 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QFont
 from .day_box import DayBox  # zakładamy, że DayBox jest w osobnym pliku widgets/day_box.py
+from .machine_schedule import MachineSchedule
+from .delivery_planner import fetch_day_loads, load_capacity_settings
 
 DAY_BOX_WIDTH = 340   # Stała szerokość kontenera dnia (dopasuj do siebie)
 
@@ -43,16 +45,43 @@ class DashboardWidget(QWidget):
 
         self.day_boxes = []
         self.cards_per_day = {}
+        self.cards_by_order = {}   # order_id -> OrderCard, fiszki są ponownie używane między odświeżeniami
+        self.schedule = MachineSchedule()   # kolejki maszyn na dni tablicy
+        self.capacity_m = load_capacity_settings()["daily_capacity_m"]
         self.populate_days()
         self.show_done_checkbox.stateChanged.connect(self.refresh_cards)
-        # Odświeżamy tablicę zawsze po powrocie okna na wierzch (np. po dodaniu/klonowaniu)
-        self.installEventFilter(self)
+        # Zmiany z innych stanowisk przychodzą przez ChangeListener (on_orders_changed/on_clients_changed)
         self.refresh_cards()
+        self.replan_days([box.day.date() for box in self.day_boxes])
 
-    def eventFilter(self, obj, event):
-        if obj == self and event.type() == 24:  # QEvent.WindowActivate
-            QTimer.singleShot(100, self.refresh_cards)
-        return super().eventFilter(obj, event)
+    def on_orders_changed(self, order_ids):
+        # Uzgodnienie fiszek to jedno zapytanie o widoczne okno dat - tańsze niż
+        # sprawdzanie, czy zmienione zamówienie wpadło do okna albo z niego wypadło
+        self.refresh_cards()
+        self.replan_orders(order_ids)
+
+    def visible_days(self):
+        return {box.day.date(): box for box in self.day_boxes}
+
+    def update_day_headers(self, plans):
+        """Nagłówki dni z nowym planem maszyn: obciążenie tych dni jednym zapytaniem GROUP BY."""
+        visible = self.visible_days()
+        loads = fetch_day_loads(plans)
+        for day, plan in plans.items():
+            visible[day].set_machine_plan(plan, self.schedule.machines)
+            visible[day].set_day_load(loads[day], self.capacity_m)
+
+    def replan_days(self, days):
+        self.update_day_headers(self.schedule.replan(set(days) & set(self.visible_days())))
+
+    def replan_orders(self, order_ids):
+        # Nagłówki tylko dla dni, z których zamówienia zniknęły albo do których trafiły
+        self.update_day_headers(self.schedule.replan_orders(order_ids, self.visible_days()))
+
+    def on_clients_changed(self, client_ids):
+        client_ids = set(client_ids)
+        if any(card.order.client_id in client_ids for card in self.cards_by_order.values()):
+            self.refresh_cards()
 
     def get_days(self):
         from datetime import datetime, timedelta
@@ -74,6 +103,7 @@ class DashboardWidget(QWidget):
                 widget.deleteLater()
         self.day_boxes = []
         self.cards_per_day = {}
+        self.cards_by_order = {}
 
         days = self.get_days()
         for idx, day in enumerate(days):
@@ -105,46 +135,63 @@ class DashboardWidget(QWidget):
         self.updateGeometry()
 
     def refresh_cards(self):
-        from models.db import Session
-        from sqlalchemy.orm import joinedload
-        from models.order import Order
+        """
+        Uzgadnia fiszki na tablicy ze stanem bazy: nowe zamówienia dostają fiszkę,
+        znikające są usuwane, przesunięte zmieniają DayBox, pozostałe są tylko
+        aktualizowane (update_order). Cała seria zmian idzie przy wyłączonym
+        odświeżaniu, a układ przeliczany jest raz na końcu.
+        """
+        from models.db import session_scope
+        from models.order_queries import fetch_orders_in_window
         from widgets.order_card import OrderCard  # import tutaj, żeby uniknąć cyklicznych importów
-        from widgets.done_orders_store import done_orders_store
 
         show_done = self.show_done_checkbox.isChecked()
-        # WYCZYŚĆ zamówienia w każdym DayBox
-        for box in self.day_boxes:
-            if hasattr(box, "clear_orders"):
-                box.clear_orders()
-
-        session = Session()
-        # WYMUSZAJ NAJŚWIEŻSZE DANE Z BAZY
-        session.expire_all()
-        orders = session.query(Order).options(joinedload(Order.client)).order_by(Order.delivery_date.asc()).all()
-        session.close()
+        # Tylko widoczne okno dat, filtr statusu w SQL
+        days = self.get_days()
+        with session_scope() as session:
+            orders = fetch_orders_in_window(session, days[0].date(), days[-1].date(), show_done)
 
+        wanted = {day_str: [] for day_str in self.cards_per_day}
+        visible_ids = set()
         for order in orders:
-            if order.delivery_date:
-                day_str = order.delivery_date.strftime("%Y-%m-%d")
-            else:
+            day_str = order.delivery_date.strftime("%Y-%m-%d")
+            if day_str not in wanted:
                 continue
-            is_done = done_orders_store.is_done(order.id)
-            if show_done:
-                if not is_done:
-                    continue
-            else:
-                if is_done:
-                    continue
-            if day_str in self.cards_per_day:
-                card = OrderCard(order, self)
-                # Dodanie fiszki do DayBoxa
-                self.cards_per_day[day_str].add_order(card)
-                # Podłączanie sygnałów
-                if hasattr(card, "arrow_btn"):
-                    card.arrow_btn.clicked.connect(card.toggle_details)
-                card.mouseDoubleClickEvent = lambda event, o=order: self.open_edit_order(o)
-                card.setAcceptDrops(False)
-        self.update()
+            visible_ids.add(order.id)
+            wanted[day_str].append(order)
+
+        self.setUpdatesEnabled(False)
+        try:
+            for order_id in list(self.cards_by_order):
+                if order_id not in visible_ids:
+                    card = self.cards_by_order.pop(order_id)
+                    for box in self.day_boxes:
+                        box.remove_order(card)
+                    card.setParent(None)
+                    card.deleteLater()
+
+            cards_per_day = {}
+            for day_str, day_orders in wanted.items():
+                cards = []
+                for order in day_orders:
+                    card = self.cards_by_order.get(order.id)
+                    if card is None:
+                        card = OrderCard(order, self)
+                        self.cards_by_order[order.id] = card
+                    else:
+                        card.update_order(order, show_done)
+                    cards.append(card)
+                cards_per_day[day_str] = cards
+            # Najpierw odpinamy fiszki przeniesione do innego dnia, potem układamy dni
+            for day_str, box in self.cards_per_day.items():
+                target = set(map(id, cards_per_day[day_str]))
+                for card in list(box.orders):
+                    if id(card) not in target:
+                        box.remove_order(card)
+            for day_str, cards in cards_per_day.items():
+                self.cards_per_day[day_str].set_orders(cards)
+        finally:
+            self.setUpdatesEnabled(True)
         self.adjust_day_box_sizes()
 
     def archive_order_card(self, card):
@@ -159,12 +206,12 @@ class DashboardWidget(QWidget):
             w.finished.connect(self.refresh_cards)
 
     def handle_drop(self, order_id, target_day):
-        from models.db import Session
+        from models.db import session_scope
         from models.order import Order
-        session = Session()
-        order = session.query(Order).filter_by(id=order_id).one_or_none()
-        if order:
-            order.delivery_date = target_day
-            session.commit()
-        session.close()
-        self.refresh_cards()
\ No newline at end of file
+        from models.production_summary import track_summary
+        with session_scope() as session, track_summary(session, order_id):
+            order = session.query(Order).filter_by(id=order_id).one_or_none()
+            if order:
+                order.delivery_date = target_day
+        self.refresh_cards()
+        self.replan_orders([order_id])
\ No newline at end of file
@@ -1,8 +1,10 @@
+import html
 from PySide6.QtWidgets import (
     QGroupBox, QVBoxLayout, QWidget, QLabel, QMessageBox, QSizePolicy
 )
 from PySide6.QtCore import Qt, QByteArray, QDataStream
 from PySide6.QtGui import QFont
+from utils.numbers import format_number
 
 class DayBox(QGroupBox):
     def __init__(self, day, dashboard):
@@ -67,6 +69,22 @@ class DayBox(QGroupBox):
         self.header_layout.addWidget(self.header_label)
         self.header_layout.addWidget(self.date_label)
 
+        # Obciążenie dnia (rolki, etykiety, m²) - ustawiane przez dashboard
+        self.load_label = QLabel("", self.header)
+        self.load_label.setAlignment(Qt.AlignCenter)
+        self.load_label.setFont(QFont("Segoe UI", 9, QFont.Bold))
+        self.load_label.setTextFormat(Qt.RichText)
+        self.load_label.hide()
+        self.header_layout.addWidget(self.load_label)
+
+        # Kolejki maszyn (MachineSchedule) - ustawiane przez dashboard
+        self.machines_label = QLabel("", self.header)
+        self.machines_label.setAlignment(Qt.AlignCenter)
+        self.machines_label.setFont(QFont("Segoe UI", 9))
+        self.machines_label.setTextFormat(Qt.RichText)
+        self.machines_label.hide()
+        self.header_layout.addWidget(self.machines_label)
+
         self.orders = []
         self.max_orders = 20
 
@@ -84,6 +102,54 @@ class DayBox(QGroupBox):
         self.header_label.setStyleSheet(f"background-color: {self._header_color}; color: {self._header_fg}; padding: 4px 0; border-radius: 6px;")
         self.date_label.setStyleSheet(f"background-color: {self._header_color}; color: {self._header_fg}; padding-bottom:2px; border-radius: 6px;")
 
+    def set_day_load(self, load, capacity_m):
+        """Suma zamówionych rolek, etykiet i m² w dniu; ponad wydajność - ostrzeżenie na czerwono."""
+        if load is None or not load.labels:
+            self.load_label.setText("")
+            self.load_label.hide()
+            return
+        utilization = load.running_m / capacity_m if capacity_m else 0.0
+        text = (
+            f"{format_number(round(load.rolls), grouping=True)} rol. · "
+            f"{format_number(round(load.labels / 1000, 1), grouping=True)} tyś. et. · "
+            f"{format_number(round(load.label_m2, 1), grouping=True)} m²"
+        )
+        if utilization > 1:
+            text = (f"<span style='color:#c62828'>{text}<br>"
+                    f"⚠ ponad wydajność: {utilization:.0%}</span>")
+        else:
+            text = f"<span style='color:{self._header_fg}'>{text} ({utilization:.0%})</span>"
+        self.load_label.setText(text)
+        self.load_label.setToolTip(
+            f"Metry bieżące: {format_number(round(load.running_m), grouping=True)} m "
+            f"z {format_number(round(capacity_m), grouping=True)} m dziennej wydajności"
+        )
+        self.load_label.show()
+
+    def set_machine_plan(self, plan, machines):
+        """Obciążenie maszyn w dniu: godziny / dostępne godziny, na czerwono ponad limit."""
+        if plan is None:
+            self.machines_label.hide()
+            return
+        lines = []
+        tooltip = []
+        for machine in machines:
+            hours = plan.hours[machine.name]
+            color = "#c62828" if hours > machine.hours_per_day else "#555555"
+            lines.append(
+                f"<span style='color:{color}'>{html.escape(machine.name)}: "
+                f"{hours:.1f} / {machine.hours_per_day:g} h</span>"
+            )
+            orders = [number for job in plan.queues[machine.name] for _, number in job.orders]
+            tooltip.append(f"{machine.name}: " + (", ".join(dict.fromkeys(orders)) or "-"))
+        if plan.unassigned:
+            lines.append(f"<span style='color:#c62828'>Bez maszyny: {len(plan.unassigned)} bl.</span>")
+            tooltip.append("Bez maszyny: " + ", ".join(
+                f"{job.material} {job.width:g} mm" for job in plan.unassigned))
+        self.machines_label.setText("<br>".join(lines))
+        self.machines_label.setToolTip("\n".join(tooltip))
+        self.machines_label.show()
+
     def dragEnterEvent(self, event):
         if event.mimeData().hasFormat("application/x-order-id"):
             event.acceptProposedAction()
@@ -111,13 +177,33 @@ class DayBox(QGroupBox):
         event.acceptProposedAction()
 
     def add_order(self, card):
+        # Bez adjustSize przy każdej fiszce - układ przelicza dashboard raz, po całej serii zmian
         self.orders.append(card)
         self.orders_layout.addWidget(card)
-        self.orders_container.adjustSize()
-        self.adjustSize()
-        parent = self.parent()
-        if parent:
-            parent.adjustSize()
+
+    def remove_order(self, card):
+        if card in self.orders:
+            self.orders.remove(card)
+            self.orders_layout.removeWidget(card)
+
+    def set_orders(self, cards):
+        """
+        Ustawia fiszki dnia w podanej kolejności. Fiszki już obecne zostają na miejscu
+        (lub są tylko przesuwane w układzie), nowe są dokładane, brakujące odpinane.
+        """
+        keep = set(map(id, cards))
+        for card in list(self.orders):
+            if id(card) not in keep:
+                self.remove_order(card)
+        for position, card in enumerate(cards):
+            if position < len(self.orders) and self.orders[position] is card:
+                continue
+            if card in self.orders:
+                self.orders.remove(card)
+                self.orders_layout.removeWidget(card)
+            self.orders.insert(position, card)
+            self.orders_layout.insertWidget(position, card)
+            card.show()
 
     def clear_orders(self):
         for card in self.orders:
@@ -126,6 +212,3 @@ class DayBox(QGroupBox):
         self.orders = []
         self.orders_container.adjustSize()
         self.adjustSize()
-        parent = self.parent()
-        if parent:
-            parent.adjustSize()
\ No newline at end of file
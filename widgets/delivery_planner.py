@@ -0,0 +1,149 @@
+# widgets/delivery_planner.py
+# Najwcześniejsza możliwa data wysyłki przy ograniczonej dziennej wydajności.
+#
+# Indeks obciążenia (metry bieżące wstęgi na dzień wysyłki, otwarte zamówienia)
+# budowany jest jednym zapytaniem GROUP BY i trzymany w pamięci - podpowiedź przy
+# wpisywaniu ilości przegląda tylko kolejne dni indeksu, bez sięgania do bazy.
+# Indeks jest odświeżany, gdy jest starszy niż refresh_seconds.
+#
+#   [capacity]
+#   daily_capacity_m = 40000   ; ile metrów bieżących produkcja robi dziennie
+#   lead_days = 1              ; najkrótszy czas realizacji w dniach roboczych
+#   horizon_days = 180         ; jak daleko szukać wolnego dnia
+#   refresh_seconds = 60
+import datetime
+import time
+from collections import namedtuple
+from sqlalchemy import Float, case, cast, func, select
+from models.db import session_scope
+from models.order import Order, ACTIVE_STATUSES
+from models.orderitem import OrderItem
+from utils.config import load_section
+from utils.holidays import add_workdays
+from utils.rolls import load_forecast_settings
+
+CAPACITY_DEFAULTS = {
+    "daily_capacity_m": 40000.0,
+    "lead_days": 1,
+    "horizon_days": 180,
+    "refresh_seconds": 60,
+}
+
+DayLoad = namedtuple("DayLoad", "labels rolls label_m2 running_m")
+
+def load_capacity_settings(path=None):
+    return load_section("capacity", CAPACITY_DEFAULTS, path)
+
+def _in_rolls():
+    return func.lower(func.coalesce(OrderItem.quantity_type, "")).like("rol%")
+
+def labels_expr():
+    """Liczba etykiet pozycji jako wyrażenie SQL (reguła labels_and_running_meters)."""
+    quantity = cast(func.coalesce(OrderItem.ordered_quantity, 0), Float)
+    return case(
+        (_in_rolls(), quantity * cast(func.coalesce(OrderItem.roll_length, 0), Float)),
+        else_=quantity * 1000.0,
+    )
+
+def running_meters_expr(label_gap_mm):
+    """Metry bieżące pozycji jako wyrażenie SQL."""
+    return labels_expr() * (cast(func.coalesce(OrderItem.height, 0), Float) + label_gap_mm) / 1000.0
+
+def rolls_expr():
+    """Rolki pozycji: ilość w rolkach albo zapisane "zam. rolki" (liczone w formularzu przez roll_count)."""
+    return case(
+        (_in_rolls(), cast(func.coalesce(OrderItem.ordered_quantity, 0), Float)),
+        else_=cast(func.coalesce(OrderItem.zam_rolki, 0), Float),
+    )
+
+def daily_load_query(date_from, date_to, label_gap_mm, exclude_order_id=None):
+    """Suma metrów bieżących otwartych zamówień na dzień wysyłki."""
+    query = (
+        select(Order.delivery_date, func.sum(running_meters_expr(label_gap_mm)))
+        .join(OrderItem, Order.id == OrderItem.order_id)
+        .where(Order.status.in_(ACTIVE_STATUSES))
+        .where(Order.delivery_date.between(date_from, date_to))
+        .group_by(Order.delivery_date)
+    )
+    if exclude_order_id is not None:
+        query = query.where(Order.id != exclude_order_id)
+    return query
+
+def day_load_query(days, label_gap_mm):
+    """Obciążenie podanych dni wysyłki jednym zapytaniem: etykiety, rolki, m² etykiet, metry bieżące."""
+    width = cast(func.coalesce(OrderItem.width, 0), Float)
+    height = cast(func.coalesce(OrderItem.height, 0), Float)
+    return (
+        select(
+            Order.delivery_date,
+            func.sum(labels_expr()), func.sum(rolls_expr()),
+            func.sum(labels_expr() * width * height / 1e6),
+            func.sum(running_meters_expr(label_gap_mm)),
+        )
+        .join(OrderItem, Order.id == OrderItem.order_id)
+        .where(Order.status.in_(ACTIVE_STATUSES))
+        .where(Order.delivery_date.in_(list(days)))
+        .group_by(Order.delivery_date)
+    )
+
+def fetch_day_loads(days, forecast_settings=None):
+    """{dzień: DayLoad} dla wszystkich podanych dni (dni bez pozycji - zera)."""
+    forecast_settings = forecast_settings or load_forecast_settings()
+    days = list(days)
+    if not days:
+        return {}
+    with session_scope() as session:
+        rows = session.execute(day_load_query(days, forecast_settings["label_gap_mm"])).all()
+    loads = {day: DayLoad(0.0, 0.0, 0.0, 0.0) for day in days}
+    loads.update({day: DayLoad(*(float(v or 0) for v in values)) for day, *values in rows})
+    return loads
+
+class DeliveryPlanner:
+    """
+    Podpowiedź daty wysyłki. exclude_order_id - edytowane zamówienie, którego
+    dotychczasowe pozycje nie liczą się do obciążenia (zastąpi je formularz).
+    """
+
+    def __init__(self, settings=None, exclude_order_id=None, forecast_settings=None):
+        self.settings = dict(CAPACITY_DEFAULTS, **(settings or load_capacity_settings()))
+        self.forecast_settings = forecast_settings or load_forecast_settings()
+        self.exclude_order_id = exclude_order_id
+        self.load = {}
+        self.loaded_at = None
+        self.today = None
+
+    def refresh(self, today=None):
+        self.today = today or datetime.date.today()
+        query = daily_load_query(
+            self.today, self.today + datetime.timedelta(days=self.settings["horizon_days"]),
+            self.forecast_settings["label_gap_mm"], self.exclude_order_id,
+        )
+        with session_scope() as session:
+            rows = session.execute(query).all()
+        self.load = {day: float(meters or 0) for day, meters in rows}
+        self.loaded_at = time.monotonic()
+
+    def ensure_fresh(self):
+        stale = self.loaded_at is None or time.monotonic() - self.loaded_at > self.settings["refresh_seconds"]
+        if stale or self.today != datetime.date.today():
+            self.refresh()
+
+    def utilization(self, day, extra_m=0.0):
+        """Obciążenie dnia (0..1+) po dodaniu extra_m metrów."""
+        return (self.load.get(day, 0.0) + extra_m) / self.settings["daily_capacity_m"]
+
+    def suggest(self, extra_m):
+        """
+        Pierwszy dzień roboczy po czasie realizacji, w którym zmieści się extra_m metrów.
+        Zlecenie większe niż dzienna wydajność dostaje pierwszy wolny dzień.
+        Bez miejsca w horyzoncie - None.
+        """
+        capacity = self.settings["daily_capacity_m"]
+        day = add_workdays(self.today, self.settings["lead_days"])
+        last = self.today + datetime.timedelta(days=self.settings["horizon_days"])
+        while day <= last:
+            booked = self.load.get(day, 0.0)
+            if booked + extra_m <= capacity or (extra_m > capacity and booked == 0):
+                return day
+            day = add_workdays(day, 1)
+        return None
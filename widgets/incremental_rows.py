@@ -0,0 +1,44 @@
+# widgets/incremental_rows.py
+# Wspólna obsługa częściowego odświeżania modeli tabel (zamówienia, klienci).
+from bisect import bisect_left
+from PySide6.QtCore import QModelIndex
+
+class IncrementalRowsMixin:
+    """
+    Dla modeli QAbstractTableModel trzymających self._rows posortowane po row["key"]
+    i doczytywanych porcjami (self._exhausted). Klasa modelu dostarcza _make_row(raw).
+    """
+
+    def apply_changes(self, raw_rows, removed_ids=()):
+        """
+        Nanosi zmiany bez resetu modelu: usuwa wiersze removed_ids, podmienia wczytane
+        wiersze z raw_rows, a nowe wstawia na właściwe miejsce - o ile mieszczą się
+        w już wczytanym zakresie (dalsze przyjdą same przy przewijaniu).
+        """
+        fresh = [self._make_row(raw) for raw in raw_rows]
+        gone = set(removed_ids) | {row["id"] for row in fresh}
+        for position in reversed(range(len(self._rows))):
+            row = self._rows[position]
+            if row["id"] not in gone:
+                continue
+            replacement = next((f for f in fresh if f["id"] == row["id"]), None)
+            if replacement is not None and replacement["key"] == row["key"]:
+                self._rows[position] = replacement
+                fresh.remove(replacement)
+                self.dataChanged.emit(
+                    self.index(position, 0), self.index(position, self.columnCount() - 1)
+                )
+                continue
+            self.beginRemoveRows(QModelIndex(), position, position)
+            del self._rows[position]
+            self.endRemoveRows()
+        for row in fresh:
+            if not self._exhausted and (not self._rows or row["key"] > self._rows[-1]["key"]):
+                continue
+            position = bisect_left([r["key"] for r in self._rows], row["key"])
+            self.beginInsertRows(QModelIndex(), position, position)
+            self._rows.insert(position, row)
+            self.endInsertRows()
+
+    def loaded_ids(self):
+        return {row["id"] for row in self._rows}
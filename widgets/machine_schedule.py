@@ -0,0 +1,180 @@
+# widgets/machine_schedule.py
+# Przydział pozycji dnia do maszyn (list scheduling) z wyrównaniem obciążenia.
+#
+# Maszyny opisują sekcje [machine.<nazwa>] w zamowienia.ini:
+#
+#   [machine.Mark Andy 2200]
+#   meters_per_hour = 3000     ; prędkość druku [m bieżących/h]
+#   max_width_mm = 330         ; najszersza etykieta
+#   materials = Termiczny, Folia PP   ; puste - wszystkie materiały
+#   hours_per_day = 16         ; dostępny czas w dniu
+#   setup_minutes = 20         ; przezbrojenie na każdy blok (materiał, szerokość)
+#
+# Bez takich sekcji używana jest jedna maszyna z MACHINE_DEFAULTS.
+#
+# Zadaniem jest blok pozycji dnia o tym samym materiale i szerokości (jedno przezbrojenie).
+# Bloki są przydzielane od najdłuższego (LPT) do maszyny, która - spośród zdolnych do
+# ich wykonania - skończy najwcześniej. Plan liczony jest osobno dla każdego dnia,
+# więc po przeniesieniu zamówienia wystarczy przeliczyć dzień źródłowy i docelowy.
+from collections import namedtuple
+import numpy as np
+from sqlalchemy import Float, cast, func, select
+from models.db import session_scope
+from models.order import Order, ACTIVE_STATUSES
+from models.orderitem import OrderItem
+from utils.config import load_section, section_names
+from utils.rolls import load_forecast_settings
+from widgets.material_forecast import labels_and_running_meters
+
+MACHINE_SECTION_PREFIX = "machine."
+
+MACHINE_DEFAULTS = {
+    "meters_per_hour": 2500.0,
+    "max_width_mm": 330.0,
+    "materials": "",
+    "hours_per_day": 16.0,
+    "setup_minutes": 20.0,
+}
+
+Machine = namedtuple("Machine", "name meters_per_hour max_width_mm materials hours_per_day setup_minutes")
+# Blok pozycji jednego dnia: materiał, szerokość, metry bieżące, zamówienia (order_id, order_number)
+Job = namedtuple("Job", "material width running_m orders")
+# queues: {maszyna: [Job, ...]}, hours: {maszyna: godziny}, unassigned: bloki bez zdolnej maszyny
+DayPlan = namedtuple("DayPlan", "day queues hours unassigned")
+
+def make_machine(name, settings):
+    materials = frozenset(m.strip().lower() for m in settings["materials"].split(",") if m.strip())
+    return Machine(
+        name, settings["meters_per_hour"], settings["max_width_mm"], materials,
+        settings["hours_per_day"], settings["setup_minutes"],
+    )
+
+def load_machines(path=None):
+    """Rejestr maszyn z sekcji [machine.<nazwa>]; bez nich - jedna maszyna domyślna."""
+    sections = section_names(MACHINE_SECTION_PREFIX, path)
+    if not sections:
+        return [make_machine("Maszyna", MACHINE_DEFAULTS)]
+    return [
+        make_machine(section[len(MACHINE_SECTION_PREFIX):].strip(), load_section(section, MACHINE_DEFAULTS, path))
+        for section in sections
+    ]
+
+def can_run(machine, job):
+    if job.width is not None and job.width > machine.max_width_mm:
+        return False
+    return not machine.materials or (job.material or "").lower() in machine.materials
+
+def job_hours(machine, job):
+    return machine.setup_minutes / 60.0 + job.running_m / machine.meters_per_hour
+
+def schedule_day(day, jobs, machines):
+    """
+    LPT: bloki od najdłuższego (czas na najszybszej zdolnej maszynie), każdy do maszyny
+    z najmniejszym czasem zakończenia po jego dodaniu. Bloki, które może wykonać mniej
+    maszyn, idą pierwsze - inaczej ich jedyna maszyna bywa już zajęta resztą pracy.
+    Czas zakończenia liczony względem dostępnych godzin, żeby słabsza maszyna
+    nie była zapychana jak pełnoetatowa.
+    """
+    queues = {m.name: [] for m in machines}
+    hours = {m.name: 0.0 for m in machines}
+    unassigned = []
+    capable_for = [[m for m in machines if can_run(m, job)] for job in jobs]
+
+    def priority(index):
+        capable = capable_for[index]
+        return (len(capable), -min((job_hours(m, jobs[index]) for m in capable), default=0.0))
+
+    for index in sorted(range(len(jobs)), key=priority):
+        job, capable = jobs[index], capable_for[index]
+        if not capable:
+            unassigned.append(job)
+            continue
+        best = min(capable, key=lambda m: ((hours[m.name] + job_hours(m, job)) / m.hours_per_day, m.name))
+        queues[best.name].append(job)
+        hours[best.name] += job_hours(best, job)
+    return DayPlan(day, queues, hours, unassigned)
+
+def schedule_items_query(days):
+    """Pozycje otwartych zamówień z wysyłką w jednym z podanych dni."""
+    return (
+        select(
+            Order.delivery_date, Order.id, Order.order_number,
+            func.coalesce(OrderItem.material, ""), cast(OrderItem.width, Float),
+            cast(func.coalesce(OrderItem.height, 0), Float),
+            cast(func.coalesce(OrderItem.ordered_quantity, 0), Float),
+            cast(func.coalesce(OrderItem.roll_length, 0), Float),
+            func.lower(func.coalesce(OrderItem.quantity_type, "")).like("rol%"),
+        )
+        .join(OrderItem, Order.id == OrderItem.order_id)
+        .where(Order.status.in_(ACTIVE_STATUSES))
+        .where(Order.delivery_date.in_(list(days)))
+        .where(OrderItem.width.isnot(None))
+        .order_by(Order.delivery_date, Order.order_number, OrderItem.id)
+    )
+
+def jobs_by_day(rows, forecast_settings=None):
+    """Wiersze schedule_items_query -> {dzień: [Job, ...]} (bloki materiał + szerokość)."""
+    if not rows:
+        return {}
+    day, order_id, order_number, material, width, height, quantity, roll_length, in_rolls = zip(*rows)
+    items = {
+        "width": np.asarray(width, dtype=float),
+        "height": np.asarray(height, dtype=float),
+        "quantity": np.asarray(quantity, dtype=float),
+        "roll_length": np.asarray(roll_length, dtype=float),
+        "in_rolls": np.asarray(in_rolls, dtype=bool),
+    }
+    _, running_m = labels_and_running_meters(items, forecast_settings)
+    blocks = {}
+    for i, meters in enumerate(running_m.tolist()):
+        key = (day[i], material[i], width[i])
+        meters_sum, orders = blocks.get(key, (0.0, {}))
+        orders[order_id[i]] = order_number[i]
+        blocks[key] = (meters_sum + meters, orders)
+    result = {}
+    for (d, m, w), (meters, orders) in blocks.items():
+        result.setdefault(d, []).append(Job(m, w, meters, tuple(orders.items())))
+    return result
+
+class MachineSchedule:
+    """Plany dni dla tablicy zleceń; replan(days) przelicza tylko wskazane dni."""
+
+    def __init__(self, machines=None):
+        self.machines = machines or load_machines()
+        self.plans = {}
+
+    def replan(self, days):
+        days = set(days)
+        if not days:
+            return {}
+        with session_scope() as session:
+            rows = session.execute(schedule_items_query(days)).all()
+        jobs = jobs_by_day(rows, load_forecast_settings())
+        changed = {day: schedule_day(day, jobs.get(day, []), self.machines) for day in days}
+        self.plans.update(changed)
+        return changed
+
+    def planned_days(self, order_ids):
+        """Dni, w których planie są bloki podanych zamówień."""
+        order_ids = set(order_ids)
+        return {
+            day for day, plan in self.plans.items()
+            if any(order_id in order_ids
+                   for jobs in list(plan.queues.values()) + [plan.unassigned]
+                   for job in jobs for order_id, _ in job.orders)
+        }
+
+    def replan_orders(self, order_ids, window=None):
+        """
+        Przelicza dni, w których zamówienia były zaplanowane, i dni, w których są teraz
+        (po przeniesieniu, edycji albo usunięciu). window - dni brane pod uwagę (okno tablicy).
+        """
+        order_ids = set(order_ids)
+        with session_scope() as session:
+            current = set(session.execute(
+                select(Order.delivery_date).where(Order.id.in_(order_ids)).distinct()
+            ).scalars())
+        days = (self.planned_days(order_ids) | current) - {None}
+        if window is not None:
+            days &= set(window)
+        return self.replan(days)
@@ -0,0 +1,163 @@
+# widgets/material_forecast.py
+# Prognoza zużycia materiału dla otwartych zamówień: m² i metry bieżące podkładu
+# na materiał i tydzień wysyłki, razem z liczbą rolek.
+#
+# Pozycje wczytywane są jednym zapytaniem do tablic NumPy i liczone jednym
+# przebiegiem wektorowym (bez pętli po pozycjach), więc przeliczenie 100 tys.
+# pozycji trwa ułamek sekundy. Geometria wstęgi (sekcja [forecast]) i reguły dla
+# pojedynczej pozycji są w utils/rolls.py.
+import csv
+import datetime
+from collections import namedtuple
+import numpy as np
+from sqlalchemy import Float, String, cast, func, select
+from models.db import session_scope
+from models.order import Order, ACTIVE_STATUSES
+from models.orderitem import OrderItem
+from utils.numbers import format_number
+from utils.rolls import FORECAST_DEFAULTS, load_forecast_settings
+
+FORECAST_HEADERS = [
+    "Rok / tydzień", "Materiał", "Etykiety [tys.]", "Rolki",
+    "Metry bieżące [m]", "Etykiety [m²]", "Materiał [m²]",
+]
+
+ForecastRow = namedtuple("ForecastRow", "year week material labels rolls running_m label_m2 material_m2")
+
+def forecast_items_query(start_date=None, end_date=None):
+    """
+    Pozycje otwartych zamówień z wypełnioną szerokością; liczby jako float (bez Decimal),
+    data jako tekst RRRR-MM-DD - tydzień ISO liczony jest potem raz na każdą datę,
+    a nie w SQL dla każdej pozycji.
+    """
+    query = (
+        select(
+            cast(Order.delivery_date, String),
+            func.coalesce(OrderItem.material, ""),
+            cast(OrderItem.width, Float), cast(func.coalesce(OrderItem.height, 0), Float),
+            cast(func.coalesce(OrderItem.ordered_quantity, 0), Float),
+            cast(func.coalesce(OrderItem.roll_length, 0), Float),
+            func.lower(func.coalesce(OrderItem.quantity_type, "")).like("rol%"),
+        )
+        .join(OrderItem, Order.id == OrderItem.order_id)
+        .where(Order.status.in_(ACTIVE_STATUSES))
+        .where(Order.delivery_date.isnot(None))
+        .where(OrderItem.width.isnot(None))
+    )
+    if start_date:
+        query = query.where(Order.delivery_date >= start_date)
+    if end_date:
+        query = query.where(Order.delivery_date <= end_date)
+    return query
+
+def _factorize(values):
+    """Tekstowe wartości -> (lista unikalnych w kolejności wystąpienia, tablica kodów)."""
+    index = {}
+    codes = np.fromiter((index.setdefault(v, len(index)) for v in values), dtype=np.int64, count=len(values))
+    return list(index), codes
+
+def items_to_arrays(rows):
+    """Wiersze forecast_items_query -> słownik tablic NumPy (kolumny)."""
+    columns = list(zip(*rows)) or [()] * 7
+    day, material, width, height, quantity, roll_length, in_rolls = columns
+    days, day_codes = _factorize(day)
+    iso = np.array([datetime.date.fromisoformat(str(d)[:10]).isocalendar()[:2] for d in days],
+                   dtype=np.int64).reshape(-1, 2)
+    materials, material_codes = _factorize(material)
+    return {
+        "year": iso[day_codes, 0],
+        "week": iso[day_codes, 1],
+        "materials": materials,
+        "material": material_codes,
+        "width": np.asarray(width, dtype=float),
+        "height": np.asarray(height, dtype=float),
+        "quantity": np.asarray(quantity, dtype=float),
+        "roll_length": np.asarray(roll_length, dtype=float),
+        "in_rolls": np.asarray(in_rolls, dtype=bool),
+    }
+
+def labels_and_running_meters(items, settings=None):
+    """Liczba etykiet i metry bieżące wstęgi dla każdej pozycji z tablic items_to_arrays."""
+    settings = dict(FORECAST_DEFAULTS, **(settings or {}))
+    quantity = items["quantity"]
+    labels = np.where(items["in_rolls"], quantity * items["roll_length"], quantity * 1000.0)
+    return labels, labels * (items["height"] + settings["label_gap_mm"]) / 1000.0
+
+def compute_forecast(items, settings=None):
+    """
+    Sumy na (rok, tydzień, materiał) z tablic items_to_arrays - jeden przebieg wektorowy.
+    Liczba etykiet: ilość * 1000 (tysiące) albo rolki * nawój; metry bieżące:
+    etykiety * (wysokość + odstęp); m² materiału: metry * (szerokość + 2 * naddatek).
+    """
+    settings = dict(FORECAST_DEFAULTS, **(settings or {}))
+    if not len(items["quantity"]):
+        return []
+    in_rolls = items["in_rolls"]
+    quantity, roll_length = items["quantity"], items["roll_length"]
+    width, height = items["width"], items["height"]
+
+    labels, running_m = labels_and_running_meters(items, settings)
+    rolls = np.where(
+        in_rolls, quantity,
+        np.where((quantity > 0) & (roll_length > 0),
+                 np.ceil(quantity * 1000.0 / np.where(roll_length > 0, roll_length, 1.0)), 0.0),
+    )
+    label_m2 = labels * width * height / 1e6
+    material_m2 = running_m * (width + 2 * settings["edge_margin_mm"]) / 1000.0
+
+    # materiały w kolejności alfabetycznej, żeby wynik był posortowany po (tydzień, materiał)
+    order = sorted(range(len(items["materials"])), key=lambda i: items["materials"][i])
+    materials = [items["materials"][i] for i in order]
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    material_codes = rank[items["material"]]
+    year_weeks, week_codes = np.unique(items["year"] * 100 + items["week"], return_inverse=True)
+    group = week_codes * len(materials) + material_codes
+    groups, inverse = np.unique(group, return_inverse=True)
+    sums = [np.bincount(inverse, weights=values)
+            for values in (labels, rolls, running_m, label_m2, material_m2)]
+    return [
+        ForecastRow(
+            int(year_weeks[g // len(materials)] // 100), int(year_weeks[g // len(materials)] % 100),
+            str(materials[g % len(materials)]),
+            *(float(column[i]) for column in sums),
+        )
+        for i, g in enumerate(groups.tolist())
+    ]
+
+def material_totals(rows):
+    """Sumy całego okresu na materiał: {materiał: ForecastRow z year/week = None}."""
+    totals = {}
+    for row in rows:
+        current = totals.get(row.material)
+        values = row[3:] if current is None else [a + b for a, b in zip(current[3:], row[3:])]
+        totals[row.material] = ForecastRow(None, None, row.material, *values)
+    return dict(sorted(totals.items()))
+
+def get_material_forecast(start_date=None, end_date=None, settings=None):
+    with session_scope() as session:
+        # Surowe krotki sterownika bazy - zapytanie zwraca już float/tekst, a pominięcie
+        # budowania obiektów Row skraca odczyt dużej liczby pozycji
+        rows = session.connection().execute(forecast_items_query(start_date, end_date)).cursor.fetchall()
+    return compute_forecast(items_to_arrays(rows), settings or load_forecast_settings())
+
+def forecast_row_cells(row, grouping=True):
+    """Tekst komórek wiersza w kolejności FORECAST_HEADERS."""
+    period = f"{row.year} / {row.week:02d}" if row.year is not None else "Razem"
+    return [
+        period, row.material or "(brak)",
+        format_number(round(row.labels / 1000, 3), grouping),
+        format_number(round(row.rolls), grouping),
+        format_number(round(row.running_m, 1), grouping),
+        format_number(round(row.label_m2, 2), grouping),
+        format_number(round(row.material_m2, 2), grouping),
+    ]
+
+def export_forecast_csv(rows, path):
+    """Zapis prognozy (wiersze tygodniowe + sumy na materiał) do CSV dla działu zakupów."""
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(FORECAST_HEADERS)
+        for row in list(rows) + list(material_totals(rows).values()):
+            # bez spacji tysięcy - arkusz ma rozpoznać liczby
+            writer.writerow(forecast_row_cells(row, grouping=False))
@@ -0,0 +1,87 @@
+import time
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QLabel,
+    QHeaderView, QFileDialog, QMessageBox
+)
+from PySide6.QtGui import QFont, QColor, QBrush
+from PySide6.QtCore import Qt
+from widgets.material_forecast import (
+    FORECAST_HEADERS, export_forecast_csv, forecast_row_cells, get_material_forecast, material_totals
+)
+from widgets.production_sort_dialog import BTN_STYLE
+
+class MaterialForecastDialog(QDialog):
+    """Zużycie materiału dla otwartych zamówień: tygodnie × materiał, na końcu sumy na materiał."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Prognoza zużycia materiału")
+        self.resize(1100, 700)
+        self.rows = []
+        layout = QVBoxLayout(self)
+
+        title = QLabel("Prognoza zużycia materiału (otwarte zamówienia)")
+        title.setFont(QFont("Segoe UI", 15, QFont.Bold))
+        title.setStyleSheet("color: #197a3d; margin-bottom: 16px;")
+        title.setAlignment(Qt.AlignCenter)
+        layout.addWidget(title)
+
+        self.table = QTableWidget()
+        self.table.setAlternatingRowColors(True)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setColumnCount(len(FORECAST_HEADERS))
+        self.table.setHorizontalHeaderLabels(FORECAST_HEADERS)
+        header = self.table.horizontalHeader()
+        header.setFont(QFont("Segoe UI", 12, QFont.Bold))
+        header.setSectionResizeMode(QHeaderView.Stretch)
+        self.table.verticalHeader().hide()
+        layout.addWidget(self.table)
+
+        btn_layout = QHBoxLayout()
+        self.status_label = QLabel("")
+        self.status_label.setFont(QFont("Segoe UI", 11))
+        btn_layout.addWidget(self.status_label)
+        btn_layout.addStretch()
+        self.btn_refresh = QPushButton("Przelicz")
+        self.btn_export = QPushButton("Eksport CSV")
+        self.btn_close = QPushButton("Zamknij")
+        for btn in (self.btn_refresh, self.btn_export, self.btn_close):
+            btn.setStyleSheet(BTN_STYLE)
+            btn_layout.addWidget(btn)
+        self.btn_refresh.clicked.connect(self.populate_table)
+        self.btn_export.clicked.connect(self.export_csv)
+        self.btn_close.clicked.connect(self.accept)
+        layout.addLayout(btn_layout)
+
+        self.populate_table()
+
+    def populate_table(self):
+        started = time.perf_counter()
+        self.rows = get_material_forecast()
+        totals = list(material_totals(self.rows).values())
+        self.table.setRowCount(len(self.rows) + len(totals))
+        font = QFont("Segoe UI", 11)
+        font_bold = QFont("Segoe UI", 11, QFont.Bold)
+        total_brush = QBrush(QColor("#eaffea"))
+        for row_idx, row in enumerate(self.rows + totals):
+            is_total = row.year is None
+            for col, text in enumerate(forecast_row_cells(row)):
+                item = QTableWidgetItem(text)
+                item.setFont(font_bold if is_total else font)
+                item.setTextAlignment((Qt.AlignRight if col >= 2 else Qt.AlignLeft) | Qt.AlignVCenter)
+                if is_total:
+                    item.setBackground(total_brush)
+                self.table.setItem(row_idx, col, item)
+        self.status_label.setText(
+            f"Tygodni × materiałów: {len(self.rows)}, przeliczono w {time.perf_counter() - started:.2f} s"
+        )
+
+    def export_csv(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Zapisz prognozę", "prognoza_materialu.csv", "CSV (*.csv)")
+        if not path:
+            return
+        try:
+            export_forecast_csv(self.rows, path)
+        except OSError as exc:
+            QMessageBox.critical(self, "Błąd zapisu", f"Nie udało się zapisać pliku:\n{exc}")
@@ -4,23 +4,42 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt, QByteArray, QDataStream, QIODevice, QMimeData, QPoint
 from PySide6.QtGui import QFont, QDrag
-from datetime import datetime, date, timedelta
-from models.db import Session
+from datetime import datetime, date
+from models.db import Session, session_scope
 from models.orderitem import OrderItem
-from widgets.done_orders_store import done_orders_store
+from models.order import set_order_status, restored_status, STATUS_DONE
 from widgets.order_details_dialog import OrderDetailsDialog
-
-def count_workdays(start_date, end_date):
-    if start_date == end_date:
-        return 0
-    step = 1 if end_date > start_date else -1
-    count = 0
-    current = start_date
-    while current != end_date:
-        current += timedelta(days=step)
-        if current.weekday() < 5:
-            count += step
-    return count
+from utils.holidays import workdays_between
+
+def get_gradient_for_shipping_days(workdays_left):
+    if workdays_left is None:
+        return "#ffffff", "#ffffff"
+    if workdays_left < 0:
+        return "#ff6666", "#ffffff"
+    elif workdays_left == 0:
+        return "#ffe600", "#ffffff"
+    elif workdays_left == 1:
+        return "#ffc966", "#ffffff"
+    elif workdays_left == 2:
+        return "#b2d7ff", "#ffffff"
+    elif workdays_left == 3:
+        return "#b5e7b2", "#ffffff"
+    elif workdays_left == 4:
+        return "#cccccc", "#ffffff"
+    else:
+        return "#ffffff", "#ffffff"
+
+def as_date(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.strptime(str(value), "%Y-%m-%d").date()
+    except Exception:
+        return None
 
 class OrderCard(QFrame):
     def __init__(self, order, dashboard, parent=None):
@@ -28,56 +47,10 @@ class OrderCard(QFrame):
         self.order = order
         self.dashboard = dashboard
         self.details_dialog = None
-
-        today = date.today()
-        delivery_date = None
-        if hasattr(order, "delivery_date") and order.delivery_date is not None:
-            if isinstance(order.delivery_date, datetime):
-                delivery_date = order.delivery_date.date()
-            elif isinstance(order.delivery_date, date):
-                delivery_date = order.delivery_date
-            else:
-                try:
-                    delivery_date = datetime.strptime(str(order.delivery_date), "%Y-%m-%d").date()
-                except Exception:
-                    delivery_date = None
-
-        if delivery_date:
-            workdays_left = count_workdays(today, delivery_date)
-        else:
-            workdays_left = None
-
-        def get_gradient_for_shipping_days(workdays_left):
-            if workdays_left is None:
-                return "#ffffff", "#ffffff"
-            if workdays_left < 0:
-                return "#ff6666", "#ffffff"
-            elif workdays_left == 0:
-                return "#ffe600", "#ffffff"
-            elif workdays_left == 1:
-                return "#ffc966", "#ffffff"
-            elif workdays_left == 2:
-                return "#b2d7ff", "#ffffff"
-            elif workdays_left == 3:
-                return "#b5e7b2", "#ffffff"
-            elif workdays_left == 4:
-                return "#cccccc", "#ffffff"
-            else:
-                return "#ffffff", "#ffffff"
-
-        grad_start, grad_end = get_gradient_for_shipping_days(workdays_left)
+        self._gradient = None
 
         self.setFrameShape(QFrame.Box)
         self.setLineWidth(2)
-        self.setStyleSheet(
-            "QFrame {{"
-            "    background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 {start}, stop:1 {end});"
-            "    border: 2px solid #7eb7e6;"
-            "    border-radius: 4px;"
-            "    max-width: 100%;"
-            "}}"
-            .format(start=grad_start, end=grad_end)
-        )
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Minimum)
 
         layout = QVBoxLayout(self)
@@ -86,18 +59,15 @@ class OrderCard(QFrame):
 
         header_row = QHBoxLayout()
         header_row.setSpacing(8)
-        if hasattr(order, 'client') and order.client:
-            client_name = order.client.name
-        else:
-            client_name = "—"
-
-        klient_label = QLabel(client_name)
+        klient_label = QLabel()
         klient_label.setFont(QFont("Segoe UI", 9, QFont.Bold))
         klient_label.setStyleSheet("color: #2574a9")
         klient_label.setWordWrap(True)
         klient_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
+        self.client_label = klient_label
 
-        nr_label = QLabel("Zamówienie: {}".format(order.order_number))
+        nr_label = QLabel()
+        self.nr_label = nr_label
         nr_label.setFont(QFont("Segoe UI", 9, QFont.Bold))
         nr_label.setStyleSheet(
             "QLabel {{"
@@ -131,15 +101,50 @@ class OrderCard(QFrame):
         self.done_btn.setMinimumWidth(80)
         btn_row.addWidget(self.done_btn)
         self.done_btn.clicked.connect(self.remove_from_dashboard)
-        self.restore_btn = None
-        if hasattr(dashboard, "show_done_checkbox") and dashboard.show_done_checkbox and dashboard.show_done_checkbox.isChecked():
-            self.restore_btn = QPushButton("Przywróć")
-            self.restore_btn.setStyleSheet("background:#eebb22; color:white; font-weight:bold; border-radius:7px; padding:3px 10px; font-size:10px;")
-            self.restore_btn.setMinimumWidth(80)
-            btn_row.addWidget(self.restore_btn)
-            self.restore_btn.clicked.connect(self.restore_to_dashboard)
+        self.restore_btn = QPushButton("Przywróć")
+        self.restore_btn.setStyleSheet("background:#eebb22; color:white; font-weight:bold; border-radius:7px; padding:3px 10px; font-size:10px;")
+        self.restore_btn.setMinimumWidth(80)
+        btn_row.addWidget(self.restore_btn)
+        self.restore_btn.clicked.connect(self.restore_to_dashboard)
         layout.addLayout(btn_row)
         self.setMouseTracking(True)
+        self.setAcceptDrops(False)
+
+        show_done = bool(getattr(dashboard, "show_done_checkbox", None) and dashboard.show_done_checkbox.isChecked())
+        self.update_order(order, show_done)
+
+    def update_order(self, order, show_done=False):
+        """
+        Aktualizuje istniejącą fiszkę danymi zamówienia. Teksty i styl zmieniane są
+        tylko wtedy, gdy faktycznie się różnią - setStyleSheet jest kosztowny.
+        """
+        self.order = order
+        client_name = order.client.name if getattr(order, "client", None) else "—"
+        if self.client_label.text() != client_name:
+            self.client_label.setText(client_name)
+        nr_text = "Zamówienie: {}".format(order.order_number)
+        if self.nr_label.text() != nr_text:
+            self.nr_label.setText(nr_text)
+
+        delivery_date = as_date(getattr(order, "delivery_date", None))
+        workdays_left = workdays_between(date.today(), delivery_date) if delivery_date else None
+        gradient = get_gradient_for_shipping_days(workdays_left)
+        if gradient != self._gradient:
+            self._gradient = gradient
+            self.setStyleSheet(
+                "QFrame {{"
+                "    background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 {start}, stop:1 {end});"
+                "    border: 2px solid #7eb7e6;"
+                "    border-radius: 4px;"
+                "    max-width: 100%;"
+                "}}"
+                .format(start=gradient[0], end=gradient[1])
+            )
+        self.restore_btn.setVisible(show_done)
+
+    def mouseDoubleClickEvent(self, event):
+        if hasattr(self.dashboard, "open_edit_order"):
+            self.dashboard.open_edit_order(self.order)
 
     def _dialog_closed(self):
         self.arrow_btn.setArrowType(Qt.DownArrow)
@@ -175,7 +180,8 @@ class OrderCard(QFrame):
         msgbox.setTextInteractionFlags(Qt.TextSelectableByMouse)
         ret = msgbox.exec()
         if ret == QMessageBox.Yes:
-            done_orders_store.mark_done(self.order.id)
+            with session_scope() as session:
+                set_order_status(session, self.order.id, STATUS_DONE)
             self.dashboard.refresh_cards()
 
     def restore_to_dashboard(self):
@@ -189,7 +195,8 @@ class OrderCard(QFrame):
             QMessageBox.Yes | QMessageBox.No
         )
         if reply == QMessageBox.Yes:
-            done_orders_store.remove(self.order.id)
+            with session_scope() as session:
+                set_order_status(session, self.order.id, restored_status(self.order))
             self.dashboard.refresh_cards()
 
     def resizeEvent(self, event):
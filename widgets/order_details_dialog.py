@@ -4,8 +4,9 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtGui import QFont
 from PySide6.QtCore import Qt
-from models.db import Session
+from models.db import session_scope
 from models.orderitem import OrderItem
+from utils.numbers import format_number
 
 class OrderDetailsDialog(QDialog):
     def __init__(self, order, parent=None):
@@ -43,21 +44,20 @@ class OrderDetailsDialog(QDialog):
         layout.addSpacing(12)
 
         # --- Tabela pozycji produkcyjnych ---
-        session = Session()
-        order_items = session.query(OrderItem).filter_by(order_id=order.id).all()
-        session.close()
+        with session_scope() as session:
+            order_items = session.query(OrderItem).filter_by(order_id=order.id).all()
         table_headers = ["#", "Materiał", "Wymiar", "Ilość", "Rodzaj", "Nawój", "Rdzeń"]
-        prod_items = [item for item in order_items if getattr(item, "width", None) not in (None, '', 0)]
+        prod_items = [item for item in order_items if item.width is not None]
         table = QTableWidget(len(prod_items), len(table_headers))
         table.setHorizontalHeaderLabels(table_headers)
         for row_idx, item in enumerate(prod_items):
             table.setItem(row_idx, 0, QTableWidgetItem(str(row_idx+1)))
             table.setItem(row_idx, 1, QTableWidgetItem(str(getattr(item, "material", "") or "")))
-            wymiar = f"{getattr(item, 'width', '') or ''} x {getattr(item, 'height', '') or ''}" if getattr(item, "height", None) not in (None, '', 0) else f"{getattr(item, 'width', '') or ''}"
+            wymiar = f"{format_number(item.width)} x {format_number(item.height)}" if item.height is not None else format_number(item.width)
             table.setItem(row_idx, 2, QTableWidgetItem(wymiar.strip()))
-            table.setItem(row_idx, 3, QTableWidgetItem(str(getattr(item, "ordered_quantity", "") or "")))
+            table.setItem(row_idx, 3, QTableWidgetItem(format_number(item.ordered_quantity)))
             table.setItem(row_idx, 4, QTableWidgetItem(str(getattr(item, "quantity_type", "") or "")))
-            table.setItem(row_idx, 5, QTableWidgetItem(str(getattr(item, "roll_length", "") or "")))
+            table.setItem(row_idx, 5, QTableWidgetItem(format_number(item.roll_length)))
             table.setItem(row_idx, 6, QTableWidgetItem(str(getattr(item, "core", "") or "")))
         table.verticalHeader().setVisible(False)
         table.setShowGrid(True)
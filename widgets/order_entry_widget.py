@@ -8,36 +8,17 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QDate
 from PySide6.QtGui import QFont, QFontMetrics, QColor, QPalette, QTextCharFormat
 from datetime import date
-from models.db import Session
+from models.db import session_scope
 from models.order import Order
 from models.client import Client
 from models.orderitem import OrderItem
 from models.order_sequence import get_next_order_number
+from models.production_summary import track_summary
+from utils.numbers import format_number, parse_number
 from widgets.clients_db_widget import ClientsDBWidget, ClientEditDialog
-
-HOLIDAYS_2025 = [
-    datetime.date(2025, 1, 1),
-    datetime.date(2025, 1, 6),
-    datetime.date(2025, 4, 20),
-    datetime.date(2025, 4, 21),
-    datetime.date(2025, 5, 1),
-    datetime.date(2025, 5, 3),
-    datetime.date(2025, 6, 8),
-    datetime.date(2025, 6, 19),
-    datetime.date(2025, 8, 15),
-    datetime.date(2025, 11, 1),
-    datetime.date(2025, 11, 11),
-    datetime.date(2025, 12, 24),
-    datetime.date(2025, 12, 25),
-    datetime.date(2025, 12, 26),
-]
-
-def is_polish_holiday(date_obj):
-    if date_obj in HOLIDAYS_2025:
-        return True
-    if date_obj.isoweekday() in (6, 7):
-        return True
-    return False
+from utils.rolls import roll_count, running_meters
+from widgets.delivery_planner import DeliveryPlanner
+from utils.holidays import is_workday
 
 BTN_GREEN = """
     QPushButton {
@@ -132,12 +113,12 @@ class ClientSelectDialog(QDialog):
         table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
         table.setStyleSheet("""
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background: #b3d8fd !important;
                 color: #003366 !important;
             }
         """)
-        table.itemDoubleClicked.connect(self._handle_choose)
+        table.doubleClicked.connect(self._handle_choose)
         self.choose_btn.clicked.connect(self._handle_choose)
         self.cancel_btn.clicked.connect(self.reject)
 
@@ -153,9 +134,10 @@ class ClientSelectDialog(QDialog):
     def adjust_table_size(self):
         table = self.clients_widget.table
         table.resizeColumnsToContents()
-        width = sum([table.columnWidth(i) for i in range(table.columnCount())]) + 120
+        model = table.model()
+        width = sum([table.columnWidth(i) for i in range(model.columnCount())]) + 120
         width = min(max(width, 1000), 2200)
-        visible_rows = min(table.rowCount(), 20)
+        visible_rows = min(model.rowCount(), 20)
         row_height = table.verticalHeader().defaultSectionSize()
         header_height = table.horizontalHeader().height()
         height = header_height + visible_rows * row_height + 240
@@ -195,7 +177,7 @@ class CustomCalendarWidget(QCalendarWidget):
             qdate = QDate(year, month, day)
             if qdate == selected_date:
                 self.setDateTextFormat(qdate, fmt_selected)
-            elif qdate.dayOfWeek() in (6, 7):
+            elif not is_workday(qdate.toPython()):
                 self.setDateTextFormat(qdate, fmt_weekend)
             else:
                 self.setDateTextFormat(qdate, fmt_default)
@@ -237,6 +219,8 @@ class OrderEntryWidget(QWidget):
         self.prod_fields = []
         self.prod_blocks = []
         self.selected_client = None
+        # Indeks obciążenia dni - budowany przy pierwszej podpowiedzi daty
+        self.delivery_planner = DeliveryPlanner(exclude_order_id=getattr(edit_order, "id", None))
         self.init_ui()
         if self.edit_order:
             self.fill_from_order(self.edit_order, as_new=False)
@@ -244,6 +228,7 @@ class OrderEntryWidget(QWidget):
             self.fill_from_order(self.copy_order, as_new=True)
         elif self.new_client:
             self.fill_from_client(self.new_client)
+        self.update_delivery_suggestion()
 
     def init_ui(self):
         layout = QVBoxLayout(self)
@@ -301,6 +286,18 @@ class OrderEntryWidget(QWidget):
         self.custom_calendar = CustomCalendarWidget()
         self.data_dostawy_edit.setCalendarWidget(self.custom_calendar)
         row1.addWidget(self.data_dostawy_edit)
+        row1.addSpacing(12)
+        self.delivery_hint_label = QLabel("")
+        self.delivery_hint_label.setFont(QFont("Segoe UI", 10))
+        row1.addWidget(self.delivery_hint_label)
+        self.btn_use_suggestion = QPushButton("Ustaw")
+        self.btn_use_suggestion.setStyleSheet(BTN_GREEN)
+        self.btn_use_suggestion.setToolTip("Ustaw sugerowaną datę wysyłki")
+        self.btn_use_suggestion.clicked.connect(self.use_suggested_delivery_date)
+        self.btn_use_suggestion.hide()
+        row1.addWidget(self.btn_use_suggestion)
+        self.suggested_delivery_date = None
+        self.data_dostawy_edit.dateChanged.connect(self.update_delivery_suggestion)
         row1.addStretch(1)
         self.form_layout.addLayout(row1)
 
@@ -574,24 +571,18 @@ class OrderEntryWidget(QWidget):
 
         def update_zam_rolki():
             try:
-                val_ilosc = float(ilosc.text().replace(",", ".") or "0")
-                val_nawoj = float(naw_dlug.text().replace(",", ".") or "0")
-                typ = typ_ilosci.currentText().strip()
-                if typ == "tyś.":
-                    if val_nawoj > 0 and val_ilosc > 0:
-                        dzielenie = (val_ilosc * 1000) / val_nawoj
-                        wynik = math.ceil(dzielenie)
-                        zam_rolki.setText(str(wynik))
-                    else:
-                        zam_rolki.setText("0")
-                else:  # typ == "rolek"
-                    zam_rolki.setText(ilosc.text())
-            except Exception:
+                rolki = roll_count(parse_number(ilosc.text()), typ_ilosci.currentText(),
+                                   parse_number(naw_dlug.text()))
+                zam_rolki.setText(format_number(rolki))
+            except ValueError:
                 zam_rolki.setText("0")
 
         ilosc.textChanged.connect(update_zam_rolki)
         naw_dlug.textChanged.connect(update_zam_rolki)
         typ_ilosci.currentIndexChanged.connect(update_zam_rolki)
+        for field in (ilosc, naw_dlug, wys):
+            field.textChanged.connect(self.update_delivery_suggestion)
+        typ_ilosci.currentIndexChanged.connect(self.update_delivery_suggestion)
 
         prod_dict = {
             "block_widget": prod_block,
@@ -622,6 +613,7 @@ class OrderEntryWidget(QWidget):
             block.setParent(None)
             block.deleteLater()
             self.relayout_prod_blocks()
+            self.update_delivery_suggestion()
 
     def relayout_prod_blocks(self):
         for i in reversed(range(self.prod_grid.count())):
@@ -634,16 +626,54 @@ class OrderEntryWidget(QWidget):
             col = idx % 2
             self.prod_grid.addWidget(block, row, col)
 
+    def form_running_meters(self):
+        """Metry bieżące wszystkich pozycji formularza; pola z błędną liczbą są pomijane."""
+        total = 0.0
+        for p in self.prod_fields:
+            try:
+                total += running_meters(
+                    parse_number(p["zam. ilość"].text()), p["Typ ilości"].currentText(),
+                    parse_number(p["nawój/długość"].text()), parse_number(p["Wysokość"].text()),
+                    self.delivery_planner.forecast_settings,
+                )
+            except ValueError:
+                continue
+        return total
+
+    def update_delivery_suggestion(self, *args):
+        planner = self.delivery_planner
+        planner.ensure_fresh()
+        meters = self.form_running_meters()
+        suggested = planner.suggest(meters)
+        self.suggested_delivery_date = suggested
+        qdate = self.data_dostawy_edit.date()
+        chosen = datetime.date(qdate.year(), qdate.month(), qdate.day())
+        load = planner.utilization(chosen, meters)
+        parts = [f"obciążenie dnia: {load:.0%}"]
+        if suggested is None:
+            parts.append("brak wolnego dnia w horyzoncie planu")
+        elif suggested != chosen:
+            parts.append(f"najwcześniej: {suggested:%d.%m.%Y}")
+        self.delivery_hint_label.setText(", ".join(parts))
+        self.delivery_hint_label.setStyleSheet(f"color: {'#c62828' if load > 1 else '#197a3d'};")
+        self.btn_use_suggestion.setVisible(suggested is not None and suggested != chosen)
+
+    def use_suggested_delivery_date(self):
+        if self.suggested_delivery_date:
+            self.data_dostawy_edit.setDate(QDate(
+                self.suggested_delivery_date.year, self.suggested_delivery_date.month,
+                self.suggested_delivery_date.day,
+            ))
+
     def handle_add_position(self):
         self.add_prod_block()
         self.prod_container.adjustSize()
         self.prod_container.updateGeometry()
 
     def fill_from_order(self, order, as_new=False):
-        session = Session()
-        client = session.query(Client).filter_by(id=order.client_id).first()
-        items = session.query(OrderItem).filter_by(order_id=order.id).all()
-        session.close()
+        with session_scope() as session:
+            client = session.query(Client).filter_by(id=order.client_id).first()
+            items = session.query(OrderItem).filter_by(order_id=order.id).all()
         if as_new:
             self.nr_edit.setText("")
         else:
@@ -680,8 +710,8 @@ class OrderEntryWidget(QWidget):
         for idx, item in enumerate(items):
             self.add_prod_block(idx+1)
             p = self.prod_fields[-1]
-            p["Szerokość"].setText(str(item.width))
-            p["Wysokość"].setText(str(item.height))
+            p["Szerokość"].setText(format_number(item.width))
+            p["Wysokość"].setText(format_number(item.height))
             if item.material in MATERIAL_OPTIONS:
                 p["Rodzaj materiału"].setCurrentText(item.material)
             else:
@@ -690,9 +720,9 @@ class OrderEntryWidget(QWidget):
                     p["Rodzaj materiału"].setCurrentIndex(idx_inny)
                     p["Rodzaj materiału"].setEditable(True)
                     p["Rodzaj materiału"].setCurrentText(item.material)
-            p["zam. ilość"].setText(str(item.ordered_quantity))
+            p["zam. ilość"].setText(format_number(item.ordered_quantity))
             p["Typ ilości"].setCurrentText(item.quantity_type)
-            p["nawój/długość"].setText(item.roll_length)
+            p["nawój/długość"].setText(format_number(item.roll_length))
             # obsługa "Rdzeń"
             if item.core and item.core not in RDZEN_OPTIONS:
                 idx_inny = p["Rdzeń"].findText("inny")
@@ -704,7 +734,7 @@ class OrderEntryWidget(QWidget):
                 p["Rdzeń"].setCurrentText(item.core or "")
                 p["Rdzeń_inny"].setVisible(False)
                 p["Rdzeń_inny"].setText("")
-            p["Cena"].setText(getattr(item, "price", "") or "")
+            p["Cena"].setText(format_number(getattr(item, "price", None)))
             if hasattr(item, "price_type"):
                 p["CenaTyp"].setCurrentText(item.price_type or "za 1 tyś")
 
@@ -734,19 +764,48 @@ class OrderEntryWidget(QWidget):
         dlg = ClientEditDialog(parent=self)
         if dlg.exec() == QDialog.Accepted:
             data = dlg.get_data()
-            session = Session()
-            client = Client(**data)
-            session.add(client)
-            session.commit()
+            with session_scope() as session:
+                client = Client(**data)
+                session.add(client)
+                session.flush()
+                session.refresh(client)
             if self.main_window and hasattr(self.main_window, "clients_db"):
                 try:
                     self.main_window.clients_db.refresh_clients()
                 except Exception:
                     pass
-            session.refresh(client)
-            session.close()
             self.fill_from_client(client)
 
+    def read_prod_values(self, p):
+        """Wartości pozycji z bloku produkcyjnego; błędna liczba zgłasza ValueError z nazwą pola."""
+        position = self.prod_fields.index(p) + 1
+        numbers = {}
+        for field, label in (("width", "Szerokość"), ("height", "Wysokość"),
+                             ("ordered_quantity", "zam. ilość"), ("roll_length", "nawój/długość"),
+                             ("price", "Cena")):
+            try:
+                numbers[field] = parse_number(p[label].text())
+            except ValueError:
+                raise ValueError(
+                    f"Pozycja {position}: pole \"{label}\" musi być liczbą (wpisano \"{p[label].text().strip()}\")."
+                )
+        try:
+            zam_rolki = int(math.ceil(parse_number(p["zam. rolki"].text()) or 0)) or None
+        except ValueError:
+            zam_rolki = None
+        if p["Rdzeń"].currentText() == "inny":
+            core_value = p["Rdzeń_inny"].text().strip()
+        else:
+            core_value = p["Rdzeń"].currentText().strip()
+        return dict(
+            numbers,
+            material=p["Rodzaj materiału"].currentText().strip(),
+            quantity_type=p["Typ ilości"].currentText().strip(),
+            core=core_value,
+            price_type=p["CenaTyp"].currentText().strip(),
+            zam_rolki=zam_rolki,
+        )
+
     def save_order(self):
         if not self.zamawiajacy_fields[0].text().strip():
             QMessageBox.warning(self, "Błąd", "Podaj nazwę firmy.")
@@ -761,7 +820,7 @@ class OrderEntryWidget(QWidget):
             delivery_date_qdate.month(),
             delivery_date_qdate.day()
         )
-        if is_polish_holiday(delivery_date):
+        if not is_workday(delivery_date):
             QMessageBox.information(
                 self,
                 "Uwaga! Dzień wolny od pracy",
@@ -771,6 +830,13 @@ class OrderEntryWidget(QWidget):
             )
             return
 
+        # Liczby sprawdzamy przed zapisem, żeby błąd nie zużył numeru zamówienia
+        try:
+            items_values = [self.read_prod_values(p) for p in self.prod_fields]
+        except ValueError as exc:
+            QMessageBox.warning(self, "Błędna wartość", str(exc))
+            return
+
         confirm = QMessageBox(self)
         confirm.setWindowTitle("Potwierdzenie zapisu")
         confirm.setText("Jesteś pewny, że chcesz zapisać zamówienie?")
@@ -789,58 +855,35 @@ class OrderEntryWidget(QWidget):
             order_date_qdate.day()
         )
 
-        session = Session()
-        if self.edit_order:
-            order = session.query(Order).get(self.edit_order.id)
-            if order is None:
-                QMessageBox.critical(self, "Błąd", "Nie znaleziono zamówienia w bazie.")
-                session.close()
-                return
-            order.order_date = order_date
-            order.delivery_date = delivery_date
-            order.notes = self.uwagi_textedit.toPlainText().strip()
-            order.client_id = self.selected_client.id
-            order.payment_term = self.termin_platnosci_combo.currentText()
-            session.query(OrderItem).filter_by(order_id=order.id).delete()
-        else:
-            order_number = get_next_order_number(session)
-            self.nr_edit.setText(order_number)
-            order = Order(
-                order_number=order_number,
-                order_date=order_date,
-                delivery_date=delivery_date,
-                notes=self.uwagi_textedit.toPlainText().strip(),
-                client_id=self.selected_client.id,
-                payment_term=self.termin_platnosci_combo.currentText()
-            )
-            session.add(order)
-            session.flush()
-
-        for p in self.prod_fields:
-            zam_rolki_val = p["zam. rolki"].text().strip()
-            try:
-                zam_rolki = int(zam_rolki_val) if zam_rolki_val else None
-            except Exception:
-                zam_rolki = None
-            if p["Rdzeń"].currentText() == "inny":
-                core_value = p["Rdzeń_inny"].text().strip()
+        with session_scope() as session, track_summary(session) as summary:
+            if self.edit_order:
+                order = session.query(Order).get(self.edit_order.id)
+                if order is None:
+                    QMessageBox.critical(self, "Błąd", "Nie znaleziono zamówienia w bazie.")
+                    return
+                summary.watch(order.id)
+                order.order_date = order_date
+                order.delivery_date = delivery_date
+                order.notes = self.uwagi_textedit.toPlainText().strip()
+                order.client_id = self.selected_client.id
+                order.payment_term = self.termin_platnosci_combo.currentText()
+                session.query(OrderItem).filter_by(order_id=order.id).delete()
             else:
-                core_value = p["Rdzeń"].currentText().strip()
-            item = OrderItem(
-                order_id=order.id,
-                width=p["Szerokość"].text().strip(),
-                height=p["Wysokość"].text().strip(),
-                material=p["Rodzaj materiału"].currentText().strip(),
-                ordered_quantity=p["zam. ilość"].text().strip(),
-                quantity_type=p["Typ ilości"].currentText().strip(),
-                roll_length=p["nawój/długość"].text().strip(),
-                core=core_value,
-                price=p["Cena"].text().strip(),
-                price_type=p["CenaTyp"].currentText().strip(),
-                zam_rolki=zam_rolki
-            )
-            session.add(item)
-        session.commit()
-        session.close()
+                order_number = get_next_order_number(session)
+                self.nr_edit.setText(order_number)
+                order = Order(
+                    order_number=order_number,
+                    order_date=order_date,
+                    delivery_date=delivery_date,
+                    notes=self.uwagi_textedit.toPlainText().strip(),
+                    client_id=self.selected_client.id,
+                    payment_term=self.termin_platnosci_combo.currentText()
+                )
+                session.add(order)
+                session.flush()
+                summary.watch(order.id)
+
+            for values in items_values:
+                session.add(OrderItem(order_id=order.id, **values))
         if self.after_save_callback:
             self.after_save_callback()
\ No newline at end of file
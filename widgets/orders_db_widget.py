@@ -1,20 +1,26 @@
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTableWidget, QTableWidgetItem,
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTableView,
     QHeaderView, QPushButton, QMessageBox, QSizePolicy, QDialog,
-    QAbstractItemView, QFrame, QScrollArea, QGroupBox, QGridLayout
+    QAbstractItemView, QScrollArea, QGroupBox, QGridLayout
 )
-from PySide6.QtGui import QFont, QColor, QDesktopServices
-from PySide6.QtCore import Qt, QSettings, QUrl
-import os
-from decimal import Decimal, InvalidOperation
+from PySide6.QtGui import QFont, QDesktopServices
+from PySide6.QtCore import Qt, QSettings, QThreadPool, QUrl
 
-from models.db import Session
+from models.db import session_scope
 from models.client import Client
 from models.order import Order
 from models.orderitem import OrderItem
+from models.order_queries import fetch_order_rows
+from models.notifications import record_change, ENTITY_ORDER
+from models.production_summary import track_summary
+from utils.numbers import format_number
 from widgets.order_details_dialog import OrderDetailsDialog
-from printing.order_confirmation import export_order_to_pdf
-from printing.production_ticket import export_production_ticket
+from widgets.orders_table_model import (
+    OrdersTableModel, MultiLineDelegate, PRICE_COLUMN, PRODUCTION_COLUMN, format_currency
+)
+from printing.batch_export import KIND_CONFIRMATION, KIND_PRODUCTION
+from widgets.batch_print_dialog import BatchPrintDialog
+from widgets.print_worker import PrintTask, SINGLE_PRINT_SETTINGS
 
 class OrdersDBWidget(QWidget):
     SETTINGS_ORG = "twoja_aplikacja"
@@ -28,6 +34,7 @@ class OrdersDBWidget(QWidget):
         self.show_order_entry_callback = show_order_entry_callback
         self.main_window = main_window
         self.selected_order_id = None
+        self._print_tasks = set()   # wydruki w tle - referencje do końca pracy
 
         layout = QVBoxLayout(self)
         title = QLabel("Baza zamówień")
@@ -86,29 +93,36 @@ class OrdersDBWidget(QWidget):
         self.button_print.setFont(QFont("Segoe UI", 13, QFont.Bold))
         self.button_print.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Fixed)
 
+        self.button_batch_print = QPushButton("Wydruk zbiorczy")
+        self.button_batch_print.setStyleSheet(self.button_orange)
+        self.button_batch_print.setFont(QFont("Segoe UI", 13, QFont.Bold))
+        self.button_batch_print.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Fixed)
+
         for button in (self.button_view, self.button_edit, self.button_copy, self.button_delete, self.button_print):
             button.setEnabled(False)
             button.setMinimumWidth(button.sizeHint().width() + 18)
             buttons_row.addWidget(button)
+        self.button_batch_print.setMinimumWidth(self.button_batch_print.sizeHint().width() + 18)
+        buttons_row.addWidget(self.button_batch_print)
         buttons_row.addStretch(1)
         layout.addLayout(buttons_row)
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(10)
-        self.table.setHorizontalHeaderLabels([
-            "Nr zamówienia", "Data zamówienia", "Data wysyłki",
-            "Klient", "Telefon", "Miasto", "Termin płatności", "Cena", "Dane produkcji", "Uwagi"
-        ])
+        self.model = OrdersTableModel(self._fetch_orders_page, self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setItemDelegateForColumn(PRICE_COLUMN, MultiLineDelegate(parent=self.table))
+        self.table.setItemDelegateForColumn(PRODUCTION_COLUMN, MultiLineDelegate(separators=True, parent=self.table))
         self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setWordWrap(False)
         self.table.verticalHeader().setVisible(False)
         self.table.setFont(QFont("Segoe UI", 11))
         self.table.horizontalHeader().setFont(QFont("Segoe UI", 11, QFont.Bold))
         self.table.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
-        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.table.setStyleSheet("""
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background: #409cff;
                 color: white;
             }
@@ -116,12 +130,16 @@ class OrdersDBWidget(QWidget):
 
         layout.addWidget(self.table, stretch=1)
 
-        self.table.itemSelectionChanged.connect(self.handle_selection)
+        self.model.rowsInserted.connect(self._apply_row_heights)
+        self.model.modelReset.connect(self._apply_row_heights)
+        self.model.dataChanged.connect(self._on_rows_changed)
+        self.table.selectionModel().selectionChanged.connect(self.handle_selection)
         self.button_view.clicked.connect(self.view_selected_order)
         self.button_edit.clicked.connect(self.edit_selected_order)
         self.button_copy.clicked.connect(self.copy_selected_order)
         self.button_delete.clicked.connect(self.delete_selected_order)
         self.button_print.clicked.connect(self.show_print_dialog)
+        self.button_batch_print.clicked.connect(self.show_batch_print_dialog)
 
         self.setMinimumSize(1200, 700)
         self.resize(1400, 800)
@@ -141,13 +159,13 @@ class OrdersDBWidget(QWidget):
 
     def save_column_widths(self):
         settings = QSettings(self.SETTINGS_ORG, self.SETTINGS_APP)
-        widths = [self.table.columnWidth(i) for i in range(self.table.columnCount())]
+        widths = [self.table.columnWidth(i) for i in range(self.model.columnCount())]
         settings.setValue(self.SETTINGS_COLUMNS, widths)
 
     def restore_column_widths(self):
         settings = QSettings(self.SETTINGS_ORG, self.SETTINGS_APP)
         widths = settings.value(self.SETTINGS_COLUMNS)
-        if widths and len(widths) == self.table.columnCount():
+        if widths and len(widths) == self.model.columnCount():
             for i, width in enumerate(widths):
                 try:
                     self.table.setColumnWidth(i, int(width))
@@ -155,139 +173,10 @@ class OrdersDBWidget(QWidget):
                     pass
 
     def format_currency(self, value):
-        try:
-            d = Decimal(str(value).replace(',', '.'))
-        except (InvalidOperation, TypeError):
-            return str(value)
-        return f"{d:,.2f} zł".replace(',', ' ').replace('.', ',')
+        return format_currency(value)
 
     def refresh_orders(self):
-        session = Session()
-        def safe_order_number(order):
-            try:
-                return int(order.order_number)
-            except Exception:
-                return order.order_number or ""
-        orders = session.query(Order).all()
-        orders = sorted(orders, key=safe_order_number)
-
-        self.table.setRowCount(0)
-        for row_index, order in enumerate(orders):
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-            client = session.query(Client).filter_by(id=order.client_id).first()
-            items = session.query(OrderItem).filter_by(order_id=order.id).all()
-            production_items = [
-                (item, index) for index, item in enumerate(items)
-                if item.width is not None and str(item.width).strip() != ""
-            ]
-
-            order_number_item = QTableWidgetItem(order.order_number or "")
-            order_number_item.setFont(QFont("Segoe UI", 10, QFont.Bold))
-            self.table.setItem(row, 0, order_number_item)
-
-            order_date_item = QTableWidgetItem(order.order_date.strftime("%Y-%m-%d") if order.order_date else "")
-            order_date_item.setFont(QFont("Segoe UI", 10))
-            self.table.setItem(row, 1, order_date_item)
-
-            delivery_date_item = QTableWidgetItem(order.delivery_date.strftime("%Y-%m-%d") if order.delivery_date else "")
-            delivery_date_item.setFont(QFont("Segoe UI", 10))
-            self.table.setItem(row, 2, delivery_date_item)
-
-            client_name_item = QTableWidgetItem(client.name if client else "")
-            client_name_item.setFont(QFont("Segoe UI", 10))
-            self.table.setItem(row, 3, client_name_item)
-
-            client_phone_item = QTableWidgetItem(client.phone if client else "")
-            client_phone_item.setFont(QFont("Segoe UI", 10))
-            self.table.setItem(row, 4, client_phone_item)
-
-            client_city_item = QTableWidgetItem(client.city if client else "")
-            client_city_item.setFont(QFont("Segoe UI", 10))
-            self.table.setItem(row, 5, client_city_item)
-
-            payment_term = getattr(order, "payment_term", None)
-            if not payment_term and items:
-                payment_term = getattr(items[0], "payment_term", None)
-            if not payment_term:
-                payment_term = ""
-            payment_term_item = QTableWidgetItem(payment_term)
-            payment_term_item.setFont(QFont("Segoe UI", 10))
-            self.table.setItem(row, 6, payment_term_item)
-
-            # Cena - obsługa wielu pozycji, wartości walutowe
-            if production_items:
-                price_lines = []
-                for item, _ in production_items:
-                    width = str(getattr(item, "width", "") or "")
-                    height = str(getattr(item, "height", "") or "")
-                    price = getattr(item, "price", "")
-                    price_type = getattr(item, "price_type", "")
-                    if price:
-                        prefix = f"{width}x{height}/"
-                        formatted_price = self.format_currency(price)
-                        if "rolk" in (price_type or "").lower():
-                            price_line = f"{prefix}{formatted_price} /rolkę"
-                        else:
-                            price_line = f"{prefix}{formatted_price} /tyś."
-                        price_lines.append(price_line)
-                price_display = "\n".join(price_lines)
-            else:
-                price_display = ""
-            price_item = QTableWidgetItem(price_display)
-            price_item.setFont(QFont("Segoe UI", 10))
-            price_item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-            self.table.setItem(row, 7, price_item)
-
-            def format_prod(item):
-                # Zamiana zam.tyś na zam. rolki
-                return (
-                    f"{item.material}, {item.width}x{item.height} mm, {item.ordered_quantity} {item.quantity_type}, "
-                    f"nawój: {item.roll_length}, rdzeń: {item.core}, "
-                    f"cena: {item.price} {item.price_type}, "
-                    f"zam. rolki: {getattr(item, 'zam_rolki', '')}"
-                )
-            prod_col = 8
-            if len(production_items) == 0:
-                production_label = QLabel("Brak pozycji")
-                production_label.setFont(QFont("Segoe UI", 10))
-                self.table.setCellWidget(row, prod_col, production_label)
-                self.table.setRowHeight(row, 28)
-            else:
-                production_widget = QWidget()
-                production_layout = QVBoxLayout(production_widget)
-                production_layout.setContentsMargins(0, 0, 0, 0)
-                production_layout.setSpacing(0)
-                height_per_row = 20
-                total_prod_rows = 0
-                for (item, index) in production_items:
-                    label = QLabel(f"{index+1}. {format_prod(item)}")
-                    label.setFont(QFont("Segoe UI", 10))
-                    production_layout.addWidget(label)
-                    total_prod_rows += 1
-                    if index < len(production_items)-1:
-                        separator = QFrame()
-                        separator.setFrameShape(QFrame.HLine)
-                        separator.setFrameShadow(QFrame.Sunken)
-                        separator.setStyleSheet("color: #e0e0e0;")
-                        production_layout.addWidget(separator)
-                        total_prod_rows += 1
-                self.table.setCellWidget(row, prod_col, production_widget)
-                self.table.setRowHeight(row, max(28, total_prod_rows * height_per_row))
-
-            notes_item = QTableWidgetItem(order.notes or "")
-            notes_item.setFont(QFont("Segoe UI", 10))
-            self.table.setItem(row, 9, notes_item)
-
-            base_background = "#ffffff" if row_index % 2 == 0 else "#f2f2f2"
-            for column in range(self.table.columnCount()):
-                item = self.table.item(row, column)
-                if item:
-                    item.setBackground(QColor(base_background))
-            cell_widget = self.table.cellWidget(row, prod_col)
-            if cell_widget:
-                cell_widget.setStyleSheet(f"background: {base_background};")
-        session.close()
+        self.model.reload()
         self.button_view.setEnabled(False)
         self.button_edit.setEnabled(False)
         self.button_copy.setEnabled(False)
@@ -297,8 +186,35 @@ class OrdersDBWidget(QWidget):
         self.table.clearSelection()
         self.highlight_selected_row()
 
-    def handle_selection(self):
-        selected = self.table.selectedItems()
+    def _fetch_orders_page(self, offset, limit):
+        with session_scope() as session:
+            return fetch_order_rows(session, offset=offset, limit=limit)
+
+    def _apply_row_heights(self, parent=None, first=0, last=None):
+        if last is None:
+            last = self.model.rowCount() - 1
+        for row in range(first, last + 1):
+            self.table.setRowHeight(row, self.model.row_height(row))
+
+    def _on_rows_changed(self, top_left, bottom_right, roles=None):
+        self._apply_row_heights(None, top_left.row(), bottom_right.row())
+
+    def on_orders_changed(self, order_ids):
+        """Zmiana zamówień (także z innego stanowiska) - odświeżenie tylko tych wierszy."""
+        order_ids = set(order_ids)
+        if not order_ids:
+            return
+        with session_scope() as session:
+            rows = fetch_order_rows(session, order_ids=order_ids)
+        removed = order_ids - {row["id"] for row in rows}
+        self.model.apply_changes(rows, removed)
+
+    def on_clients_changed(self, client_ids):
+        # Nazwa, telefon i miasto klienta są kolumnami listy zamówień
+        self.on_orders_changed(self.model.order_ids_for_clients(set(client_ids)))
+
+    def handle_selection(self, *args):
+        selected = self.table.selectionModel().selectedRows()
         if not selected:
             self.button_view.setEnabled(False)
             self.button_edit.setEnabled(False)
@@ -309,12 +225,7 @@ class OrdersDBWidget(QWidget):
             self.table.clearSelection()
             self.highlight_selected_row()
             return
-        row = self.table.currentRow()
-        order_number = self.table.item(row, 0).text()
-        session = Session()
-        order = session.query(Order).filter_by(order_number=order_number).first()
-        self.selected_order_id = order.id if order else None
-        session.close()
+        self.selected_order_id = self.model.order_id(selected[0].row())
         if self.selected_order_id:
             self.button_view.setEnabled(True)
             self.button_edit.setEnabled(True)
@@ -332,13 +243,15 @@ class OrdersDBWidget(QWidget):
     def highlight_selected_row(self):
         pass
 
+    def selected_order_ids(self):
+        rows = sorted(index.row() for index in self.table.selectionModel().selectedRows())
+        return [order_id for order_id in (self.model.order_id(row) for row in rows) if order_id]
+
     def get_selected_order(self):
         if not self.selected_order_id:
             return None
-        session = Session()
-        order = session.query(Order).filter_by(id=self.selected_order_id).first()
-        session.close()
-        return order
+        with session_scope() as session:
+            return session.query(Order).filter_by(id=self.selected_order_id).first()
 
     def view_selected_order(self):
         order = self.get_selected_order()
@@ -456,24 +369,21 @@ class OrdersDBWidget(QWidget):
         order = self.get_selected_order()
         if not order:
             return
-        session = Session()
         result = QMessageBox.question(self, "Potwierdź usunięcie", f"Czy na pewno usunąć zamówienie nr {order.order_number}?", QMessageBox.Yes | QMessageBox.No)
         if result != QMessageBox.Yes:
-            session.close()
             return
-        session.query(OrderItem).filter_by(order_id=order.id).delete()
-        session.delete(order)
-        session.commit()
-        session.close()
+        with session_scope() as session, track_summary(session, order.id):
+            session.query(OrderItem).filter_by(order_id=order.id).delete()
+            session.query(Order).filter_by(id=order.id).delete()
+            record_change(session, ENTITY_ORDER, [order.id])
         self.refresh_orders()
         if self.refresh_dashboard_callback:
             self.refresh_dashboard_callback()
 
     def show_order_dialog_v4(self, order):
-        session = Session()
-        client = session.query(Client).filter_by(id=order.client_id).first()
-        items = session.query(OrderItem).filter_by(order_id=order.id).all()
-        session.close()
+        with session_scope() as session:
+            client = session.query(Client).filter_by(id=order.client_id).first()
+            items = session.query(OrderItem).filter_by(order_id=order.id).all()
         dialog = QDialog(self)
         dialog.setWindowTitle(f"Podgląd zamówienia {order.order_number}")
         dialog.resize(900, 700)
@@ -503,14 +413,14 @@ class OrdersDBWidget(QWidget):
         production_layout = QVBoxLayout(groupbox_production)
         any_row = False
         for index, item in enumerate(items):
-            if not item.width or str(item.width).strip() == "":
+            if item.width is None:
                 continue
             # Zamiana zam.tyś na zam. rolki
             label = QLabel(
-                f"{index+1}. Szer: {item.width} mm, Wys: {item.height} mm, "
-                f"Materiał: {item.material}, Ilość: {item.ordered_quantity} {item.quantity_type}, "
-                f"Nawój: {item.roll_length}, Rdzeń: {item.core}, "
-                f"Cena: {item.price} {item.price_type}, Zam. rolki: {getattr(item, 'zam_rolki', '')}"
+                f"{index+1}. Szer: {format_number(item.width)} mm, Wys: {format_number(item.height)} mm, "
+                f"Materiał: {item.material}, Ilość: {format_number(item.ordered_quantity)} {item.quantity_type}, "
+                f"Nawój: {format_number(item.roll_length)}, Rdzeń: {item.core}, "
+                f"Cena: {format_number(item.price)} {item.price_type}, Zam. rolki: {format_number(item.zam_rolki)}"
             )
             label.setFont(QFont("Segoe UI", 11))
             production_layout.addWidget(label)
@@ -576,45 +486,32 @@ class OrdersDBWidget(QWidget):
         dialog.exec()
 
     def print_for_client(self):
-        order = self.get_selected_order()
-        if not order:
-            QMessageBox.warning(self, "Brak zamówienia", "Nie wybrano zamówienia do wydruku.")
-            return
-        session = Session()
-        client = session.query(Client).filter_by(id=order.client_id).first()
-        items = session.query(OrderItem).filter_by(order_id=order.id).all()
-        session.close()
-        output_dir = r"c:\potwierdzenia dla klienta"
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir, exist_ok=True)
-        safe_name = "".join(c if c.isalnum() or c in "._-" else "_" for c in client.name)
-        safe_order = "".join(c for c in str(order.order_number) if c.isalnum() or c in "._-")
-        filename = f"{safe_order}_{safe_name}.pdf"
-        output_path = os.path.join(output_dir, filename)
-        try:
-            export_order_to_pdf(order, client, items, output_path)
-            QDesktopServices.openUrl(QUrl.fromLocalFile(output_path))
-        except Exception as e:
-            QMessageBox.critical(self, "Błąd PDF", f"Wystąpił błąd podczas generowania PDF:\n{e}")
+        self.print_selected_order(KIND_CONFIRMATION)
 
     def print_for_production(self):
-        order = self.get_selected_order()
-        if not order:
+        self.print_selected_order(KIND_PRODUCTION)
+
+    def print_selected_order(self, kind):
+        """Odczyt, render i zapis PDF w tle - podgląd otwiera się po zakończeniu."""
+        if not self.selected_order_id:
             QMessageBox.warning(self, "Brak zamówienia", "Nie wybrano zamówienia do wydruku.")
             return
-        session = Session()
-        client = session.query(Client).filter_by(id=order.client_id).first()
-        items = session.query(OrderItem).filter_by(order_id=order.id).all()
-        session.close()
-        output_dir = r"c:\produkcja"
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir, exist_ok=True)
-        safe_name = "".join(c if c.isalnum() or c in "._-" else "_" for c in client.name)
-        safe_order = "".join(c for c in str(order.order_number) if c.isalnum() or c in "._-")
-        filename = f"{safe_order}_{safe_name}_PRODUKCJA.pdf"
-        output_path = os.path.join(output_dir, filename)
-        try:
-            export_production_ticket(order, client, items, output_path)
-            QDesktopServices.openUrl(QUrl.fromLocalFile(output_path))
-        except Exception as e:
-            QMessageBox.critical(self, "Błąd PDF", f"Wystąpił błąd podczas generowania PDF:\n{e}")
\ No newline at end of file
+        task = PrintTask(kind, order_ids=[self.selected_order_id], settings=SINGLE_PRINT_SETTINGS)
+        task.signals.finished.connect(lambda paths: self._on_print_finished(task, paths))
+        task.signals.failed.connect(lambda message: self._on_print_failed(task, message))
+        self._print_tasks.add(task)
+        QThreadPool.globalInstance().start(task)
+
+    def _on_print_finished(self, task, paths):
+        self._print_tasks.discard(task)
+        if not paths:
+            QMessageBox.warning(self, "Brak zamówienia", "Zamówienie nie istnieje.")
+            return
+        QDesktopServices.openUrl(QUrl.fromLocalFile(paths[0]))
+
+    def _on_print_failed(self, task, message):
+        self._print_tasks.discard(task)
+        QMessageBox.critical(self, "Błąd PDF", f"Wystąpił błąd podczas generowania PDF:\n{message}")
+
+    def show_batch_print_dialog(self):
+        BatchPrintDialog(self.selected_order_ids(), self).exec()
@@ -0,0 +1,220 @@
+from PySide6.QtWidgets import QStyledItemDelegate, QStyle, QStyleOptionViewItem
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QRect
+from PySide6.QtGui import QFont, QColor, QBrush, QPen
+from widgets.incremental_rows import IncrementalRowsMixin
+from utils.numbers import format_number, split_number
+
+ORDER_HEADERS = [
+    "Nr zamówienia", "Data zamówienia", "Data wysyłki",
+    "Klient", "Telefon", "Miasto", "Termin płatności", "Cena", "Dane produkcji", "Uwagi"
+]
+PRICE_COLUMN = 7
+PRODUCTION_COLUMN = 8
+
+# Rola z listą linii dla kolumn wielowierszowych (cena, dane produkcji)
+LinesRole = Qt.UserRole + 1
+OrderIdRole = Qt.UserRole + 2
+
+# Role jako stałe modułu - odwołanie do Qt.* w data() jest kosztowne przy tysiącach wywołań
+DISPLAY_ROLE = Qt.DisplayRole
+FONT_ROLE = Qt.FontRole
+BACKGROUND_ROLE = Qt.BackgroundRole
+ALIGNMENT_ROLE = Qt.TextAlignmentRole
+ALIGN_LEFT_VCENTER = int(Qt.AlignLeft | Qt.AlignVCenter)
+
+LINE_HEIGHT = 20
+MIN_ROW_HEIGHT = 28
+
+def format_currency(value):
+    d, rest = split_number(value)
+    if d is None or rest:
+        return str(value)
+    return f"{d:,.2f} zł".replace(',', ' ').replace('.', ',')
+
+def format_date(value):
+    return value.strftime("%Y-%m-%d") if value else ""
+
+def production_items(items):
+    """Tylko pozycje z wypełnioną szerokością, razem z numerem pozycji w zamówieniu."""
+    return [
+        (item, index) for index, item in enumerate(items)
+        if item.get("width") is not None
+    ]
+
+def price_lines(prod_items):
+    lines = []
+    for item, _ in prod_items:
+        price = item.get("price")
+        if not price:
+            continue
+        prefix = f"{format_number(item.get('width'))}x{format_number(item.get('height'))}/"
+        formatted_price = format_currency(price)
+        if "rolk" in (item.get("price_type") or "").lower():
+            lines.append(f"{prefix}{formatted_price} /rolkę")
+        else:
+            lines.append(f"{prefix}{formatted_price} /tyś.")
+    return lines
+
+def production_lines(prod_items):
+    # Zamiana zam.tyś na zam. rolki
+    return [
+        f"{index+1}. {item.get('material')}, "
+        f"{format_number(item.get('width'))}x{format_number(item.get('height'))} mm, "
+        f"{format_number(item.get('ordered_quantity'))} {item.get('quantity_type')}, "
+        f"nawój: {format_number(item.get('roll_length'))}, rdzeń: {item.get('core')}, "
+        f"cena: {format_number(item.get('price'))} {item.get('price_type')}, "
+        f"zam. rolki: {item.get('zam_rolki') if item.get('zam_rolki') is not None else ''}"
+        for item, index in prod_items
+    ]
+
+class OrdersTableModel(IncrementalRowsMixin, QAbstractTableModel):
+    """
+    Model listy zamówień. Wiersze dociągane są porcjami przez fetch_page(offset, limit),
+    więc widok pobiera i formatuje tylko to, co użytkownik faktycznie przewinie.
+    """
+    BATCH_SIZE = 200
+
+    def __init__(self, fetch_page, parent=None):
+        super().__init__(parent)
+        self._fetch_page = fetch_page
+        self._rows = []
+        self._exhausted = False
+        # Czcionki i pędzle tworzone raz, a nie dla każdej komórki
+        self._font = QFont("Segoe UI", 10)
+        self._font_bold = QFont("Segoe UI", 10, QFont.Bold)
+        self._row_brushes = (QBrush(QColor("#ffffff")), QBrush(QColor("#f2f2f2")))
+
+    def reload(self):
+        self.beginResetModel()
+        self._rows = []
+        self._exhausted = False
+        self.endResetModel()
+        if self.canFetchMore(QModelIndex()):
+            self.fetchMore(QModelIndex())
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(ORDER_HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return ORDER_HEADERS[section]
+        return None
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent):
+        if parent.isValid() or self._exhausted:
+            return
+        page = self._fetch_page(len(self._rows), self.BATCH_SIZE)
+        if len(page) < self.BATCH_SIZE:
+            self._exhausted = True
+        if not page:
+            return
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(page) - 1)
+        self._rows.extend(self._build_row(raw) for raw in page)
+        self.endInsertRows()
+
+    def _build_row(self, raw):
+        """Formatowanie wiersza raz, przy wczytaniu - data() tylko zwraca gotowe wartości."""
+        prod_items = production_items(raw.get("items") or [])
+        prices = price_lines(prod_items)
+        production = production_lines(prod_items) or ["Brak pozycji"]
+        cells = [
+            raw.get("order_number") or "",
+            format_date(raw.get("order_date")),
+            format_date(raw.get("delivery_date")),
+            raw.get("client_name") or "",
+            raw.get("client_phone") or "",
+            raw.get("client_city") or "",
+            raw.get("payment_term") or "",
+            "\n".join(prices),
+            "\n".join(production),
+            raw.get("notes") or "",
+        ]
+        return {
+            "id": raw.get("id"),
+            "key": (raw.get("order_number") or "", raw.get("id")),  # ta sama kolejność co w fetch_order_rows
+            "client_id": raw.get("client_id"),
+            "cells": cells,
+            "lines": {PRICE_COLUMN: prices, PRODUCTION_COLUMN: production},
+        }
+
+    _make_row = _build_row
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        col = index.column()
+        if role == DISPLAY_ROLE:
+            return row["cells"][col]
+        if role == FONT_ROLE:
+            return self._font_bold if col == 0 else self._font
+        if role == BACKGROUND_ROLE:
+            return self._row_brushes[index.row() % 2]
+        if role == ALIGNMENT_ROLE:
+            return ALIGN_LEFT_VCENTER
+        if role == LinesRole:
+            return row["lines"].get(col)
+        if role == OrderIdRole:
+            return row["id"]
+        return None
+
+    def order_id(self, row):
+        if 0 <= row < len(self._rows):
+            return self._rows[row]["id"]
+        return None
+
+    def order_ids_for_clients(self, client_ids):
+        return {row["id"] for row in self._rows if row["client_id"] in client_ids}
+
+    def row_height(self, row):
+        lines = self._rows[row]["lines"]
+        total = max(len(lines[PRODUCTION_COLUMN]), len(lines[PRICE_COLUMN]))
+        return max(MIN_ROW_HEIGHT, total * LINE_HEIGHT + 4)
+
+class MultiLineDelegate(QStyledItemDelegate):
+    """Rysuje komórkę z listą linii (cena, dane produkcji) bez widgetów w komórkach."""
+
+    def __init__(self, separators=False, parent=None):
+        super().__init__(parent)
+        self.separators = separators
+        self._separator_pen = QPen(QColor("#e0e0e0"))
+
+    def paint(self, painter, option, index):
+        lines = index.data(LinesRole)
+        if lines is None:
+            return super().paint(painter, option, index)
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.text = ""
+        widget = option.widget
+        style = widget.style() if widget else None
+        if style:
+            # tło wiersza i zaznaczenie zgodnie ze stylem widoku
+            style.drawControl(QStyle.CE_ItemViewItem, opt, painter, widget)
+        painter.save()
+        painter.setFont(opt.font)
+        if option.state & QStyle.State_Selected:
+            painter.setPen(option.palette.highlightedText().color())
+        else:
+            painter.setPen(option.palette.text().color())
+        rect = option.rect.adjusted(4, 0, -4, 0)
+        y = rect.top() + max(0, (rect.height() - LINE_HEIGHT * len(lines)) // 2)
+        metrics = painter.fontMetrics()
+        text_pen = painter.pen()
+        for i, line in enumerate(lines):
+            line_rect = QRect(rect.left(), y, rect.width(), LINE_HEIGHT)
+            painter.drawText(line_rect, Qt.AlignLeft | Qt.AlignVCenter,
+                             metrics.elidedText(line, Qt.ElideRight, rect.width()))
+            y += LINE_HEIGHT
+            if self.separators and i < len(lines) - 1:
+                painter.setPen(self._separator_pen)
+                painter.drawLine(rect.left(), y, rect.right(), y)
+                painter.setPen(text_pen)
+        painter.restore()
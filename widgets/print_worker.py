@@ -0,0 +1,59 @@
+import threading
+from PySide6.QtCore import QObject, QRunnable, Signal
+from models.db import session_scope
+from models.order_queries import fetch_print_snapshots
+from printing.batch_export import export_batch
+
+SINGLE_PRINT_SETTINGS = {"workers": 1, "parallel_min_orders": 4}   # jedno zamówienie - bez procesów
+
+class _PrintSignals(QObject):
+    progress = Signal(int, int)    # (gotowe zamówienia, wszystkie)
+    finished = Signal(object)      # lista ścieżek PDF
+    cancelled = Signal(object)     # ścieżki plików zapisanych przed przerwaniem
+    failed = Signal(str)           # komunikat błędu
+
+class PrintTask(QRunnable):
+    """
+    Wydruk w wątku z puli: odczyt zamówień z bazy, render PDF i zapis plików - GUI
+    nie czeka. Wynik i błędy wracają sygnałami, podgląd otwiera GUI po finished.
+    """
+
+    def __init__(self, kind, order_ids=None, date_from=None, date_to=None, merged=False,
+                 output_dir=None, merged_filename=None, settings=None):
+        super().__init__()
+        self.kind = kind
+        self.order_ids = order_ids
+        self.date_from = date_from
+        self.date_to = date_to
+        self.merged = merged
+        self.output_dir = output_dir
+        self.merged_filename = merged_filename
+        self.settings = settings
+        self.signals = _PrintSignals()
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """Przerwanie po bieżącym zamówieniu (wywoływane z GUI)."""
+        self._cancel.set()
+
+    def load_jobs(self):
+        with session_scope() as session:
+            return fetch_print_snapshots(
+                session, order_ids=self.order_ids, date_from=self.date_from, date_to=self.date_to
+            )
+
+    def run(self):
+        try:
+            jobs = self.load_jobs()
+            paths = [] if self._cancel.is_set() else export_batch(
+                jobs, self.kind, merged=self.merged, output_dir=self.output_dir,
+                merged_filename=self.merged_filename, settings=self.settings, open_viewer=False,
+                progress=self.signals.progress.emit, is_cancelled=self._cancel.is_set,
+            )
+        except Exception as exc:
+            self.signals.failed.emit(str(exc))
+            return
+        if self._cancel.is_set():
+            self.signals.cancelled.emit(paths)
+        else:
+            self.signals.finished.emit(paths)
@@ -0,0 +1,152 @@
+# widgets/production_pivot.py
+# Przekroje zestawienia produkcji (tydzień × materiał, materiał × rdzeń, ...) z sumami
+# częściowymi. Dane pobierane są z bazy raz (models.production_summary.production_facts_query),
+# a zmiana przekroju i zawężanie (drill-down) liczą się w pamięci na tablicach NumPy.
+from collections import namedtuple
+import numpy as np
+from models.db import session_scope
+from models.production_summary import production_facts_query
+from utils.numbers import format_number
+
+# Wymiary przekrojów: nazwa -> nagłówek kolumny
+DIMENSIONS = {
+    "week": "Rok / tydzień",
+    "material": "Materiał",
+    "core": "Rdzeń",
+    "roll_length": "Nawój",
+    "client": "Klient",
+    "size": "Wymiar [mm]",
+}
+
+# Przekroje do wyboru w oknie zestawienia
+PIVOTS = [
+    ("Tydzień × materiał", ("week", "material")),
+    ("Materiał × rdzeń", ("material", "core")),
+    ("Materiał × nawój", ("material", "roll_length")),
+    ("Klient × tydzień", ("client", "week")),
+]
+
+# Kolejność, w jakiej drill-down rozwija kolejne wymiary
+DRILL_ORDER = ("week", "material", "client", "core", "roll_length", "size")
+
+# level: liczba wymiarów w kluczu (len(dims) - szczegół, mniej - suma częściowa, 0 - razem)
+PivotRow = namedtuple("PivotRow", "level key quantity")
+
+def _sort_key(value):
+    return (value is None, value if value is not None else 0)
+
+def format_label(dimension, value):
+    if value is None:
+        return "(brak)"
+    if dimension == "week":
+        return f"{value[0]} / {value[1]:02d}"
+    if dimension == "size":
+        width, height = value
+        return f"{format_number(width)} x {format_number(height)}" if height is not None else format_number(width)
+    if dimension == "roll_length":
+        return format_number(value)
+    return str(value)
+
+def _fact_values(row):
+    return {
+        "week": (row.year, row.week),
+        "material": row.material or None,
+        "core": row.core or None,
+        "roll_length": row.roll_length,
+        "client": row.client or None,
+        "size": (row.width, row.height),
+    }
+
+class ProductionFacts:
+    """
+    Wiersze faktów zakodowane per wymiar: codes[wymiar][i] to indeks etykiety
+    w labels[wymiar] (etykiety posortowane, więc porządek kodów = porządek etykiet).
+    """
+
+    def __init__(self, labels, codes, quantity):
+        self.labels = labels
+        self.codes = codes
+        self.quantity = quantity
+
+    @classmethod
+    def from_rows(cls, rows):
+        values = [_fact_values(row) for row in rows]
+        quantity = [float(row.quantity or 0) for row in rows]
+        labels, codes = {}, {}
+        for dimension in DIMENSIONS:
+            column = [v[dimension] for v in values]
+            labels[dimension] = sorted(set(column), key=_sort_key_for(dimension))
+            index = {label: i for i, label in enumerate(labels[dimension])}
+            codes[dimension] = np.asarray([index[label] for label in column], dtype=np.int64)
+        return cls(labels, codes, np.asarray(quantity, dtype=float))
+
+    def __len__(self):
+        return len(self.quantity)
+
+    def filtered(self, **selected):
+        """Drill-down: tylko fakty, w których wymiary mają wskazane etykiety."""
+        wanted = {d: self.labels[d].index(v) for d, v in selected.items() if v in self.labels[d]}
+        if len(wanted) < len(selected):
+            return ProductionFacts(self.labels, {d: c[:0] for d, c in self.codes.items()}, self.quantity[:0])
+        mask = np.ones(len(self), dtype=bool)
+        for dimension, code in wanted.items():
+            mask &= self.codes[dimension] == code
+        return ProductionFacts(self.labels, {d: c[mask] for d, c in self.codes.items()}, self.quantity[mask])
+
+    def _group_sums(self, dims):
+        """{krotka kodów: suma} dla grupowania po dims, posortowane po kodach."""
+        if not dims:
+            return {(): float(self.quantity.sum())}
+        if not len(self):
+            return {}
+        sizes = [len(self.labels[d]) for d in dims]
+        flat = np.ravel_multi_index([self.codes[d] for d in dims], sizes)
+        groups, inverse = np.unique(flat, return_inverse=True)
+        sums = np.bincount(inverse, weights=self.quantity)
+        keys = zip(*(k.tolist() for k in np.unravel_index(groups, sizes)))
+        return dict(zip(keys, sums.tolist()))
+
+    def rollup(self, dims):
+        """
+        Jak ROLLUP(dims) w SQL: wiersze szczegółowe, pod każdą grupą suma częściowa
+        (dla kolejnych prefiksów dims) i na końcu suma całkowita.
+        """
+        dims = tuple(dims)
+        levels = [self._group_sums(dims[:n]) for n in range(len(dims) + 1)]
+        result = []
+        previous = None
+        for key, quantity in levels[-1].items():
+            if previous is not None:
+                result.extend(self._closed_subtotals(dims, levels, previous, key))
+            result.append(PivotRow(len(dims), self._labels_for(dims, key), quantity))
+            previous = key
+        if previous is not None:
+            result.extend(self._closed_subtotals(dims, levels, previous, None))
+        result.append(PivotRow(0, (), levels[0][()]))
+        return result
+
+    def _closed_subtotals(self, dims, levels, previous, current):
+        # sumy dla prefiksów, które kończą się między previous a current (od najgłębszego)
+        rows = []
+        for n in range(len(dims) - 1, 0, -1):
+            if current is not None and previous[:n] == current[:n]:
+                break
+            rows.append(PivotRow(n, self._labels_for(dims, previous[:n]), levels[n][previous[:n]]))
+        return rows
+
+    def _labels_for(self, dims, codes):
+        return tuple(self.labels[d][c] for d, c in zip(dims, codes))
+
+def _sort_key_for(dimension):
+    if dimension == "size":
+        return lambda value: (_sort_key(value[0]), _sort_key(value[1]))
+    return _sort_key
+
+def drill_dimensions(filters, count=2):
+    """Wymiary do pokazania po zawężeniu: pierwsze z DRILL_ORDER, których nie ma w filtrach."""
+    return tuple(d for d in DRILL_ORDER if d not in filters)[:count]
+
+def load_production_facts(start_date=None, end_date=None):
+    with session_scope() as session:
+        rows = session.execute(production_facts_query(start_date, end_date)).all()
+    return ProductionFacts.from_rows(rows)
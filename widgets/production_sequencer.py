@@ -0,0 +1,221 @@
+# widgets/production_sequencer.py
+# Kolejność produkcji na dzień albo tydzień, która ogranicza przezbrojenia maszyn.
+#
+# Pozycje z tym samym ustawieniem (materiał, szerokość, rdzeń) łączone są w jeden blok
+# - między nimi nie ma przezbrojenia. Bloki układane są heurystyką: najbliższy sąsiad
+# z kilku punktów startu, potem poprawa 2-opt (odwracanie odcinków trasy). Koszt zmiany
+# ustawienia opisuje sekcja [sequencing]:
+#
+#   [sequencing]
+#   material_change = 30      ; zmiana materiału [min]
+#   width_change = 10         ; zmiana szerokości
+#   width_per_mm = 0.1        ; dodatkowo za każdy mm różnicy szerokości
+#   core_change = 5           ; zmiana rdzenia
+#   ; wyjątki dla par materiałów (symetryczne): "materiał A|materiał B=koszt; ..."
+#   material_pairs = Termiczny|Termiczny TOP=10; Folia PP|Folia PP RF20=8
+import datetime
+from collections import namedtuple
+import numpy as np
+from sqlalchemy import func, select
+from models.db import session_scope
+from models.client import Client
+from models.order import Order, ACTIVE_STATUSES
+from models.orderitem import OrderItem
+from utils.config import load_section
+from utils.numbers import format_number
+
+SEQUENCING_DEFAULTS = {
+    "material_change": 30.0,
+    "width_change": 10.0,
+    "width_per_mm": 0.1,
+    "core_change": 5.0,
+    "material_pairs": "",
+    "starts": 8,              # ile punktów startu próbuje heurystyka najbliższego sąsiada
+    "max_passes": 50,         # limit przebiegów 2-opt
+}
+
+SequenceItem = namedtuple(
+    "SequenceItem", "order_id order_number client delivery_date material width height core quantity quantity_type"
+)
+# setup: (materiał, szerokość, rdzeń); changeover: koszt przejścia z poprzedniego kroku
+RunStep = namedtuple("RunStep", "setup items changeover")
+RunList = namedtuple("RunList", "steps total_cost baseline_cost")
+
+def load_sequencing_settings(path=None):
+    return load_section("sequencing", SEQUENCING_DEFAULTS, path)
+
+def parse_material_pairs(text):
+    """"A|B=10; C|D=5" -> {(A, B): 10.0, (C, D): 5.0}; błędne wpisy są pomijane."""
+    pairs = {}
+    for entry in (text or "").split(";"):
+        names, _, cost = entry.partition("=")
+        first, _, second = names.partition("|")
+        try:
+            pairs[(first.strip(), second.strip())] = float(cost.replace(",", "."))
+        except ValueError:
+            continue
+    return pairs
+
+def week_range(day):
+    """Poniedziałek i niedziela tygodnia, do którego należy day."""
+    monday = day - datetime.timedelta(days=day.weekday())
+    return monday, monday + datetime.timedelta(days=6)
+
+def sequence_items_query(date_from, date_to):
+    """Pozycje produkcyjne otwartych zamówień z wysyłką w zakresie dat."""
+    client = func.coalesce(func.nullif(Client.short_name, ""), Client.name)
+    return (
+        select(
+            Order.id, Order.order_number, client, Order.delivery_date,
+            OrderItem.material, OrderItem.width, OrderItem.height, OrderItem.core,
+            OrderItem.ordered_quantity, OrderItem.quantity_type,
+        )
+        .join(OrderItem, Order.id == OrderItem.order_id)
+        .outerjoin(Client, Client.id == Order.client_id)
+        .where(Order.status.in_(ACTIVE_STATUSES))
+        .where(Order.delivery_date.between(date_from, date_to))
+        .where(OrderItem.width.isnot(None))
+        .order_by(Order.delivery_date, Order.order_number, OrderItem.id)
+    )
+
+def load_sequence_items(date_from, date_to):
+    with session_scope() as session:
+        return [SequenceItem(*row) for row in session.execute(sequence_items_query(date_from, date_to))]
+
+def setup_key(item):
+    return (item.material or "", item.width, (item.core or "").strip())
+
+def group_setups(items):
+    """Bloki pozycji o tym samym ustawieniu, w kolejności pierwszego wystąpienia."""
+    blocks = {}
+    for item in items:
+        blocks.setdefault(setup_key(item), []).append(item)
+    return list(blocks.items())
+
+def changeover_matrix(setups, settings=None):
+    """Macierz kosztów przejścia między ustawieniami (symetryczna, zero na przekątnej)."""
+    settings = dict(SEQUENCING_DEFAULTS, **(settings or {}))
+    materials = sorted({s[0] for s in setups})
+    cores = sorted({s[2] for s in setups})
+    material_codes = np.array([materials.index(s[0]) for s in setups], dtype=np.int64)
+    core_codes = np.array([cores.index(s[2]) for s in setups], dtype=np.int64)
+    widths = np.array([float(s[1] or 0) for s in setups])
+
+    material_costs = np.full((len(materials), len(materials)), float(settings["material_change"]))
+    np.fill_diagonal(material_costs, 0.0)
+    for (first, second), cost in parse_material_pairs(settings["material_pairs"]).items():
+        if first in materials and second in materials and first != second:
+            a, b = materials.index(first), materials.index(second)
+            material_costs[a, b] = material_costs[b, a] = cost
+
+    width_diff = np.abs(widths[:, None] - widths[None, :])
+    return (
+        material_costs[material_codes[:, None], material_codes[None, :]]
+        + settings["width_change"] * (width_diff > 0)
+        + settings["width_per_mm"] * width_diff
+        + settings["core_change"] * (core_codes[:, None] != core_codes[None, :])
+    )
+
+def path_cost(cost, order):
+    order = np.asarray(order)
+    return float(cost[order[:-1], order[1:]].sum()) if len(order) > 1 else 0.0
+
+def nearest_neighbour(cost, start):
+    n = len(cost)
+    visited = np.zeros(n, dtype=bool)
+    order = [start]
+    visited[start] = True
+    for _ in range(n - 1):
+        row = np.where(visited, np.inf, cost[order[-1]])
+        nxt = int(np.argmin(row))
+        order.append(nxt)
+        visited[nxt] = True
+    return order
+
+def two_opt(cost, order, max_passes=50):
+    """
+    Poprawa trasy otwartej: odwraca odcinek order[i+1..j], jeśli skraca to trasę.
+    Dla ustalonego i zyski wszystkich j liczone są naraz (wektorowo).
+    """
+    order = np.array(order)
+    n = len(order)
+    if n < 3:
+        return order.tolist()
+    for _ in range(max_passes):
+        improved = False
+        # odwrócenie początku trasy order[0..j]: znika krawędź (j, j+1), dochodzi (0, j+1)
+        j = np.arange(0, n - 1)
+        gain = cost[order[j], order[j + 1]] - cost[order[0], order[j + 1]]
+        best = int(np.argmax(gain))
+        if gain[best] > 1e-9:
+            order[:best + 1] = order[:best + 1][::-1]
+            improved = True
+        for i in range(n - 2):
+            a, b = order[i], order[i + 1]
+            j = np.arange(i + 1, n)
+            c = order[j]
+            d_exists = j + 1 < n
+            d = order[np.minimum(j + 1, n - 1)]
+            old = cost[a, b] + np.where(d_exists, cost[c, d], 0.0)
+            new = cost[a, c] + np.where(d_exists, cost[b, d], 0.0)
+            gain = old - new
+            best = int(np.argmax(gain))
+            if gain[best] > 1e-9:
+                k = int(j[best])
+                order[i + 1:k + 1] = order[i + 1:k + 1][::-1]
+                improved = True
+        if not improved:
+            break
+    return order.tolist()
+
+def sequence_blocks(cost, settings=None):
+    """Kolejność bloków: najlepszy z kilku startów najbliższego sąsiada + 2-opt."""
+    settings = dict(SEQUENCING_DEFAULTS, **(settings or {}))
+    n = len(cost)
+    if n == 0:
+        return []
+    # starty: bloki o najmniejszym średnim koszcie przejścia (najbardziej "centralne") i pierwszy
+    candidates = [0] + np.argsort(cost.mean(axis=1)).tolist()
+    starts = list(dict.fromkeys(candidates))[:max(1, int(settings["starts"]))]
+    best = min((nearest_neighbour(cost, s) for s in starts), key=lambda o: path_cost(cost, o))
+    return two_opt(cost, best, int(settings["max_passes"]))
+
+def build_run_list(items, settings=None):
+    """Kolejność produkcji dla pozycji; baseline_cost - koszt kolejności wejściowej (bez optymalizacji)."""
+    settings = dict(SEQUENCING_DEFAULTS, **(settings or {}))
+    blocks = group_setups(items)
+    if not blocks:
+        return RunList([], 0.0, 0.0)
+    setups = [setup for setup, _ in blocks]
+    cost = changeover_matrix(setups, settings)
+    order = sequence_blocks(cost, settings)
+    steps = [
+        RunStep(setups[b], blocks[b][1], float(cost[order[i - 1], b]) if i else 0.0)
+        for i, b in enumerate(order)
+    ]
+    index = {setup: i for i, setup in enumerate(setups)}
+    baseline = path_cost(cost, [index[setup_key(item)] for item in items])
+    return RunList(steps, sum(step.changeover for step in steps), baseline)
+
+def get_run_list(date_from, date_to, settings=None):
+    return build_run_list(load_sequence_items(date_from, date_to), settings or load_sequencing_settings())
+
+RUN_LIST_HEADERS = ["Lp.", "Materiał", "Szerokość", "Rdzeń", "Pozycje", "Zamówienia", "Przezbrojenie"]
+
+def run_step_cells(number, step):
+    """Tekst komórek kroku kolejności w porządku RUN_LIST_HEADERS."""
+    material, width, core = step.setup
+    orders = list(dict.fromkeys(item.order_number for item in step.items))
+    return [
+        str(number), material or "(brak)", format_number(width), core or "(brak)",
+        str(len(step.items)), ", ".join(orders), format_number(round(step.changeover, 1)),
+    ]
+
+def item_cells(item):
+    """Szczegół pozycji w kroku: zamówienie, klient, wymiar, ilość."""
+    size = f"{format_number(item.width)} x {format_number(item.height)}" if item.height is not None \
+        else format_number(item.width)
+    return [
+        item.order_number or "", item.client or "", size,
+        f"{format_number(item.quantity)} {item.quantity_type or ''}".strip(),
+    ]
@@ -1,119 +1,360 @@
+import os
+import tempfile
 from PySide6.QtWidgets import (
-    QDialog, QVBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QHBoxLayout, QLabel, QHeaderView
+    QDialog, QVBoxLayout, QTableView, QPushButton, QHBoxLayout, QLabel, QHeaderView, QComboBox,
+    QTabWidget, QWidget, QDateEdit, QTreeWidget, QTreeWidgetItem, QMessageBox
 )
 from PySide6.QtGui import QFont, QColor, QBrush
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QDate
 from widgets.production_sorter import get_weekly_production_summary
+from widgets.production_pivot import (
+    DIMENSIONS, PIVOTS, PivotRow, drill_dimensions, format_label, load_production_facts
+)
+from widgets.production_sequencer import RUN_LIST_HEADERS, get_run_list, item_cells, run_step_cells, week_range
+from printing.run_list import export_run_list
+from printing.cutting_plan import export_cutting_plan
+from printing.document_cache import production_output_dir
+from widgets.cutting_plan import get_cutting_plan, load_cutting_settings
+from utils.numbers import format_number
+
+# Widok domyślny: gotowe zestawienie z tabeli production_summary, bez sum częściowych
+SUMMARY_VIEW = ("Tydzień × materiał × wymiar", ("week", "material", "size"))
+
+QUANTITY_HEADER = "Ilość [tyś.]"
+
+BTN_STYLE = """
+    QPushButton {
+        font-size: 14px;
+        font-weight: bold;
+        min-height: 36px;
+        border-radius: 7px;
+        border: 2px solid #197a3d;
+        background: #eaffea;
+        color: #197a3d;
+        padding: 8px 30px;
+        margin: 0 8px;
+    }
+    QPushButton:hover { background: #c5ffd7; }
+    QPushButton:disabled { background: #f4f4f4; color: #a0a0a0; border: 2px solid #cccccc; }
+"""
+
+TABLE_STYLE = """
+    QTableView, QTreeView {
+        gridline-color: #b3b3b3;
+        font-size: 15px;
+        background: #fcfcfc;
+    }
+    QTableView::item:selected, QTreeView::item:selected {
+        background: #eaffea;
+        color: #0e5f22;
+    }
+    QHeaderView::section {
+        background-color: #eaffea;
+        color: #197a3d;
+        font-weight: bold;
+        font-size: 15px;
+        border-bottom: 2px solid #197a3d;
+        padding: 8px;
+    }
+"""
+
+class PivotTableModel(QAbstractTableModel):
+    """Wiersze PivotRow: kolumny wymiarów + ilość; sumy częściowe pogrubione."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.dims = ()
+        self.rows = []
+        self._font = QFont("Segoe UI", 12)
+        self._font_bold = QFont("Segoe UI", 12, QFont.Bold)
+        self._subtotal_brush = QBrush(QColor("#eaffea"))
+        self._total_brush = QBrush(QColor("#c5ffd7"))
+        self._quantity_brush = QBrush(QColor("#197a3d"))
+
+    def set_rows(self, dims, rows):
+        self.beginResetModel()
+        self.dims = tuple(dims)
+        self.rows = rows
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.dims) + 1
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation != Qt.Horizontal or role != Qt.DisplayRole:
+            return None
+        return DIMENSIONS[self.dims[section]] if section < len(self.dims) else QUANTITY_HEADER
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.rows[index.row()]
+        column = index.column()
+        is_detail = row.level == len(self.dims)
+        if role == Qt.DisplayRole:
+            if column == len(self.dims):
+                return f"{row.quantity:.2f}"
+            if column < row.level:
+                return format_label(self.dims[column], row.key[column])
+            if column == row.level:
+                return "Razem" if row.level == 0 else "Suma"
+            return ""
+        if role == Qt.FontRole:
+            return self._font if is_detail and column < len(self.dims) else self._font_bold
+        if role == Qt.ForegroundRole and column == len(self.dims):
+            return self._quantity_brush
+        if role == Qt.BackgroundRole and not is_detail:
+            return self._total_brush if row.level == 0 else self._subtotal_brush
+        if role == Qt.TextAlignmentRole:
+            if column == len(self.dims) or self.dims[column] in ("size", "roll_length", "core"):
+                return int(Qt.AlignRight | Qt.AlignVCenter)
+            if self.dims[column] == "week":
+                return int(Qt.AlignCenter)
+            return int(Qt.AlignLeft | Qt.AlignVCenter)
+        return None
+
+class RunListPanel(QWidget):
+    """Kolejność produkcji na dzień albo tydzień: kroki (ustawienia maszyny) z pozycjami."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.run_list = None
+        layout = QVBoxLayout(self)
+
+        controls = QHBoxLayout()
+        label = QLabel("Wysyłka:")
+        label.setFont(QFont("Segoe UI", 12, QFont.Bold))
+        controls.addWidget(label)
+        self.period_combo = QComboBox()
+        self.period_combo.setFont(QFont("Segoe UI", 12))
+        self.period_combo.addItems(["Dzień", "Tydzień"])
+        controls.addWidget(self.period_combo)
+        self.date_edit = QDateEdit(QDate.currentDate())
+        self.date_edit.setCalendarPopup(True)
+        self.date_edit.setDisplayFormat("yyyy-MM-dd")
+        self.date_edit.setFont(QFont("Segoe UI", 12))
+        controls.addWidget(self.date_edit)
+        self.btn_sequence = QPushButton("Ułóż kolejność")
+        self.btn_sequence.setStyleSheet(BTN_STYLE)
+        self.btn_sequence.clicked.connect(self.build)
+        controls.addWidget(self.btn_sequence)
+        controls.addStretch()
+        layout.addLayout(controls)
+
+        self.tree = QTreeWidget()
+        self.tree.setColumnCount(len(RUN_LIST_HEADERS))
+        self.tree.setHeaderLabels(RUN_LIST_HEADERS)
+        self.tree.setStyleSheet(TABLE_STYLE)
+        self.tree.setAlternatingRowColors(True)
+        self.tree.header().setFont(QFont("Segoe UI", 13, QFont.Bold))
+        self.tree.header().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.tree.header().setStretchLastSection(False)
+        self.tree.header().setSectionResizeMode(RUN_LIST_HEADERS.index("Zamówienia"), QHeaderView.Stretch)
+        layout.addWidget(self.tree)
+
+        bottom = QHBoxLayout()
+        self.cost_label = QLabel("")
+        self.cost_label.setFont(QFont("Segoe UI", 12))
+        self.cost_label.setStyleSheet("color: #0e5f22;")
+        bottom.addWidget(self.cost_label, 1)
+        self.btn_cutting = QPushButton("Plan cięcia")
+        self.btn_cutting.setStyleSheet(BTN_STYLE)
+        self.btn_cutting.setToolTip("Wzory cięcia rolek matek na pasy dla pozycji z wybranego okresu")
+        self.btn_cutting.clicked.connect(self.print_cutting_plan)
+        bottom.addWidget(self.btn_cutting)
+        self.btn_print = QPushButton("Drukuj")
+        self.btn_print.setStyleSheet(BTN_STYLE)
+        self.btn_print.setEnabled(False)
+        self.btn_print.clicked.connect(self.print_run_list)
+        bottom.addWidget(self.btn_print)
+        layout.addLayout(bottom)
+
+    def period(self):
+        day = self.date_edit.date().toPython()
+        if self.period_combo.currentIndex() == 1:
+            return week_range(day)
+        return day, day
+
+    def period_title(self, prefix="Kolejność produkcji"):
+        date_from, date_to = self.period()
+        if date_from == date_to:
+            return f"{prefix} - wysyłka {date_from:%Y-%m-%d}"
+        week = date_from.isocalendar()
+        return f"{prefix} - tydzień {week[0]} / {week[1]:02d}"
+
+    def period_suffix(self):
+        date_from, _ = self.period()
+        return f"{date_from:%Y-%m-%d}_" + ("tydzien" if self.period_combo.currentIndex() == 1 else "dzien")
+
+    def build(self):
+        self.run_list = get_run_list(*self.period())
+        self.tree.clear()
+        font_bold = QFont("Segoe UI", 11, QFont.Bold)
+        step_brush = QBrush(QColor("#eaffea"))
+        for number, step in enumerate(self.run_list.steps, start=1):
+            top = QTreeWidgetItem(run_step_cells(number, step))
+            for col in range(len(RUN_LIST_HEADERS)):
+                top.setFont(col, font_bold)
+                top.setBackground(col, step_brush)
+            for item in step.items:
+                # szczegóły pozycji od kolumny "Szerokość", pod ustawieniem maszyny
+                top.addChild(QTreeWidgetItem(["", ""] + item_cells(item)))
+            self.tree.addTopLevelItem(top)
+        self.tree.expandAll()
+        steps = self.run_list.steps
+        self.cost_label.setText(
+            f"Kroków: {len(steps)}, pozycji: {sum(len(s.items) for s in steps)}, "
+            f"przezbrojenia: {format_number(round(self.run_list.total_cost, 1))} "
+            f"(kolejność wg zamówień: {format_number(round(self.run_list.baseline_cost, 1))})"
+        )
+        self.btn_print.setEnabled(bool(steps))
+
+    def print_run_list(self):
+        if not self.run_list or not self.run_list.steps:
+            return
+        filename = os.path.join(tempfile.gettempdir(), f"kolejnosc_{self.period_suffix()}.pdf")
+        try:
+            export_run_list(self.run_list, self.period_title(), filename)
+        except OSError as exc:
+            QMessageBox.critical(self, "Błąd zapisu", f"Nie udało się zapisać pliku:\n{exc}")
+
+    def print_cutting_plan(self):
+        settings = load_cutting_settings()
+        plans = get_cutting_plan(*self.period(), settings)
+        if not plans:
+            QMessageBox.information(self, "Plan cięcia", "Brak otwartych pozycji w wybranym okresie.")
+            return
+        filename = os.path.join(production_output_dir(), f"plan_ciecia_{self.period_suffix()}.pdf")
+        try:
+            export_cutting_plan(plans, self.period_title("Plan cięcia"), settings["master_width_mm"], filename)
+        except OSError as exc:
+            QMessageBox.critical(self, "Błąd zapisu", f"Nie udało się zapisać pliku:\n{exc}")
 
 class ProductionSortDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Zestawienie produkcji")
-        self.resize(950, 700)
+        self.resize(1100, 700)
         self.layout = QVBoxLayout(self)
+        # Fakty do przekrojów - wczytywane raz, przy pierwszym przełączeniu widoku
+        self.facts = None
+        self.drill_steps = []   # stos zawężeń drill-down: każdy krok to [(wymiar, etykieta), ...]
 
         # Tytuł dialogu
-        title = QLabel("Zestawienie produkcji (grupowanie: tydzień, materiał, rozmiar)")
+        title = QLabel("Zestawienie produkcji")
         title.setFont(QFont("Segoe UI", 15, QFont.Bold))
         title.setStyleSheet("color: #197a3d; margin-bottom: 16px;")
         title.setAlignment(Qt.AlignCenter)
         self.layout.addWidget(title)
 
+        self.tabs = QTabWidget()
+        self.tabs.setFont(QFont("Segoe UI", 12))
+        summary_page = QWidget()
+        summary_layout = QVBoxLayout(summary_page)
+        self.tabs.addTab(summary_page, "Zestawienie")
+        self.run_list_panel = RunListPanel(self)
+        self.tabs.addTab(self.run_list_panel, "Kolejność produkcji")
+        self.layout.addWidget(self.tabs)
+
+        # Wybór przekroju i ścieżka zawężeń
+        controls = QHBoxLayout()
+        label = QLabel("Przekrój:")
+        label.setFont(QFont("Segoe UI", 12, QFont.Bold))
+        controls.addWidget(label)
+        self.view_combo = QComboBox()
+        self.view_combo.setFont(QFont("Segoe UI", 12))
+        for name, dims in [SUMMARY_VIEW] + PIVOTS:
+            self.view_combo.addItem(name, dims)
+        self.view_combo.currentIndexChanged.connect(self.on_view_changed)
+        controls.addWidget(self.view_combo)
+        self.filter_label = QLabel("")
+        self.filter_label.setFont(QFont("Segoe UI", 12))
+        self.filter_label.setStyleSheet("color: #0e5f22; margin-left: 16px;")
+        controls.addWidget(self.filter_label, 1)
+        self.btn_back = QPushButton("Wstecz")
+        self.btn_back.setStyleSheet(BTN_STYLE)
+        self.btn_back.clicked.connect(self.drill_up)
+        controls.addWidget(self.btn_back)
+        summary_layout.addLayout(controls)
+
         # Tabela
-        self.table = QTableWidget()
+        self.model = PivotTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.setAlternatingRowColors(True)
-        self.table.setStyleSheet("""
-            QTableWidget {
-                gridline-color: #b3b3b3;
-                font-size: 15px;
-                background: #fcfcfc;
-            }
-            QTableWidget::item:selected {
-                background: #eaffea;
-                color: #0e5f22;
-            }
-            QHeaderView::section {
-                background-color: #eaffea;
-                color: #197a3d;
-                font-weight: bold;
-                font-size: 15px;
-                border-bottom: 2px solid #197a3d;
-                padding: 8px;
-            }
-        """)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setSelectionMode(QTableWidget.SingleSelection)
-        self.layout.addWidget(self.table)
+        self.table.setStyleSheet(TABLE_STYLE)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setSelectionMode(QTableView.SingleSelection)
+        self.table.setToolTip("Dwuklik na wierszu zawęża zestawienie do tej grupy")
+        self.table.doubleClicked.connect(self.drill_down)
+        header = self.table.horizontalHeader()
+        header.setFont(QFont("Segoe UI", 13, QFont.Bold))
+        header.setDefaultAlignment(Qt.AlignCenter)
+        header.setHighlightSections(False)
+        header.setSectionResizeMode(QHeaderView.Stretch)
+        self.table.verticalHeader().hide()
+        self.table.setShowGrid(True)
+        summary_layout.addWidget(self.table)
 
         # Przycisk zamykania
         btn_layout = QHBoxLayout()
         btn_layout.addStretch()
         self.btn_close = QPushButton("Zamknij")
         self.btn_close.setMinimumWidth(130)
-        self.btn_close.setStyleSheet("""
-            QPushButton {
-                font-size: 14px;
-                font-weight: bold;
-                min-height: 36px;
-                border-radius: 7px;
-                border: 2px solid #197a3d;
-                background: #eaffea;
-                color: #197a3d;
-                padding: 8px 30px;
-                margin: 0 8px;
-            }
-            QPushButton:hover { background: #c5ffd7; }
-        """)
+        self.btn_close.setStyleSheet(BTN_STYLE)
         self.btn_close.clicked.connect(self.accept)
         btn_layout.addWidget(self.btn_close)
         self.layout.addLayout(btn_layout)
 
         self.populate_table()
 
+    def ensure_facts(self):
+        if self.facts is None:
+            self.facts = load_production_facts()
+        return self.facts
+
+    @property
+    def filters(self):
+        return [pair for step in self.drill_steps for pair in step]
+
+    def current_dims(self):
+        if self.filters:
+            return drill_dimensions(dict(self.filters))
+        return self.view_combo.currentData()
+
     def populate_table(self):
-        summary = get_weekly_production_summary()
-        self.table.setRowCount(len(summary))
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels([
-            "Tydzień", "Materiał", "Szerokość [mm]", "Wysokość [mm]", "Ilość [tyś.]"
-        ])
-
-        font_bold = QFont("Segoe UI", 13, QFont.Bold)
-        self.table.horizontalHeader().setFont(font_bold)
-        self.table.horizontalHeader().setDefaultAlignment(Qt.AlignCenter)
-        self.table.horizontalHeader().setHighlightSections(False)
-
-        for row, ((week, material, width, height), qty) in enumerate(summary):
-            week_item = QTableWidgetItem(str(week))
-            week_item.setTextAlignment(Qt.AlignCenter)
-            week_item.setFont(QFont("Segoe UI", 12))
-
-            material_item = QTableWidgetItem(str(material))
-            material_item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-            material_item.setFont(QFont("Segoe UI", 12))
-
-            width_item = QTableWidgetItem(str(width))
-            width_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            width_item.setFont(QFont("Segoe UI", 12))
-
-            height_item = QTableWidgetItem(str(height))
-            height_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            height_item.setFont(QFont("Segoe UI", 12))
-
-            qty_item = QTableWidgetItem(f"{qty:.2f}")
-            qty_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            qty_item.setFont(QFont("Segoe UI", 12, QFont.Bold))
-            qty_item.setForeground(QBrush(QColor("#197a3d")))
-
-            self.table.setItem(row, 0, week_item)
-            self.table.setItem(row, 1, material_item)
-            self.table.setItem(row, 2, width_item)
-            self.table.setItem(row, 3, height_item)
-            self.table.setItem(row, 4, qty_item)
-
-        # Styl nagłówków i kolumn
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
-        self.table.verticalHeader().hide()
-        self.table.setShowGrid(True)
\ No newline at end of file
+        dims = self.current_dims()
+        if not self.filters and self.view_combo.currentIndex() == 0:
+            rows = [
+                PivotRow(3, ((year, week), material, (width, height)), qty)
+                for (year, week, material, width, height), qty in get_weekly_production_summary()
+            ]
+        else:
+            rows = self.ensure_facts().filtered(**dict(self.filters)).rollup(dims)
+        self.model.set_rows(dims, rows)
+        self.filter_label.setText("  ›  ".join(
+            f"{DIMENSIONS[d]}: {format_label(d, v)}" for d, v in self.filters
+        ))
+        self.btn_back.setEnabled(bool(self.filters))
+
+    def on_view_changed(self, _index):
+        self.drill_steps = []
+        self.populate_table()
+
+    def drill_down(self, index):
+        row = self.model.rows[index.row()]
+        selected = dict(self.filters)
+        new_filters = [(d, v) for d, v in zip(self.model.dims, row.key[:row.level]) if d not in selected]
+        if not new_filters or not drill_dimensions(dict(self.filters + new_filters)):
+            return
+        self.drill_steps.append(new_filters)
+        self.populate_table()
+
+    def drill_up(self):
+        if self.drill_steps:
+            self.drill_steps.pop()
+            self.populate_table()
@@ -1,53 +1,24 @@
-from collections import defaultdict
-from models.order import Order
-from models.orderitem import OrderItem
-from models.db import Session
+from models.db import session_scope
+from models.production_summary import KEY_COLUMNS, summary_query
+
+STREAM_BATCH_SIZE = 500
+
+def weekly_production_rows(session, start_date=None, end_date=None, batch_size=STREAM_BATCH_SIZE):
+    """
+    Strumieniowo: ((rok, tydzień, materiał, szerokość, wysokość), ilość) z tabeli
+    production_summary (utrzymywanej przy zapisie zamówień), porcjami po batch_size.
+    Zakres dat jest zaokrąglany do pełnych tygodni ISO.
+    """
+    result = session.scalars(
+        summary_query(start_date, end_date),
+        execution_options={"yield_per": batch_size},
+    )
+    for row in result:
+        yield tuple(getattr(row, name) for name in KEY_COLUMNS), float(row.quantity or 0.0)
+
+def iter_weekly_production_summary(start_date=None, end_date=None, batch_size=STREAM_BATCH_SIZE):
+    with session_scope() as session:
+        yield from weekly_production_rows(session, start_date, end_date, batch_size)
 
 def get_weekly_production_summary(start_date=None, end_date=None):
-    session = Session()
-    query = session.query(Order, OrderItem).join(OrderItem, Order.id == OrderItem.order_id)
-    if start_date:
-        query = query.filter(Order.delivery_date >= start_date)
-    if end_date:
-        query = query.filter(Order.delivery_date <= end_date)
-
-    summary = defaultdict(float)
-    for order, item in query.all():
-        # UWAGA: Tylko pozycje z wypełnioną szerokością!
-        width = item.width
-        if width is None or str(width).strip() == "":
-            continue   # pomiń pozycje bez szerokości
-
-        week = order.delivery_date.isocalendar()[1]
-        material = item.material
-        height = item.height
-
-        qty = 0.0
-        try:
-            if item.quantity_type and item.quantity_type.lower().startswith('ty'):
-                # typ tyś – liczymy 1:1
-                qty = float(item.ordered_quantity)
-            elif item.quantity_type and item.quantity_type.lower().startswith('rol'):
-                # typ rolki – przeliczamy ilość rolek * nawój / 1000
-                rolls = float(item.ordered_quantity)
-                roll_length = float(item.roll_length)
-                qty = rolls * roll_length / 1000.0
-            else:
-                # fallback - liczymy 1:1
-                qty = float(item.ordered_quantity)
-        except Exception:
-            qty = 0.0
-
-        key = (week, material, width, height)
-        summary[key] += qty
-
-    session.close()
-
-    def safe_float(val):
-        try:
-            return float(val)
-        except (ValueError, TypeError):
-            return 0.0
-
-    result = sorted(summary.items(), key=lambda x: (x[0][0], x[0][1], safe_float(x[0][2]), safe_float(x[0][3])))
-    return result
\ No newline at end of file
+    return list(iter_weekly_production_summary(start_date, end_date))